@@ -1,2 +1,2 @@
-from .process import ProcessState, ProcSpec, TimelineSlice
-
+from .process import ProcessState, ProcSpec, TimelineSlice, Timeline
+from .workload import Workload
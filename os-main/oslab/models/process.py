@@ -1,5 +1,8 @@
+import sys
+from array import array
 from dataclasses import dataclass
 from enum import Enum
+from typing import Dict, Iterator, List, Optional, Tuple
 
 class ProcessState(str, Enum):
     CREATED = "CREATED"
@@ -8,17 +11,76 @@ class ProcessState(str, Enum):
     BLOCKED = "BLOCKED"
     TERMINATED = "TERMINATED"
 
-@dataclass
+# slots keep the per-instance footprint down; dataclass(slots=True) needs 3.10+
+_slots = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# deadline of a process that has none; sorts after every real deadline (edf)
+NO_DEADLINE = (1 << 63) - 1
+
+@dataclass(**_slots)
 class ProcSpec:
     pid: int
     arrival: int
     burst: int
     priority: int = 0
+    deadline: Optional[int] = None  # absolute time, used by edf
 
-@dataclass
+@dataclass(**_slots)
 class TimelineSlice:
     pid: int
     start: int
     end: int
     core: int = 0
 
+# Columnar timeline; add() extends the previous slice on the same core when it can.
+class Timeline:
+    __slots__ = ("pid", "start", "end", "core", "_last")
+
+    def __init__(self):
+        self.pid = array("q")
+        self.start = array("q")
+        self.end = array("q")
+        self.core = array("i")
+        self._last: Dict[int, int] = {}
+
+    def add(self, pid: int, start: int, end: int, core: int = 0):
+        k = self._last.get(core)
+        if k is not None and self.pid[k] == pid and self.end[k] == start:
+            self.end[k] = end
+            return
+        self._last[core] = len(self.pid)
+        self.pid.append(pid)
+        self.start.append(start)
+        self.end.append(end)
+        self.core.append(core)
+
+    def __len__(self) -> int:
+        return len(self.pid)
+
+    def __getitem__(self, k: int) -> TimelineSlice:
+        return TimelineSlice(pid=self.pid[k], start=self.start[k], end=self.end[k], core=self.core[k])
+
+    def __iter__(self) -> Iterator[TimelineSlice]:
+        for p, s, e, c in zip(self.pid, self.start, self.end, self.core):
+            yield TimelineSlice(pid=p, start=s, end=e, core=c)
+
+    def slices(self) -> List[TimelineSlice]:
+        return list(self)
+
+    def mark(self) -> Tuple[int, Dict[int, Tuple[int, int]]]:
+        # length plus each core's last slice end, for upto()
+        return len(self.pid), {c: (k, self.end[k]) for c, k in self._last.items()}
+
+    def upto(self, mark: Tuple[int, Dict[int, Tuple[int, int]]]) -> "Timeline":
+        # a copy of this timeline as it was at mark()
+        n, last = mark
+        tl = Timeline()
+        tl.pid, tl.start, tl.end, tl.core = self.pid[:n], self.start[:n], self.end[:n], self.core[:n]
+        for c, (k, end) in last.items():
+            tl.end[k] = end
+            tl._last[c] = k
+        return tl
+
+    def to_columns(self) -> Dict[str, List[int]]:
+        return {"pid": self.pid.tolist(), "start": self.start.tolist(),
+                "end": self.end.tolist(), "core": self.core.tolist()}
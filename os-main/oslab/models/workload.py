@@ -0,0 +1,65 @@
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from oslab.models.process import NO_DEADLINE, ProcSpec
+
+_INT64 = np.iinfo(np.int64)
+
+def int64_column(values, name: str = "values") -> np.ndarray:
+    # like np.ascontiguousarray(values, dtype=np.int64), but fractional, non-finite,
+    # out-of-range or non-numeric values are a ValueError instead of being truncated
+    a = np.asarray(values)
+    if a.size:
+        if a.dtype.kind == "f":
+            if not (np.isfinite(a).all() and (a == np.trunc(a)).all()
+                    and a.min() >= _INT64.min and a.max() <= _INT64.max):
+                raise ValueError(f"{name} must be integers")
+        elif a.dtype.kind == "u":
+            if a.max() > _INT64.max:
+                raise ValueError(f"{name} must fit in int64")
+        elif a.dtype.kind != "i":
+            raise ValueError(f"{name} must be integers")
+    return np.ascontiguousarray(a, dtype=np.int64)
+
+# Columnar workload, accepted wherever a ProcSpec list is; no deadline is NO_DEADLINE.
+class Workload:
+    __slots__ = ("pid", "arrival", "burst", "priority", "deadline")
+
+    def __init__(self, arrival: Sequence[int], burst: Sequence[int],
+                 priority: Optional[Sequence[int]] = None, pid: Optional[Sequence[int]] = None,
+                 deadline: Optional[Sequence[Optional[int]]] = None):
+        self.arrival = int64_column(arrival, "arrival")
+        n = len(self.arrival)
+        self.burst = int64_column(burst, "burst")
+        if priority is None:
+            self.priority = np.zeros(n, dtype=np.int64)
+        else:
+            self.priority = int64_column(priority, "priority")
+        if pid is None:
+            self.pid = np.arange(1, n + 1, dtype=np.int64)
+        else:
+            self.pid = int64_column(pid, "pid")
+        if deadline is None:
+            self.deadline = np.full(n, NO_DEADLINE, dtype=np.int64)
+        elif isinstance(deadline, np.ndarray):
+            self.deadline = int64_column(deadline, "deadline")
+        else:
+            self.deadline = int64_column([NO_DEADLINE if d is None else d for d in deadline], "deadline")
+        if not (len(self.burst) == len(self.priority) == len(self.pid) == len(self.deadline) == n):
+            raise ValueError("workload columns must have the same length")
+
+    @classmethod
+    def from_specs(cls, specs: List[ProcSpec]) -> "Workload":
+        return cls([p.arrival for p in specs], [p.burst for p in specs],
+                   [p.priority for p in specs], [p.pid for p in specs],
+                   [p.deadline for p in specs])
+
+    def __len__(self) -> int:
+        return len(self.pid)
+
+    def columns(self) -> Tuple[List[int], List[int], List[int], List[int], List[int]]:
+        return (self.pid.tolist(), self.arrival.tolist(), self.burst.tolist(), self.priority.tolist(),
+                self.deadline.tolist())
+
+    def specs(self) -> List[ProcSpec]:
+        return [ProcSpec(pid, a, b, pr, None if d == NO_DEADLINE else d)
+                for pid, a, b, pr, d in zip(*self.columns())]
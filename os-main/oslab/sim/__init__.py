@@ -1,5 +1,8 @@
-from .scheduler import fcfs, rr, sjf, priority
+from .scheduler import fcfs, rr, sjf, priority, cfs, mlfq, edf, schedule, Rescheduler
+from .scheduler import fcfs_iter, rr_iter, sjf_iter, priority_iter, cfs_iter, mlfq_iter, edf_iter, schedule_iter
+from .metrics import batch_metrics
+from .cache import ScheduleCache
 from .process_sim import ProcessSimulator
-from .ipc import IPCSimulator
-from .semaphore_sim import SemaphoreSimulator
-
+from .ipc import IPCSimulator, AsyncIPCSimulator, SharedMemoryIPCSimulator
+from .semaphore_sim import SemaphoreSimulator, AsyncSemaphoreSimulator
+from .deadlock import DeadlockSimulator
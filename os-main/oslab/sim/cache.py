@@ -0,0 +1,91 @@
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, Tuple
+from oslab.models.process import NO_DEADLINE, Timeline
+from oslab.sim.scheduler import Specs, schedule
+
+# rough per-entry bookkeeping on top of the timeline arrays (key, tuple, dict slot)
+_ENTRY_OVERHEAD = 256
+
+def workload_digest(specs: Specs) -> bytes:
+    # a Workload and the equivalent ProcSpec list hash the same
+    h = hashlib.blake2b(digest_size=16)
+    h.update(len(specs).to_bytes(8, "little"))
+    if hasattr(specs, "columns"):
+        for c in (specs.pid, specs.arrival, specs.burst, specs.priority, specs.deadline):
+            h.update(c.astype("q", copy=False).tobytes())
+    else:
+        for c in ([p.pid for p in specs], [p.arrival for p in specs],
+                  [p.burst for p in specs], [p.priority for p in specs],
+                  [NO_DEADLINE if p.deadline is None else p.deadline for p in specs]):
+            h.update(array("q", c).tobytes())
+    return h.digest()
+
+def _timeline_bytes(timeline: Timeline) -> int:
+    return sum(a.itemsize * len(a) for a in (timeline.pid, timeline.start, timeline.end, timeline.core))
+
+# LRU cache of scheduler results keyed on the workload digest plus the parameters
+# that affect the algorithm; bounded by the bytes held in cached timelines.
+class ScheduleCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._entries: "OrderedDict[tuple, Tuple[Timeline, Tuple[float, float], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(algo: str, specs: Specs, cores: int = 1, quantum: int = 1, preemptive: bool = False,
+            per_core: bool = False, levels: int = 3, boost: int = 0) -> tuple:
+        # parameters an algorithm ignores are normalised away so they share an entry
+        quantum = max(1, quantum) if algo in ("rr", "cfs", "mlfq") else 0
+        preemptive = bool(preemptive) if algo in ("sjf", "priority", "edf") else False
+        per_core = bool(per_core) and cores > 1
+        levels, boost = (max(1, levels), max(0, boost)) if algo == "mlfq" else (0, 0)
+        return (algo, max(1, cores), quantum, preemptive, per_core, levels, boost, workload_digest(specs))
+
+    def run(self, algo: str, specs: Specs, cores: int = 1, quantum: int = 1, preemptive: bool = False,
+            per_core: bool = False, levels: int = 3, boost: int = 0) -> Tuple[Timeline, Tuple[float, float]]:
+        # the returned Timeline is shared with later hits and must not be modified
+        if not hasattr(specs, "__len__"):
+            # a one-shot stream cannot be hashed without consuming it
+            return schedule(algo, specs, cores=cores, quantum=quantum, preemptive=preemptive,
+                            per_core=per_core, columnar=True, levels=levels, boost=boost)
+        k = self.key(algo, specs, cores, quantum, preemptive, per_core, levels, boost)
+        with self._lock:
+            hit = self._entries.get(k)
+            if hit is not None:
+                self._entries.move_to_end(k)
+                self.hits += 1
+                return hit[0], hit[1]
+            self.misses += 1
+        timeline, metrics = schedule(algo, specs, cores=cores, quantum=quantum, preemptive=preemptive,
+                                     per_core=per_core, columnar=True, levels=levels, boost=boost)
+        size = _timeline_bytes(timeline) + _ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return timeline, metrics
+        with self._lock:
+            old = self._entries.pop(k, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[k] = (timeline, metrics, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, freed) = self._entries.popitem(last=False)
+                self._bytes -= freed
+                self.evictions += 1
+        return timeline, metrics
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes}
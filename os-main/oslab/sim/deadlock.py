@@ -0,0 +1,279 @@
+import random
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from oslab.sim.semaphore_sim import SemaphoreSimulator
+
+class WaitForGraph:
+    # Wait-for graph as a link-cut tree: worker -> resource while waiting, resource ->
+    # worker while held. Every node has one out-edge at most, so a wait w -> r closes a
+    # cycle exactly when w is the root of r's tree; O(log n) amortized per operation.
+    def __init__(self, n: int = 0):
+        self._l: List[int] = []
+        self._r: List[int] = []
+        self._p: List[int] = []
+        self.grow(n)
+
+    def grow(self, n: int):
+        extra = n - len(self._p)
+        if extra > 0:
+            self._l += [-1] * extra
+            self._r += [-1] * extra
+            self._p += [-1] * extra
+
+    def _is_root(self, x: int) -> bool:
+        p = self._p[x]
+        return p == -1 or (self._l[p] != x and self._r[p] != x)
+
+    def _rotate(self, x: int):
+        l, r, par = self._l, self._r, self._p
+        p = par[x]
+        g = par[p]
+        if not self._is_root(p):
+            if l[g] == p:
+                l[g] = x
+            else:
+                r[g] = x
+        par[x] = g
+        if l[p] == x:
+            l[p] = r[x]
+            if r[x] != -1:
+                par[r[x]] = p
+            r[x] = p
+        else:
+            r[p] = l[x]
+            if l[x] != -1:
+                par[l[x]] = p
+            l[x] = p
+        par[p] = x
+
+    def _splay(self, x: int):
+        par = self._p
+        while not self._is_root(x):
+            p = par[x]
+            if not self._is_root(p):
+                g = par[p]
+                zigzig = (self._l[g] == p) == (self._l[p] == x)
+                self._rotate(p if zigzig else x)
+            self._rotate(x)
+
+    def _access(self, x: int):
+        last = -1
+        y = x
+        while y != -1:
+            self._splay(y)
+            self._r[y] = last
+            last = y
+            y = self._p[y]
+        self._splay(x)
+
+    def root(self, x: int) -> int:
+        self._access(x)
+        while self._l[x] != -1:
+            x = self._l[x]
+        self._splay(x)
+        return x
+
+    def link(self, child: int, parent: int):
+        # child must currently have no out-edge
+        self._access(child)
+        self._p[child] = parent
+
+    def cut(self, child: int):
+        self._access(child)
+        left = self._l[child]
+        if left != -1:
+            self._p[left] = -1
+            self._l[child] = -1
+
+# returned by ResourceTable.acquire once the table is closed
+CLOSED = object()
+
+class ResourceTable:
+    # Single-unit resources with FIFO handoff. A request that would close a wait-for
+    # cycle is refused and the cycle returned, so the requester can back off.
+    def __init__(self, resources: int, workers: int):
+        self.resources = resources
+        self.workers = workers
+        self.owner = [-1] * resources
+        self._free = resources
+        self.waiting: Dict[int, int] = {}
+        self.deadlocks = 0
+        self.graph = WaitForGraph(workers + resources)
+        self._queues = [deque() for _ in range(resources)]
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _node(self, r: int) -> int:
+        return self.workers + r
+
+    def _cycle(self, w: int, r: int) -> List[Tuple[int, int]]:
+        # (worker, resource it waits for) around the cycle w would close
+        out = [(w, r)]
+        h = self.owner[r]
+        while h != w:
+            nr = self.waiting[h]
+            out.append((h, nr))
+            h = self.owner[nr]
+        return out
+
+    def acquire(self, w: int, r: int):
+        # None once held, a cycle [(worker, resource)] if waiting would deadlock, or CLOSED
+        with self._lock:
+            if self._closed:
+                return CLOSED
+            h = self.owner[r]
+            if h == -1:
+                self.owner[r] = w
+                self._free -= 1
+                self.graph.link(self._node(r), w)
+                return None
+            if self.graph.root(self._node(r)) == w:
+                self.deadlocks += 1
+                return self._cycle(w, r)
+            self.graph.link(w, self._node(r))
+            self.waiting[w] = r
+            gate = threading.Lock()
+            gate.acquire()
+            self._queues[r].append((w, gate))
+        gate.acquire()
+        return CLOSED if self._closed else None
+
+    def release(self, w: int, r: int):
+        with self._lock:
+            if self.owner[r] != w:
+                return
+            node = self._node(r)
+            self.graph.cut(node)
+            q = self._queues[r]
+            if not q:
+                self.owner[r] = -1
+                self._free += 1
+                return
+            nxt, gate = q.popleft()
+            del self.waiting[nxt]
+            self.graph.cut(nxt)
+            self.graph.link(node, nxt)
+            self.owner[r] = nxt
+        gate.release()
+
+    def free(self) -> int:
+        return self._free
+
+    def close(self):
+        # wake every parked waiter; they see CLOSED and leave
+        with self._lock:
+            self._closed = True
+            for q in self._queues:
+                while q:
+                    q.popleft()[1].release()
+            self.waiting.clear()
+
+SCENARIOS = ("philosophers", "random")
+
+class DeadlockSimulator(SemaphoreSimulator):
+    # `workers` threads take resources one at a time: worker i needs i and i+1
+    # ("philosophers") or `need` random ones ("random"). On a refused request the
+    # worker reports the cycle ("deadlock"), drops what it holds ("abort") and retries.
+    def __init__(self, workers: int = 5, resources: Optional[int] = None, scenario: str = "philosophers",
+                 need: int = 2, seed: Optional[int] = None):
+        if scenario not in SCENARIOS:
+            raise ValueError(f"unknown scenario: {scenario}")
+        super().__init__(capacity=1)
+        self.workers = workers
+        self.resources = resources
+        self.scenario = scenario
+        self.need = need
+        self.seed = seed
+        self.table: Optional[ResourceTable] = None
+        self.completed = 0
+        self.aborts = 0
+        # pause parks the workers here; they only exit when the table is replaced
+        self._go = threading.Event()
+
+    def start(self, *_):
+        self._running = True
+        self._go.set()
+        if self.table is not None:
+            return
+        n = self.workers if self.scenario == "philosophers" or not self.resources else self.resources
+        self.table = ResourceTable(n, self.workers)
+        self._threads = []
+        base = random.Random(self.seed)
+        for w in range(self.workers):
+            t = threading.Thread(target=self._diner, args=(self.table, w, random.Random(base.random())),
+                                 daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _needs(self, table: ResourceTable, w: int, rng: random.Random) -> List[int]:
+        if self.scenario == "philosophers":
+            return [w, (w + 1) % table.resources]
+        return rng.sample(range(table.resources), min(self.need, table.resources))
+
+    def _diner(self, table: ResourceTable, w: int, rng: random.Random):
+        me = w + 1
+        while self.table is table:
+            if not self._go.wait(0.5):
+                continue
+            held = []
+            wanted = self._needs(table, w, rng)
+            for r in wanted:
+                self.events.put({"type": "try", "role": "W", "id": me, "res": r})
+                res = table.acquire(w, r)
+                if res is CLOSED:
+                    return
+                if res is not None:
+                    self.events.put({"type": "deadlock", "role": "W", "id": me,
+                                     "cycle": [{"worker": x + 1, "waits_for": y} for x, y in res],
+                                     "resources": [y for _, y in res]})
+                    break
+                held.append(r)
+                self.events.put({"type": "acquire", "role": "W", "id": me, "res": r, "sem": table.free()})
+                if len(held) < len(wanted):
+                    # the gap that lets neighbours each end up holding one fork
+                    self._sleep(rng.uniform(0.05, 0.2))
+            else:
+                self._sleep(rng.uniform(0.3, 0.7))
+                self.completed += 1
+            if len(held) < len(wanted):
+                self.aborts += 1
+                self.events.put({"type": "abort", "role": "W", "id": me, "released": list(held)})
+            for r in reversed(held):
+                table.release(w, r)
+                self.events.put({"type": "release", "role": "W", "id": me, "res": r, "sem": table.free()})
+            self._sleep(rng.uniform(0.2, 0.6))
+
+    @property
+    def value(self) -> int:
+        return self.table.free() if self.table is not None else self.workers
+
+    @property
+    def blocked(self) -> List[Tuple[str, int]]:
+        if self.table is None:
+            return []
+        return [("W", w + 1) for w in list(self.table.waiting)]
+
+    def stats(self) -> Dict[str, object]:
+        table = self.table
+        return {"kind": "deadlock", "scenario": self.scenario, "workers": self.workers,
+                "resources": table.resources if table else self.resources or self.workers,
+                "deadlocks": table.deadlocks if table else 0, "aborts": self.aborts,
+                "completed": self.completed, "waiting": len(table.waiting) if table else 0}
+
+    def pause(self):
+        self._running = False
+        self._go.clear()
+
+    def resume(self):
+        self.start()
+
+    def reset(self):
+        self.pause()
+        if self.table is not None:
+            self.table.close()
+            self.table = None
+        self._threads = []
+        self.events.clear()
+        self.completed = 0
+        self.aborts = 0
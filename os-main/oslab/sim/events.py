@@ -0,0 +1,83 @@
+import threading
+from collections import deque
+from queue import Empty
+from typing import Any, Deque, List, Optional, Tuple
+
+# Broadcast event log: a fixed ring of events with absolute offsets. Readers keep their
+# own offset; one that falls more than `capacity` behind skips ahead and is told how
+# many it missed. clear() keeps offsets monotonic, so cursors stay valid.
+class EventLog:
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self._buf: List[Any] = [None] * capacity
+        self._next = 0
+        self._start = 0
+        self._lock = threading.Lock()
+
+    def put(self, event: Any):
+        with self._lock:
+            self._buf[self._next % self.capacity] = event
+            self._next += 1
+
+    @property
+    def head(self) -> int:
+        # offset the next event will get
+        return self._next
+
+    @property
+    def tail(self) -> int:
+        # oldest offset still retained
+        return max(self._start, self._next - self.capacity)
+
+    def read(self, offset: int, limit: Optional[int] = None) -> Tuple[List[Any], int, int]:
+        # (events, next offset, events lost to retention before `offset` could be read)
+        with self._lock:
+            tail = max(self._start, self._next - self.capacity)
+            dropped = tail - offset if offset < tail else 0
+            offset = max(offset, tail)
+            end = self._next if limit is None else min(self._next, offset + limit)
+            cap = self.capacity
+            events = [self._buf[i % cap] for i in range(offset, end)]
+        return events, end, dropped
+
+    def subscribe(self, offset: Optional[int] = None) -> "Subscription":
+        # new subscribers start at the live end unless given an offset to catch up from
+        return Subscription(self, self._next if offset is None else offset)
+
+    def clear(self):
+        with self._lock:
+            self._start = self._next
+            self._buf = [None] * self.capacity
+
+class Subscription:
+    # one reader's cursor; get()/empty() mirror queue.Queue so existing drain loops work
+    def __init__(self, log: EventLog, offset: int):
+        self.log = log
+        self.offset = offset
+        self.dropped = 0
+        self._pending: Deque[Any] = deque()
+
+    def _read(self, limit: Optional[int]) -> List[Any]:
+        events, self.offset, dropped = self.log.read(self.offset, limit)
+        self.dropped += dropped
+        return events
+
+    def drain(self, limit: Optional[int] = None) -> List[Any]:
+        out = []
+        while self._pending and (limit is None or len(out) < limit):
+            out.append(self._pending.popleft())
+        if limit is None or len(out) < limit:
+            out.extend(self._read(None if limit is None else limit - len(out)))
+        return out
+
+    def empty(self) -> bool:
+        return not self._pending and max(self.offset, self.log.tail) >= self.log.head
+
+    def get_nowait(self) -> Any:
+        if not self._pending:
+            self._pending.extend(self._read(256))
+            if not self._pending:
+                raise Empty
+        return self._pending.popleft()
+
+    get = get_nowait
@@ -1,11 +1,18 @@
+import asyncio
+import multiprocessing as mp
+import os
+import struct
 import threading
 import time
-from queue import Queue
+from queue import Empty, Queue
+from typing import List, Optional
+from oslab.sim.shm_ring import ShmRing
+from oslab.sim.events import EventLog
 
 class IPCSimulator:
     def __init__(self):
         self.buffer = Queue(maxsize=8)
-        self.events = Queue()
+        self.events = EventLog()
         self.speed = 1.0
         self._running = False
         self._threads = []
@@ -44,8 +51,7 @@ class IPCSimulator:
 
     def reset(self):
         self.pause()
-        while not self.events.empty():
-            self.events.get()
+        self.events.clear()
         while not self.buffer.empty():
             self.buffer.get()
 
@@ -55,3 +61,213 @@ class IPCSimulator:
     def speed_down(self):
         self.speed /= 1.2
 
+
+class AsyncIPCSimulator:
+    # IPCSimulator with asyncio tasks on the caller's loop sharing an asyncio.Queue;
+    # controls must be called from that loop, and pause() cancels the tasks.
+    def __init__(self, producers: int = 1, consumers: int = 1, capacity: int = 8):
+        self.producers = producers
+        self.consumers = consumers
+        self.capacity = capacity
+        self.buffer: Optional[asyncio.Queue] = None
+        self.events = EventLog()
+        self.speed = 1.0
+        self._running = False
+        self._tasks: List[asyncio.Task] = []
+        self._seq = 0
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        if self.buffer is None:
+            self.buffer = asyncio.Queue(maxsize=self.capacity)
+        self._running = True
+        for i in range(self.producers):
+            self._tasks.append(loop.create_task(self._producer(i + 1)))
+        for i in range(self.consumers):
+            self._tasks.append(loop.create_task(self._consumer(i + 1)))
+
+    async def _sleep(self, secs: float):
+        await asyncio.sleep(max(0.01, secs / max(0.1, self.speed)))
+
+    async def _producer(self, idx: int):
+        while True:
+            i = self._seq
+            self._seq += 1
+            data = {"seq": i, "value": i * 2}
+            await self.buffer.put(data)
+            self.events.put({"type": "produce", "data": data})
+            await self._sleep(0.4)
+
+    async def _consumer(self, idx: int):
+        while True:
+            data = await self.buffer.get()
+            self.events.put({"type": "consume", "data": data})
+            await self._sleep(0.6)
+
+    @property
+    def size(self) -> int:
+        return self.buffer.qsize() if self.buffer is not None else 0
+
+    def pause(self):
+        self._running = False
+        for t in self._tasks:
+            t.cancel()
+        self._tasks.clear()
+
+    def resume(self):
+        if not self._running:
+            self.start()
+
+    def reset(self):
+        self.pause()
+        self.events.clear()
+        self.buffer = None
+        self._seq = 0
+
+    async def aclose(self):
+        tasks = list(self._tasks)
+        self.pause()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def speed_up(self):
+        self.speed *= 1.2
+
+    def speed_down(self):
+        self.speed /= 1.2
+
+
+# (seq, value) as stored in a shared-memory slot
+_ITEM = struct.Struct("<qq")
+
+def _shm_producer(ring, seq, events, go, stop, speed, idx):
+    pid = os.getpid()
+    while not stop.is_set():
+        if not go.wait(0.2):
+            continue
+        with seq.get_lock():
+            i = seq.value
+            seq.value += 1
+        while not ring.put(_ITEM.pack(i, i * 2), timeout=0.2):
+            if stop.is_set():
+                return
+        events.put({"type": "produce", "data": {"seq": i, "value": i * 2, "pid": pid}})
+        time.sleep(max(0.01, 0.4 / max(0.1, speed.value)))
+
+def _shm_consumer(ring, events, go, stop, speed, idx):
+    pid = os.getpid()
+    while not stop.is_set():
+        if not go.wait(0.2):
+            continue
+        with ring.read(timeout=0.2) as view:
+            if view is None:
+                continue
+            i, value = _ITEM.unpack_from(view)
+        events.put({"type": "consume", "data": {"seq": i, "value": value, "pid": pid}})
+        time.sleep(max(0.01, 0.6 / max(0.1, speed.value)))
+
+
+class SharedMemoryIPCSimulator:
+    # AsyncIPCSimulator with one OS process per worker over a ShmRing. pause parks the
+    # workers (never killed while holding a ring lock); reset stops them.
+    def __init__(self, producers: int = 1, consumers: int = 1, capacity: int = 8):
+        self.producers = producers
+        self.consumers = consumers
+        self.capacity = capacity
+        methods = mp.get_all_start_methods()
+        # workers are started from the multi-threaded server, where fork is unsafe
+        self._ctx = mp.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self.events = EventLog()
+        self._inbox = self._ctx.Queue()
+        self._pump: Optional[threading.Thread] = None
+        self._pumping = threading.Event()
+        self._speed = self._ctx.Value("d", 1.0, lock=False)
+        self._go = self._ctx.Event()
+        self._stop = self._ctx.Event()
+        self._seq = self._ctx.Value("q", 0)
+        self._ring: Optional[ShmRing] = None
+        self._procs: List = []
+
+    @property
+    def speed(self) -> float:
+        return self._speed.value
+
+    @speed.setter
+    def speed(self, value: float):
+        self._speed.value = value
+
+    def start(self):
+        if self._ring is None:
+            self._ring = ShmRing(self.capacity, _ITEM.size, self._ctx)
+        self._go.set()
+        if self._procs:
+            return
+        self._stop.clear()
+        self._pumping.set()
+        self._pump = threading.Thread(target=self._forward, daemon=True)
+        self._pump.start()
+        args = (self._inbox, self._go, self._stop, self._speed)
+        for i in range(self.producers):
+            self._procs.append(self._ctx.Process(target=_shm_producer, args=(self._ring, self._seq) + args + (i + 1,),
+                                                 daemon=True))
+        for i in range(self.consumers):
+            self._procs.append(self._ctx.Process(target=_shm_consumer, args=(self._ring,) + args + (i + 1,),
+                                                 daemon=True))
+        for p in self._procs:
+            p.start()
+
+    def _forward(self):
+        while self._pumping.is_set():
+            try:
+                self.events.put(self._inbox.get(timeout=0.2))
+            except Empty:
+                pass
+
+    @property
+    def size(self) -> int:
+        return self._ring.qsize() if self._ring is not None else 0
+
+    @property
+    def pids(self) -> List[int]:
+        return [p.pid for p in self._procs]
+
+    def pause(self):
+        self._go.clear()
+
+    def resume(self):
+        self.start()
+
+    def _stop_workers(self):
+        self._stop.set()
+        self._go.clear()
+        for p in self._procs:
+            p.join(timeout=1.0)
+            if p.is_alive():
+                p.terminate()
+                p.join()
+        self._procs.clear()
+        if self._pump is not None:
+            self._pumping.clear()
+            self._pump.join()
+            self._pump = None
+        while True:
+            try:
+                self._inbox.get_nowait()
+            except Empty:
+                break
+
+    def reset(self):
+        self._stop_workers()
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+        self.events.clear()
+        self._seq.value = 0
+
+    async def aclose(self):
+        await asyncio.get_running_loop().run_in_executor(None, self.reset)
+
+    def speed_up(self):
+        self.speed *= 1.2
+
+    def speed_down(self):
+        self.speed /= 1.2
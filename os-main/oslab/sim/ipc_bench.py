@@ -0,0 +1,228 @@
+import argparse
+import json
+import multiprocessing as mp
+import queue
+import struct
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+from oslab.sim.shm_ring import ShmRing
+
+# Throughput/latency benchmark for bounded producer-consumer buffers.
+#   queue  - queue.Queue(maxsize)
+#   deque  - collections.deque guarded by one lock and two Conditions
+#   spsc   - single-producer/single-consumer ring without locks (one ring per pair,
+#            so it needs producers == consumers)
+#   shm    - ShmRing in shared memory, producers and consumers in separate processes
+BACKENDS = ("queue", "deque", "spsc", "shm")
+PERCENTILES = (50, 95, 99)
+
+# every message starts with (seq, send time in ns); the rest is padding up to `payload`
+_MSG = struct.Struct("<qq")
+_STOP = -1
+
+class DequeBuffer:
+    def __init__(self, capacity: int):
+        self._items = deque()
+        self._cap = capacity
+        lock = threading.Lock()
+        self._not_full = threading.Condition(lock)
+        self._not_empty = threading.Condition(lock)
+
+    def put(self, item):
+        with self._not_full:
+            while len(self._items) >= self._cap:
+                self._not_full.wait()
+            self._items.append(item)
+            self._not_empty.notify()
+
+    def get(self):
+        with self._not_empty:
+            while not self._items:
+                self._not_empty.wait()
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+
+class SpscRing:
+    # one writer per index, so no lock is needed under the GIL
+    def __init__(self, capacity: int):
+        self._size = capacity + 1
+        self._buf = [None] * self._size
+        self._head = 0
+        self._tail = 0
+
+    def put(self, item):
+        head = self._head
+        nxt = (head + 1) % self._size
+        while nxt == self._tail:
+            time.sleep(0)
+        self._buf[head] = item
+        self._head = nxt
+
+    def get(self):
+        tail = self._tail
+        while tail == self._head:
+            time.sleep(0)
+        item = self._buf[tail]
+        self._buf[tail] = None
+        self._tail = (tail + 1) % self._size
+        return item
+
+def _message(seq: int, pad: bytes) -> bytes:
+    return _MSG.pack(seq, time.perf_counter_ns()) + pad
+
+def _produce(put: Callable, count: int, payload: int):
+    pad = bytes(max(0, payload - _MSG.size))
+    for seq in range(count):
+        put(_message(seq, pad))
+
+def _consume(get: Callable, out: List[int]):
+    # perf_counter_ns is system-wide on Linux/Windows, so it is comparable across processes
+    while True:
+        seq, sent = _MSG.unpack_from(get())
+        if seq == _STOP:
+            return
+        out.append(time.perf_counter_ns() - sent)
+
+def _shm_produce(ring: ShmRing, count: int, payload: int, go):
+    go.wait()
+    _produce(ring.put, count, payload)
+
+def _shm_consume(ring: ShmRing, go, results):
+    go.wait()
+    lat: List[int] = []
+    while True:
+        with ring.read() as view:
+            seq, sent = _MSG.unpack_from(view)
+        if seq == _STOP:
+            break
+        lat.append(time.perf_counter_ns() - sent)
+    ring.close()
+    results.put(lat)
+
+def _split(messages: int, n: int) -> List[int]:
+    return [messages // n + (1 if i < messages % n else 0) for i in range(n)]
+
+def _run_threads(backend: str, producers: int, consumers: int, capacity: int, payload: int,
+                 messages: int) -> Tuple[float, List[int]]:
+    if backend == "spsc":
+        rings = [SpscRing(capacity) for _ in range(producers)]
+        puts = [r.put for r in rings]
+        gets = [r.get for r in rings]
+    else:
+        buf = queue.Queue(maxsize=capacity) if backend == "queue" else DequeBuffer(capacity)
+        puts = [buf.put] * producers
+        gets = [buf.get] * consumers
+    lats: List[List[int]] = [[] for _ in range(consumers)]
+    cs = [threading.Thread(target=_consume, args=(gets[i], lats[i]), daemon=True) for i in range(consumers)]
+    ps = [threading.Thread(target=_produce, args=(puts[i], n, payload), daemon=True)
+          for i, n in enumerate(_split(messages, producers))]
+    t0 = time.perf_counter()
+    for t in cs + ps:
+        t.start()
+    for t in ps:
+        t.join()
+    stop = _MSG.pack(_STOP, 0)
+    for i in range(consumers):
+        puts[i % producers](stop)
+    for t in cs:
+        t.join()
+    return time.perf_counter() - t0, [x for lat in lats for x in lat]
+
+def _check(procs):
+    for p in procs:
+        if p.exitcode:
+            raise RuntimeError(f"benchmark process {p.name} exited with code {p.exitcode}")
+
+def _run_processes(producers: int, consumers: int, capacity: int, payload: int,
+                   messages: int) -> Tuple[float, List[int]]:
+    methods = mp.get_all_start_methods()
+    # the benchmark endpoint runs inside the multi-threaded server, where fork is unsafe
+    ctx = mp.get_context("forkserver" if "forkserver" in methods else "spawn")
+    ring = ShmRing(capacity, max(payload, _MSG.size), ctx)
+    # the barrier keeps process start-up out of the measurement
+    go = ctx.Barrier(producers + consumers + 1)
+    results = ctx.Queue()
+    cs = [ctx.Process(target=_shm_consume, args=(ring, go, results), daemon=True) for _ in range(consumers)]
+    ps = [ctx.Process(target=_shm_produce, args=(ring, n, payload, go), daemon=True)
+          for n in _split(messages, producers)]
+    try:
+        for p in cs + ps:
+            p.start()
+        go.wait(timeout=60)
+        t0 = time.perf_counter()
+        for p in ps:
+            p.join()
+        _check(ps)
+        stop = _MSG.pack(_STOP, 0)
+        for _ in range(consumers):
+            while not ring.put(stop, timeout=0.5):
+                _check(cs)
+        lat = []
+        for _ in range(consumers):
+            while True:
+                try:
+                    lat.extend(results.get(timeout=0.5))
+                    break
+                except queue.Empty:
+                    _check(cs)
+        elapsed = time.perf_counter() - t0
+        for p in cs:
+            p.join()
+    finally:
+        for p in cs + ps:
+            if p.is_alive():
+                p.terminate()
+        ring.close()
+    return elapsed, lat
+
+def _percentiles(lat: List[int]) -> Dict[str, float]:
+    if not lat:
+        return {"mean": 0.0, **{f"p{q}": 0.0 for q in PERCENTILES}, "max": 0.0}
+    lat.sort()
+    n = len(lat)
+    out = {"mean": sum(lat) / n / 1000.0}
+    for q in PERCENTILES:
+        out[f"p{q}"] = lat[min(n - 1, (n * q) // 100)] / 1000.0
+    out["max"] = lat[-1] / 1000.0
+    return out
+
+def run_benchmark(backend: str = "queue", producers: int = 1, consumers: int = 1, capacity: int = 8,
+                  payload: int = 64, messages: int = 100_000) -> Dict[str, object]:
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend: {backend}")
+    if producers < 1 or consumers < 1 or capacity < 1:
+        raise ValueError("producers, consumers and capacity must be positive")
+    if backend == "spsc" and producers != consumers:
+        raise ValueError("spsc pairs one producer with one consumer; producers must equal consumers")
+    payload = max(payload, _MSG.size)
+    if backend == "shm":
+        elapsed, lat = _run_processes(producers, consumers, capacity, payload, messages)
+    else:
+        elapsed, lat = _run_threads(backend, producers, consumers, capacity, payload, messages)
+    return {
+        "backend": backend, "producers": producers, "consumers": consumers, "capacity": capacity,
+        "payload": payload, "messages": len(lat), "seconds": elapsed,
+        "throughput": len(lat) / elapsed if elapsed > 0 else 0.0,
+        "latency_us": _percentiles(lat),
+    }
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="producer-consumer buffer benchmark, one JSON line per backend")
+    ap.add_argument("--backends", default=",".join(BACKENDS))
+    ap.add_argument("--producers", type=int, default=1)
+    ap.add_argument("--consumers", type=int, default=1)
+    ap.add_argument("--capacity", type=int, default=8)
+    ap.add_argument("--payload", type=int, default=64)
+    ap.add_argument("--messages", type=int, default=100_000)
+    args = ap.parse_args(argv)
+    for backend in args.backends.split(","):
+        if backend == "spsc" and args.producers != args.consumers:
+            continue
+        row = run_benchmark(backend, args.producers, args.consumers, args.capacity, args.payload, args.messages)
+        print(json.dumps(row, ensure_ascii=False), flush=True)
+
+if __name__ == "__main__":
+    main()
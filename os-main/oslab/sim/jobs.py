@@ -0,0 +1,452 @@
+import asyncio
+import multiprocessing as mp
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from oslab.models.process import NO_DEADLINE, ProcSpec
+from oslab.models.workload import Workload, int64_column
+from oslab.sim.metrics import batch_metrics
+from oslab.sim.scheduler import ALGORITHMS, MLFQ_MAX_LEVELS, Rescheduler, schedule, schedule_iter
+from oslab.sim.store import write_timeline
+from oslab.sim.trace import RECORD, open_trace
+
+class Rejected(Exception):
+    # admission refused; status is the HTTP code to answer with
+    def __init__(self, status: int, detail: str, retry_after: int = 1):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+        self.retry_after = retry_after
+
+    def __reduce__(self):
+        # raised inside process jobs too, so it must survive the pipe back
+        return Rejected, (self.status, self.detail, self.retry_after)
+
+class Cancelled(Exception):
+    # the caller went away; the job was dropped or killed
+    pass
+
+def schedule_size(payload: dict) -> int:
+    # number of processes a /api/schedule body describes, without building them
+    return max(len(payload.get(k) or ()) for k in ("arrivals", "bursts", "priorities", "deadlines"))
+
+def schedule_args(payload: dict) -> Tuple[List[ProcSpec], Dict[str, object]]:
+    arrivals = payload.get("arrivals", [])
+    bursts = payload.get("bursts", [])
+    priorities = payload.get("priorities", [])
+    deadlines = payload.get("deadlines") or []
+    n = max(len(arrivals), len(bursts), len(priorities), len(deadlines))
+    if n == 0:
+        specs = [ProcSpec(1,0,5,2), ProcSpec(2,2,3,1), ProcSpec(3,4,2,3)]
+    else:
+        specs = [
+            ProcSpec(i+1,
+                     arrivals[i] if i < len(arrivals) else 0,
+                     bursts[i] if i < len(bursts) else 1,
+                     priorities[i] if i < len(priorities) else 0,
+                     deadlines[i] if i < len(deadlines) else None)
+            for i in range(n)
+        ]
+    return specs, schedule_params(payload)
+
+def mlfq_levels(value) -> int:
+    levels = int(value)
+    if not 1 <= levels <= MLFQ_MAX_LEVELS:
+        raise ValueError(f"levels must be between 1 and {MLFQ_MAX_LEVELS}")
+    return levels
+
+def schedule_params(payload: dict) -> Dict[str, object]:
+    algo = payload.get("algo", "fcfs")
+    if algo not in ALGORITHMS:
+        algo = "fcfs"
+    return {
+        "algo": algo,
+        "cores": max(1, int(payload.get("cores", 1))),
+        "quantum": max(1, int(payload.get("quantum", 1))),
+        "preemptive": bool(payload.get("preemptive", False)),
+        "per_core": bool(payload.get("per_core", False)),
+        "levels": mlfq_levels(payload.get("levels", 3)),
+        "boost": max(0, int(payload.get("boost", 0))),
+    }
+
+def schedule_response(payload: dict, cache=None, store_path: Optional[str] = None) -> Dict[str, object]:
+    # /api/schedule body -> response dict; with store_path only the summary is returned
+    specs, params = schedule_args(payload)
+    algo = params.pop("algo")
+    if cache is not None:
+        timeline, metrics = cache.run(algo, specs, **params)
+    else:
+        timeline, metrics = schedule(algo, specs, columnar=True, **params)
+    return _schedule_output(payload, specs, params["cores"], timeline, metrics, store_path)
+
+def trace_size(path: str, fmt: str) -> int:
+    # processes in a trace file; a rough guess for CSV
+    return os.path.getsize(path) // (RECORD.size if fmt == "bin" else 8)
+
+def _capped(specs: Iterator[ProcSpec], limit: Optional[int]) -> Iterator[ProcSpec]:
+    for n, p in enumerate(specs, 1):
+        if limit is not None and n > limit:
+            raise Rejected(413, f"at most {limit} processes per trace")
+        yield p
+
+def trace_response(path: str, fmt: str, params: Dict[str, object], with_timeline: bool = False,
+                   max_procs: Optional[int] = None) -> Dict[str, object]:
+    # a trace file -> response dict; Rejected(413) past max_procs records
+    params = dict(params)
+    algo = params.pop("algo")
+    specs = _capped(open_trace(path, fmt), max_procs)
+    if with_timeline:
+        timeline, metrics = schedule(algo, specs, columnar=True, **params)
+        return {"metrics": {"wait": metrics[0], "turn": metrics[1]}, "count": len(timeline),
+                "columns": timeline.to_columns()}
+    # only counted, so memory does not grow with the slices
+    slices = schedule_iter(algo, specs, **params)
+    count = 0
+    while True:
+        try:
+            next(slices)
+        except StopIteration as stop:
+            metrics = stop.value
+            break
+        count += 1
+    return {"metrics": {"wait": metrics[0], "turn": metrics[1]}, "count": count}
+
+def incremental_response(payload: dict, resched: Rescheduler, store_path: Optional[str] = None) -> Dict[str, object]:
+    # schedule_response through the caller's Rescheduler, made for these parameters
+    specs, _ = schedule_args(payload)
+    timeline, metrics = resched.run(specs)
+    out = _schedule_output(payload, specs, resched.cores, timeline, metrics, store_path)
+    out["incremental"] = {"resumed_at": resched.resumed_at, "reused": resched.reused}
+    return out
+
+def _schedule_output(payload: dict, specs, cores: int, timeline, metrics,
+                     store_path: Optional[str]) -> Dict[str, object]:
+    out = {"metrics": {"wait": metrics[0], "turn": metrics[1]}}
+    if payload.get("stats"):
+        out["stats"] = batch_metrics(Workload.from_specs(specs), timeline, cores)
+    if store_path is not None:
+        out["result"] = write_timeline(store_path, timeline, metrics)
+    elif payload.get("columnar"):
+        out["columns"] = timeline.to_columns()
+    else:
+        out["slices"] = [{"pid": p, "start": s, "end": e, "core": c}
+                         for p, s, e, c in zip(timeline.pid, timeline.start, timeline.end, timeline.core)]
+    return out
+
+# batch jobs: the parsed workloads, set once per worker by the pool initializer
+_BATCH: List[Workload] = []
+_BATCH_MAX_JOBS = 4096
+
+def _batch_workload(spec: dict) -> Workload:
+    # same padding rules as schedule_args, built straight into columns
+    n = schedule_size(spec)
+    if n == 0:
+        return Workload([0, 2, 4], [5, 3, 2], [2, 1, 3])
+
+    def col(key, fill):
+        out = np.full(n, fill, dtype=np.int64)
+        vals = spec.get(key) or []
+        if key == "deadlines":
+            # null = no deadline
+            vals = [fill if v is None else v for v in vals]
+        out[:len(vals)] = int64_column(vals, key)
+        return out
+
+    return Workload(col("arrivals", 0), col("bursts", 1), col("priorities", 0),
+                    deadline=col("deadlines", NO_DEADLINE))
+
+def _batch_jobs(payload: dict) -> List[Dict[str, object]]:
+    # explicit "jobs", or every algorithm in "algos" against every workload
+    count = max(1, len(payload.get("workloads") or ()))
+    jobs = payload.get("jobs")
+    if jobs is None:
+        algos = payload.get("algos") or list(ALGORITHMS)
+        defaults = {k: payload[k] for k in ("cores", "quantum", "preemptive", "per_core", "levels", "boost", "stats")
+                    if k in payload}
+        jobs = [dict(defaults, workload=w, algo=a) for w in range(count) for a in algos]
+    if len(jobs) > _BATCH_MAX_JOBS:
+        raise ValueError(f"at most {_BATCH_MAX_JOBS} jobs per batch")
+    out = []
+    for i, job in enumerate(jobs):
+        w = int(job.get("workload", 0))
+        if not 0 <= w < count:
+            raise ValueError(f"job {i}: no workload {w}")
+        if job.get("algo", "fcfs") not in ALGORITHMS:
+            raise ValueError(f"job {i}: unknown algorithm {job.get('algo')}")
+        out.append({"workload": w, "algo": job.get("algo", "fcfs"), "cores": max(1, int(job.get("cores", 1))),
+                    "quantum": max(1, int(job.get("quantum", 1))), "preemptive": bool(job.get("preemptive", False)),
+                    "per_core": bool(job.get("per_core", False)), "levels": mlfq_levels(job.get("levels", 3)),
+                    "boost": max(0, int(job.get("boost", 0))), "stats": bool(job.get("stats", False))})
+    return out
+
+def batch_size(payload: dict) -> Tuple[int, int]:
+    # (jobs, processes scheduled over all jobs), without building anything
+    sizes = [schedule_size(w) for w in payload.get("workloads") or ()] or [3]
+    jobs = payload.get("jobs")
+    if jobs is None:
+        per = len(payload.get("algos") or ALGORITHMS)
+        return per * len(sizes), per * sum(sizes)
+    return len(jobs), sum(sizes[int(j.get("workload", 0))] if 0 <= int(j.get("workload", 0)) < len(sizes) else 0
+                          for j in jobs)
+
+def _batch_one(workloads: List[Workload], job: Dict[str, object], metrics_only: bool, cache=None,
+               store_path: Optional[str] = None) -> Dict[str, object]:
+    workload = workloads[job["workload"]]
+    params = {k: job[k] for k in ("cores", "quantum", "preemptive", "per_core", "levels", "boost")}
+    if cache is not None:
+        timeline, metrics = cache.run(job["algo"], workload, **params)
+    else:
+        timeline, metrics = schedule(job["algo"], workload, columnar=True, **params)
+    out = dict(job)
+    out["metrics"] = {"wait": metrics[0], "turn": metrics[1]}
+    out["count"] = len(timeline)
+    if job["stats"]:
+        out["stats"] = batch_metrics(workload, timeline, job["cores"])
+    if store_path is not None:
+        out["result"] = write_timeline(store_path, timeline, metrics)
+    elif not metrics_only:
+        out["columns"] = timeline.to_columns()
+    return out
+
+def _init_batch(workloads: List[Workload]):
+    global _BATCH
+    _BATCH = workloads
+
+def _batch_in_worker(job: Dict[str, object], metrics_only: bool, store_path: Optional[str]) -> Dict[str, object]:
+    return _batch_one(_BATCH, job, metrics_only, store_path=store_path)
+
+def batch_response(payload: dict, cache=None, workers: int = 1,
+                   store_paths: Optional[List[str]] = None) -> Dict[str, object]:
+    # body: {"workloads": [{"arrivals", "bursts", "priorities", "deadlines"}, ...],
+    #        "jobs": [{"workload": i, "algo", "cores", "quantum", "preemptive", "per_core", "levels", "boost",
+    #                  "stats"}, ...]
+    #        or "algos": [...] to run each listed algorithm on every workload,
+    #        "metrics_only": bool}
+    # Each workload is parsed once; with workers > 1 the jobs go to a process pool.
+    # Results keep the job order, timelines as columns or written to store_paths.
+    workloads = [_batch_workload(w) for w in payload.get("workloads") or [{}]]
+    jobs = _batch_jobs(payload)
+    metrics_only = bool(payload.get("metrics_only", False))
+    paths = store_paths or [None] * len(jobs)
+    if workers <= 1 or len(jobs) <= 1:
+        return {"results": [_batch_one(workloads, job, metrics_only, cache, path) for job, path in zip(jobs, paths)]}
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_batch,
+                             initargs=(workloads,)) as pool:
+        futures = [pool.submit(_batch_in_worker, job, metrics_only, path) for job, path in zip(jobs, paths)]
+        return {"results": [f.result() for f in futures]}
+
+def _child(conn, fn: Callable, args: tuple):
+    # own process group, so a kill also takes down any pool the job started
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    try:
+        out = (True, fn(*args))
+    except Exception as e:
+        out = (False, e)
+    try:
+        conn.send(out)
+    finally:
+        conn.close()
+
+class JobPool:
+    # Runs CPU-bound request work off the event loop: jobs below process_threshold on a
+    # thread pool, bigger ones in a killable child process, at most `processes` at once.
+    # At most max_pending jobs (503) and max_per_client per client (429) are admitted.
+    def __init__(self, threads: int = 2, processes: Optional[int] = None, max_pending: int = 16,
+                 max_per_client: int = 2, process_threshold: int = 20_000, poll: float = 0.1):
+        self.threads = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="oslab-job")
+        self.processes = processes or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.max_per_client = max_per_client
+        self.process_threshold = process_threshold
+        self.poll = poll
+        methods = mp.get_all_start_methods()
+        # forking the multi-threaded server is unsafe; a fork server starts clean
+        self._ctx = mp.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._children = set()
+        self._clients: Dict[Any, int] = {}
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.cancelled = 0
+
+    def _admit(self, client: Any):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise Rejected(503, "server busy: too many scheduling jobs queued")
+        if client is not None and self._clients.get(client, 0) >= self.max_per_client:
+            self.rejected += 1
+            raise Rejected(429, "too many scheduling jobs in flight for this client")
+        self.pending += 1
+        if client is not None:
+            self._clients[client] = self._clients.get(client, 0) + 1
+
+    def _done(self, client: Any):
+        self.pending -= 1
+        if client is not None:
+            left = self._clients.pop(client, 1) - 1
+            if left > 0:
+                self._clients[client] = left
+
+    async def run(self, fn: Callable, *args, size: int = 0, client: Any = None, timeout: Optional[float] = None,
+                  cancelled: Optional[Callable[[], Awaitable[bool]]] = None, process: Optional[bool] = None,
+                  share: int = 1) -> Any:
+        # `process` overrides the choice by size; a job with share > 1 also takes up to
+        # share - 1 free slots and is called with workers=n. Raises Rejected,
+        # TimeoutError, Cancelled or whatever fn raised.
+        self._admit(client)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if size >= self.process_threshold if process is None else process:
+            try:
+                return await self._in_process(fn, args, deadline, cancelled, share)
+            finally:
+                self._done(client)
+        return await self._in_thread(fn, args, client, deadline, cancelled)
+
+    def stream(self, items: Iterator, client: Any = None, timeout: Optional[float] = None,
+               cancelled: Optional[Callable[[], Awaitable[bool]]] = None) -> AsyncIterator:
+        # a sync iterator, one pool hop per item; admits (or raises Rejected) up front
+        self._admit(client)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        return self._stream(items, client, deadline, cancelled)
+
+    async def _stream(self, items, client, deadline, cancelled):
+        loop = asyncio.get_running_loop()
+        end = object()
+        fut = None
+        try:
+            while True:
+                fut = self.threads.submit(next, items, end)
+                waiter = asyncio.wrap_future(fut)
+                while not (await asyncio.wait({waiter}, timeout=self.poll))[0]:
+                    await self._check(deadline, cancelled)
+                item = waiter.result()
+                if item is end:
+                    break
+                yield item
+                await self._check(deadline, cancelled)
+            self.completed += 1
+        finally:
+            close = getattr(items, "close", None)
+            if fut is not None:
+                fut.cancel()  # only drops it if it has not started yet
+            if fut is not None and not fut.done():
+                # still inside next(): close and free the slot once it returns
+
+                def finished(_):
+                    if close is not None:
+                        close()
+                    try:
+                        loop.call_soon_threadsafe(self._done, client)
+                    except RuntimeError:
+                        pass
+
+                fut.add_done_callback(finished)
+            else:
+                if close is not None:
+                    close()
+                self._done(client)
+
+    async def _check(self, deadline: Optional[float], cancelled):
+        if deadline is not None and time.monotonic() > deadline:
+            self.timeouts += 1
+            raise TimeoutError("scheduling job exceeded its time limit")
+        if cancelled is not None and await cancelled():
+            self.cancelled += 1
+            raise Cancelled()
+
+    async def _in_thread(self, fn, args, client, deadline, cancelled):
+        loop = asyncio.get_running_loop()
+        fut = self.threads.submit(fn, *args)
+
+        def finished(_):
+            try:
+                loop.call_soon_threadsafe(self._done, client)
+            except RuntimeError:
+                pass
+
+        fut.add_done_callback(finished)
+        waiter = asyncio.wrap_future(fut)
+        try:
+            while True:
+                done, _ = await asyncio.wait({waiter}, timeout=self.poll)
+                if done:
+                    self.completed += 1
+                    return waiter.result()
+                await self._check(deadline, cancelled)
+        except BaseException:
+            # only drops it if it has not started yet
+            fut.cancel()
+            raise
+
+    async def _in_process(self, fn, args, deadline, cancelled, share=1):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.processes)
+        while True:
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.poll)
+                break
+            except asyncio.TimeoutError:
+                await self._check(deadline, cancelled)
+        held = 1
+        # extra slots only while nobody is waiting
+        while held < share and not self._slots.locked():
+            await self._slots.acquire()
+            held += 1
+        if share > 1:
+            fn = partial(fn, workers=held)
+        try:
+            recv, send = self._ctx.Pipe(duplex=False)
+            # not a daemon, so the job may start its own pool; close() kills leftovers
+            proc = self._ctx.Process(target=_child, args=(send, fn, args))
+            proc.start()
+            send.close()
+            self._children.add(proc)
+            try:
+                while not await asyncio.to_thread(recv.poll, self.poll):
+                    await self._check(deadline, cancelled)
+                try:
+                    ok, value = await asyncio.to_thread(recv.recv)
+                except EOFError:
+                    await asyncio.to_thread(proc.join)
+                    raise RuntimeError(f"scheduling worker exited with code {proc.exitcode}")
+            finally:
+                if proc.is_alive():
+                    self._kill(proc)
+                await asyncio.to_thread(proc.join)
+                self._children.discard(proc)
+                recv.close()
+        finally:
+            for _ in range(held):
+                self._slots.release()
+        if not ok:
+            raise value
+        self.completed += 1
+        return value
+
+    @staticmethod
+    def _kill(proc):
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+                return
+            except (ProcessLookupError, PermissionError):
+                pass
+        proc.kill()
+
+    def close(self):
+        self.threads.shutdown(wait=False, cancel_futures=True)
+        for proc in list(self._children):
+            self._kill(proc)
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": self.pending, "max_pending": self.max_pending,
+                "max_per_client": self.max_per_client, "process_threshold": self.process_threshold,
+                "processes": self.processes, "completed": self.completed, "rejected": self.rejected,
+                "timeouts": self.timeouts, "cancelled": self.cancelled}
@@ -0,0 +1,61 @@
+from typing import Dict, List, Optional, Union
+import numpy as np
+from oslab.models.process import Timeline, TimelineSlice
+from oslab.models.workload import Workload
+
+PERCENTILES = (50, 95, 99)
+
+def _summary(x: np.ndarray) -> Dict[str, float]:
+    if not len(x):
+        return {"mean": 0.0, **{f"p{q}": 0.0 for q in PERCENTILES}}
+    pct = np.percentile(x, PERCENTILES)
+    return {"mean": float(x.mean()), **{f"p{q}": float(v) for q, v in zip(PERCENTILES, pct)}}
+
+def _column(a, dtype) -> np.ndarray:
+    # array('i'/'q') columns are viewed in place, no copy
+    return np.frombuffer(a, dtype=a.typecode) if len(a) else np.zeros(0, dtype=dtype)
+
+def batch_metrics(workload: Workload, timeline: Union[Timeline, List[TimelineSlice]],
+                  cores: Optional[int] = None) -> Dict[str, object]:
+    if not isinstance(timeline, Timeline):
+        tl = Timeline()
+        for s in timeline:
+            tl.add(s.pid, s.start, s.end, s.core)
+        timeline = tl
+    n = len(workload)
+    pid = _column(timeline.pid, np.int64)
+    start = _column(timeline.start, np.int64)
+    end = _column(timeline.end, np.int64)
+    if cores is None:
+        cores = int(_column(timeline.core, np.int32).max()) + 1 if len(timeline) else 1
+    if cores < 1:
+        raise ValueError("cores must be positive")
+    # map every slice to its row in the workload, whatever the pid numbering
+    order = np.argsort(workload.pid, kind="stable")
+    keys = workload.pid[order]
+    if n > 1 and (keys[1:] == keys[:-1]).any():
+        raise ValueError("workload pids must be unique")
+    k = np.searchsorted(keys, pid)
+    if len(pid) and (k.max() >= n or (keys[np.minimum(k, n - 1)] != pid).any()):
+        raise ValueError("timeline has pids that are not in the workload")
+    row = order[k]
+    finish = np.full(n, np.iinfo(np.int64).min, dtype=np.int64)
+    first = np.full(n, np.iinfo(np.int64).max, dtype=np.int64)
+    np.maximum.at(finish, row, end)
+    np.minimum.at(first, row, start)
+    if n and finish.min() == np.iinfo(np.int64).min:
+        raise ValueError("timeline is missing pids of the workload")
+    turn = finish - workload.arrival
+    wait = turn - workload.burst
+    response = first - workload.arrival
+    busy = int((end - start).sum())
+    span = int(finish.max() - workload.arrival.min()) if n else 0
+    return {
+        "count": n,
+        "wait": _summary(wait),
+        "turn": _summary(turn),
+        "response": _summary(response),
+        "makespan": span,
+        "throughput": n / span if span > 0 else 0.0,
+        "utilization": busy / (span * cores) if span > 0 else 0.0,
+    }
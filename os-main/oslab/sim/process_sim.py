@@ -1,19 +1,43 @@
+import heapq
 import threading
 import time
-from queue import Queue
-from typing import Dict, List
+from typing import List
 from oslab.models.process import ProcessState
+from oslab.sim.events import EventLog
+
+# (state entered, seconds spent in it before the next step); shared by both engines
+_LIFECYCLE = [
+    (ProcessState.CREATED, 0.5),
+    (ProcessState.READY, 0.5),
+    (ProcessState.RUNNING, 1.0),
+    (ProcessState.BLOCKED, 0.5),
+    (ProcessState.READY, 0.5),
+    (ProcessState.RUNNING, 1.0),
+    (ProcessState.TERMINATED, 0.0),
+]
 
 class ProcessSimulator:
-    def __init__(self):
-        self.events = Queue()
+    # one thread per process, or virtual=True: one event heap over a virtual clock,
+    # paced against wall time or (paced=False) as fast as possible
+    def __init__(self, virtual: bool = False, paced: bool = True):
+        self.events = EventLog()
         self.speed = 1.0
+        self.virtual = virtual
+        self.paced = paced
+        self.clock = 0.0
         self._threads: List[threading.Thread] = []
         self._running = False
         self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._gen = 0
 
     def start(self, count: int = 5):
         self._running = True
+        if self.virtual:
+            t = threading.Thread(target=self._run_virtual, args=(count, self._gen), daemon=True)
+            t.start()
+            self._threads.append(t)
+            return
         for i in range(count):
             t = threading.Thread(target=self._run_proc, args=(i + 1,), daemon=True)
             t.start()
@@ -23,41 +47,67 @@ class ProcessSimulator:
         time.sleep(max(0.01, secs / max(0.1, self.speed)))
 
     def _run_proc(self, pid: int):
-        self.events.put({"pid": pid, "state": ProcessState.CREATED.value})
-        self._sleep(0.5)
-        self.events.put({"pid": pid, "state": ProcessState.READY.value})
-        self._sleep(0.5)
-        if not self._running:
-            return
-        self.events.put({"pid": pid, "state": ProcessState.RUNNING.value})
-        self._sleep(1.0)
-        self.events.put({"pid": pid, "state": ProcessState.BLOCKED.value})
-        self._sleep(0.5)
-        self.events.put({"pid": pid, "state": ProcessState.READY.value})
-        self._sleep(0.5)
-        self.events.put({"pid": pid, "state": ProcessState.RUNNING.value})
-        self._sleep(1.0)
-        self.events.put({"pid": pid, "state": ProcessState.TERMINATED.value})
+        for step, (state, dwell) in enumerate(_LIFECYCLE):
+            if step == 2 and not self._running:
+                return
+            self.events.put({"pid": pid, "state": state.value})
+            if dwell:
+                self._sleep(dwell)
+
+    def _run_virtual(self, count: int, gen: int):
+        heap = [(0.0, pid, 0) for pid in range(1, count + 1)]
+        wall0 = time.monotonic()
+        v0 = self.clock = 0.0
+        speed0 = self.speed
+        while heap:
+            with self._cond:
+                if not self._running:
+                    while not self._running and self._gen == gen:
+                        self._cond.wait()
+                    wall0, v0 = time.monotonic(), self.clock
+                if self._gen != gen:
+                    return
+                vt = heap[0][0]
+                if self.paced:
+                    if self.speed != speed0:
+                        wall0, v0, speed0 = time.monotonic(), self.clock, self.speed
+                    delay = wall0 + (vt - v0) / max(0.1, speed0) - time.monotonic()
+                    if delay > 0:
+                        # wait on the condition so pause/reset/speed changes cut the wait short
+                        self._cond.wait(delay)
+                        continue
+            vt, pid, step = heapq.heappop(heap)
+            self.clock = vt
+            state, dwell = _LIFECYCLE[step]
+            self.events.put({"pid": pid, "state": state.value})
+            if step + 1 < len(_LIFECYCLE):
+                heapq.heappush(heap, (vt + dwell, pid, step + 1))
 
     def pause(self):
         with self._lock:
             self._running = False
+            self._cond.notify_all()
 
     def resume(self):
         with self._lock:
             if not self._running:
                 self._running = True
+            self._cond.notify_all()
 
     def reset(self):
         with self._lock:
             self._running = False
+            self._gen += 1
+            self._cond.notify_all()
             self._threads.clear()
-            while not self.events.empty():
-                self.events.get()
+            self.events.clear()
 
     def speed_up(self):
-        self.speed *= 1.2
+        with self._lock:
+            self.speed *= 1.2
+            self._cond.notify_all()
 
     def speed_down(self):
-        self.speed /= 1.2
-
+        with self._lock:
+            self.speed /= 1.2
+            self._cond.notify_all()
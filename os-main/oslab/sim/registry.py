@@ -0,0 +1,93 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Type
+
+class SimulatorRegistry:
+    # Simulators keyed by (session, kind), created on first use. Sessions past
+    # max_sessions (least recent first) or idle for idle_timeout are evicted; their
+    # simulators are reset and pooled (pool_size per class) for the next session.
+    def __init__(self, factories: Dict[str, Type], max_sessions: int = 256, idle_timeout: float = 900.0,
+                 pool_size: int = 32):
+        self.factories = factories
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.pool_size = pool_size
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._seen: Dict[str, float] = {}
+        self._pool: Dict[Type, List[Any]] = {}
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    def _touch(self, sid: str) -> Dict[str, Any]:
+        sims = self._sessions.get(sid)
+        if sims is None:
+            sims = self._sessions[sid] = {}
+        else:
+            self._sessions.move_to_end(sid)
+        self._seen[sid] = time.monotonic()
+        return sims
+
+    def _acquire(self, cls: Type) -> Any:
+        pool = self._pool.get(cls)
+        if pool:
+            self.reused += 1
+            return pool.pop()
+        self.created += 1
+        return cls()
+
+    async def _release(self, sim: Any):
+        aclose = getattr(sim, "aclose", None)
+        if aclose is not None:
+            await aclose()
+        sim.reset()
+        sim.speed = 1.0
+        pool = self._pool.setdefault(type(sim), [])
+        if len(pool) < self.pool_size:
+            pool.append(sim)
+
+    async def _drop(self, sid: str):
+        sims = self._sessions.pop(sid, None)
+        self._seen.pop(sid, None)
+        if sims is None:
+            return
+        self.evicted += 1
+        for sim in sims.values():
+            await self._release(sim)
+
+    async def get(self, sid: str, kind: str, cls: Optional[Type] = None) -> Any:
+        # cls swaps in a different implementation of `kind` (e.g. the IPC backend)
+        sims = self._touch(sid)
+        sim = sims.get(kind)
+        if sim is None or (cls is not None and type(sim) is not cls):
+            # the slot is filled before any await, so concurrent requests share one instance
+            sims[kind] = self._acquire(cls or self.factories[kind])
+            if sim is not None:
+                sims[kind].speed = sim.speed
+                await self._release(sim)
+            sim = sims[kind]
+        while len(self._sessions) > self.max_sessions:
+            await self._drop(next(iter(self._sessions)))
+        return sim
+
+    def peek(self, sid: str, kind: str) -> Optional[Any]:
+        # the session's simulator if it has one; counts as activity but creates nothing
+        if sid not in self._sessions:
+            return None
+        return self._touch(sid).get(kind)
+
+    async def evict_idle(self) -> int:
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [sid for sid, seen in self._seen.items() if seen < cutoff]
+        for sid in idle:
+            await self._drop(sid)
+        return len(idle)
+
+    async def close(self):
+        for sid in list(self._sessions):
+            await self._drop(sid)
+
+    def stats(self) -> Dict[str, int]:
+        return {"sessions": len(self._sessions), "max_sessions": self.max_sessions,
+                "pooled": sum(len(p) for p in self._pool.values()),
+                "created": self.created, "reused": self.reused, "evicted": self.evicted}
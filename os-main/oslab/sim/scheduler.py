@@ -1,112 +1,699 @@
-from typing import List, Tuple
-from oslab.models.process import ProcSpec, TimelineSlice
-
-def _metrics(specs: List[ProcSpec], slices: List[TimelineSlice]) -> Tuple[float, float]:
-    finish = {}
-    for s in slices:
-        finish[s.pid] = s.end
-    waits = []
-    turns = []
-    for p in specs:
-        t = finish[p.pid] - p.arrival
-        w = t - p.burst
-        waits.append(w)
-        turns.append(t)
-    return sum(waits) / len(waits) if waits else 0.0, sum(turns) / len(turns) if turns else 0.0
-
-def fcfs(specs: List[ProcSpec], cores: int = 1) -> Tuple[List[TimelineSlice], Tuple[float, float]]:
-    time = [0] * cores
-    order = sorted(specs, key=lambda p: (p.arrival, p.pid))
-    slices = []
-    for p in order:
-        idx = min(range(cores), key=lambda i: time[i])
-        start = max(time[idx], p.arrival)
-        end = start + p.burst
-        time[idx] = end
-        slices.append(TimelineSlice(pid=p.pid, start=start, end=end, core=idx))
-    return slices, _metrics(specs, slices)
-
-def sjf(specs: List[ProcSpec], cores: int = 1, preemptive: bool = False) -> Tuple[List[TimelineSlice], Tuple[float, float]]:
-    t = 0
-    done = set()
-    remaining = {p.pid: p.burst for p in specs}
-    slices = []
-    while len(done) < len(specs):
-        ready = [p for p in specs if p.arrival <= t and p.pid not in done and remaining[p.pid] > 0]
-        if not ready:
-            t = min([p.arrival for p in specs if p.pid not in done])
-            continue
-        if preemptive:
-            p = min(ready, key=lambda x: remaining[x.pid])
-            start = t
-            t += 1
-            remaining[p.pid] -= 1
-            slices.append(TimelineSlice(pid=p.pid, start=start, end=t, core=0))
-            if remaining[p.pid] == 0:
-                done.add(p.pid)
+import heapq
+from collections import deque
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Generator, Iterable, Iterator, List, Optional, Tuple, Union
+from oslab.models.process import NO_DEADLINE, ProcSpec, Timeline, TimelineSlice
+
+if TYPE_CHECKING:
+    from oslab.models.workload import Workload
+
+Specs = Union[List[ProcSpec], "Workload", Iterable[ProcSpec]]
+Result = Tuple[Union[List[TimelineSlice], Timeline], Tuple[float, float]]
+
+Row = Tuple[int, int, int, int, int, int]  # (rank, pid, arrival, burst, priority, deadline)
+RawSlice = Tuple[int, int, int, int]  # (pid, start, end, core), not yet coalesced
+Run = Generator[RawSlice, None, Tuple[float, float]]
+Stream = Generator[TimelineSlice, None, Tuple[float, float]]
+
+# live process record in _dispatch; _AUX is vruntime (cfs) or level (mlfq)
+_PID, _ARR, _BURST, _PRIO, _REM, _DL, _AUX, _EPOCH = range(8)
+
+def _rows(specs: Specs, by_pid: bool = False) -> Iterator[Row]:
+    # admission order; rank is the input position. Iterables other than lists and
+    # Workloads must already be sorted by arrival.
+    if hasattr(specs, "columns"):
+        pid, arrival, burst, prio, dl = specs.columns()
+    elif isinstance(specs, (list, tuple)):
+        pid = [p.pid for p in specs]
+        arrival = [p.arrival for p in specs]
+        burst = [p.burst for p in specs]
+        prio = [p.priority for p in specs]
+        dl = [NO_DEADLINE if p.deadline is None else p.deadline for p in specs]
+    else:
+        last = None
+        for rank, p in enumerate(specs):
+            if last is not None and p.arrival < last:
+                raise ValueError(f"trace is not sorted by arrival at record {rank}")
+            last = p.arrival
+            yield rank, p.pid, p.arrival, p.burst, p.priority, NO_DEADLINE if p.deadline is None else p.deadline
+        return
+    tie = pid if by_pid else range(len(pid))
+    for i in sorted(range(len(pid)), key=lambda i: (arrival[i], tie[i])):
+        yield i, pid[i], arrival[i], burst[i], prio[i], dl[i]
+
+def _means(done: int, wait_sum: int, turn_sum: int) -> Tuple[float, float]:
+    return (wait_sum / done, turn_sum / done) if done else (0.0, 0.0)
+
+class _FifoQueue:
+    __slots__ = ("_q",)
+
+    def __init__(self):
+        self._q: Deque[Tuple[int, int]] = deque()
+
+    def __len__(self):
+        return len(self._q)
+
+    def push(self, key, i: int):
+        self._q.append((key, i))
+
+    def peek(self):
+        return self._q[0]
+
+    def pop(self):
+        return self._q.popleft()
+
+    def steal(self):
+        return self._q.pop()
+
+    def remap(self, f: Callable[[int], int]) -> "_FifoQueue":
+        # copy with every entry's rank passed through f
+        q = _FifoQueue()
+        q._q.extend((k, f(i)) for k, i in self._q)
+        return q
+
+class _HeapQueue:
+    __slots__ = ("_h",)
+
+    def __init__(self):
+        self._h: List[Tuple[int, int]] = []
+
+    def __len__(self):
+        return len(self._h)
+
+    def push(self, key, i: int):
+        heapq.heappush(self._h, (key, i))
+
+    def peek(self):
+        return self._h[0]
+
+    def pop(self):
+        return heapq.heappop(self._h)
+
+    steal = pop
+
+    def remap(self, f: Callable[[int], int]) -> "_HeapQueue":
+        q = _HeapQueue()
+        q._h = [(k, f(i)) for k, i in self._h]
+        heapq.heapify(q._h)
+        return q
+
+class _LevelQueue:
+    # mlfq ready queue: a FIFO per level and a bitmask of non-empty levels. boost()
+    # chains the level FIFOs in front of level 0 instead of moving entries.
+    __slots__ = ("_q", "_boosted", "_mask", "_n")
+
+    def __init__(self, levels: int):
+        self._q: List[Deque[int]] = [deque() for _ in range(levels)]
+        self._boosted: Deque[Deque[int]] = deque()
+        self._mask = 0
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    def push(self, key: int, i: int):
+        self._q[key].append(i)
+        self._mask |= 1 << key
+        self._n += 1
+
+    def _take(self, level: int, tail: bool):
+        q = self._q[level]
+        if level == 0 and self._boosted and (not tail or not q):
+            chain = self._boosted
+            if tail:
+                i = chain[-1].pop()
+                if not chain[-1]:
+                    chain.pop()
+            else:
+                i = chain[0].popleft()
+                if not chain[0]:
+                    chain.popleft()
         else:
-            p = min(ready, key=lambda x: x.burst)
-            start = t
-            t += remaining[p.pid]
-            slices.append(TimelineSlice(pid=p.pid, start=start, end=t, core=0))
-            remaining[p.pid] = 0
-            done.add(p.pid)
-    return slices, _metrics(specs, slices)
-
-def priority(specs: List[ProcSpec], cores: int = 1, preemptive: bool = False) -> Tuple[List[TimelineSlice], Tuple[float, float]]:
-    t = 0
-    done = set()
-    remaining = {p.pid: p.burst for p in specs}
-    slices = []
-    while len(done) < len(specs):
-        ready = [p for p in specs if p.arrival <= t and p.pid not in done and remaining[p.pid] > 0]
-        if not ready:
-            t = min([p.arrival for p in specs if p.pid not in done])
-            continue
-        if preemptive:
-            p = min(ready, key=lambda x: x.priority)
-            start = t
-            t += 1
-            remaining[p.pid] -= 1
-            slices.append(TimelineSlice(pid=p.pid, start=start, end=t, core=0))
-            if remaining[p.pid] == 0:
-                done.add(p.pid)
+            i = q.pop() if tail else q.popleft()
+        if not q and not (level == 0 and self._boosted):
+            self._mask &= ~(1 << level)
+        self._n -= 1
+        return level, i
+
+    def peek(self):
+        return (self._mask & -self._mask).bit_length() - 1, float("inf")
+
+    def pop(self):
+        return self._take((self._mask & -self._mask).bit_length() - 1, False)
+
+    def steal(self):
+        # the newest entry of the lowest non-empty level
+        return self._take(self._mask.bit_length() - 1, True)
+
+    def boost(self):
+        for k, q in enumerate(self._q):
+            if q:
+                self._boosted.append(q)
+                self._q[k] = deque()
+        self._mask = 1 if self._n else 0
+
+    def remap(self, f: Callable[[int], int]) -> "_LevelQueue":
+        q = _LevelQueue(len(self._q))
+        q._q = [deque(f(i) for i in x) for x in self._q]
+        q._boosted = deque(deque(f(i) for i in x) for x in self._boosted)
+        q._mask, q._n = self._mask, self._n
+        return q
+
+def _no_key(p: list, rem: int) -> int:
+    return 0
+
+def _dispatch(rows: Iterator[Row], cores: int, make_queue: Callable[[], object],
+              key: Callable[[list, int], int],
+              quantum: Union[None, int, Callable[[list, int], int]] = None,
+              preemptive: bool = False, drift: bool = False, per_core: bool = False,
+              charge: Optional[Callable[[list, int, bool], None]] = None,
+              place: Optional[Callable[[list, int], None]] = None, boost: int = 0,
+              snap: Optional[Callable[[Callable], Optional[int]]] = None,
+              resume: Optional[dict] = None, every: int = 2048) -> Run:
+    # Event-driven multi-core engine behind every algorithm but plain fcfs; yields raw
+    # slices and returns the mean (wait, turnaround). key orders the ready queue (lower
+    # first, then rank); quantum caps a run (a callable gets the process and live count);
+    # drift: the key is remaining time. charge/place are the cfs/mlfq hooks, boost the
+    # mlfq period. snap gets _state every `every` admissions; resume continues from one.
+    cores = max(1, cores)
+    nq = cores if per_core else 1
+    if resume is None:
+        queues = [make_queue() for _ in range(nq)]
+        loads: List[Tuple[int, int]] = []      # (-len, queue), for stealing
+        idle = list(range(cores))
+        busy: List[Tuple[int, int, int]] = []  # (end, core, token)
+        victims: List[Tuple[int, int, int, int]] = []  # (-key, -rank, core, token)
+        live: Dict[int, list] = {}             # rank -> record, see _PID
+        run_i = [-1] * cores
+        run_start = [0] * cores
+        run_tok = [0] * cores
+        tok = t = admitted = 0
+        done = wait_sum = turn_sum = 0
+        floor = epoch = 0
+        next_boost = boost
+    else:
+        queues, loads, idle, busy, victims, live = (resume[k] for k in ("queues", "loads", "idle", "busy",
+                                                                        "victims", "live"))
+        run_i, run_start, run_tok = resume["run"]
+        tok, t, admitted, done, wait_sum, turn_sum, floor, next_boost, epoch = resume["counters"]
+    out: List[RawSlice] = []
+    snapped = admitted
+    nxt = next(rows, None)
+    slice_of = quantum if callable(quantum) else None
+
+    def _state(f: Callable[[int], int] = int) -> dict:
+        # copy with every rank passed through f
+        live_busy = [b for b in busy if run_tok[b[1]] == b[2]]
+        live_victims = [(k, -f(-i), c, tk) for k, i, c, tk in victims if run_tok[c] == tk]
+        heapq.heapify(live_busy)
+        heapq.heapify(live_victims)
+        return {"queues": [q.remap(f) for q in queues], "loads": loads[:], "idle": idle[:],
+                "busy": live_busy, "victims": live_victims, "live": {f(i): p[:] for i, p in live.items()},
+                "run": ([f(i) if i >= 0 else -1 for i in run_i], run_start[:], run_tok[:]),
+                "counters": (tok, t, admitted, done, wait_sum, turn_sum, floor, next_boost, epoch), "t": t,
+                "admitted": admitted}
+
+    def push(qi: int, i: int):
+        q = queues[qi]
+        p = live[i]
+        q.push(key(p, p[_REM]), i)
+        if nq > 1:
+            heapq.heappush(loads, (-len(q), qi))
+
+    def take(qi: int, stealing: bool) -> int:
+        nonlocal floor
+        q = queues[qi]
+        k, i = q.steal() if stealing else q.pop()
+        if place is not None and k > floor:
+            floor = k
+        if nq > 1:
+            if len(q):
+                heapq.heappush(loads, (-len(q), qi))
+            if len(loads) > 8 * nq:
+                loads[:] = [(-len(x), k) for k, x in enumerate(queues) if len(x)]
+                heapq.heapify(loads)
+        return i
+
+    def fullest() -> int:
+        while loads:
+            nl, qi = loads[0]
+            if nl and -nl == len(queues[qi]):
+                return qi
+            heapq.heappop(loads)
+        return -1
+
+    def start(c: int, i: int):
+        nonlocal tok
+        tok += 1
+        p = live[i]
+        if p[_EPOCH] != epoch:
+            p[_AUX] = 0
+            p[_EPOCH] = epoch
+        if quantum is None:
+            run = p[_REM]
         else:
-            p = min(ready, key=lambda x: x.priority)
-            start = t
-            t += remaining[p.pid]
-            slices.append(TimelineSlice(pid=p.pid, start=start, end=t, core=0))
-            remaining[p.pid] = 0
-            done.add(p.pid)
-    return slices, _metrics(specs, slices)
-
-def rr(specs: List[ProcSpec], quantum: int = 1, cores: int = 1) -> Tuple[List[TimelineSlice], Tuple[float, float]]:
-    t = 0
-    queue: List[ProcSpec] = []
-    rem = {p.pid: p.burst for p in specs}
-    slices = []
-    i = 0
-    while True:
-        arrivals = [p for p in specs if p.arrival == t]
-        queue.extend(arrivals)
-        if queue:
-            p = queue.pop(0)
-            start = t
-            run = min(quantum, rem[p.pid])
-            t += run
-            rem[p.pid] -= run
-            slices.append(TimelineSlice(pid=p.pid, start=start, end=t, core=0))
-            arrivals2 = [x for x in specs if x.arrival > start and x.arrival <= t]
-            queue.extend(arrivals2)
-            if rem[p.pid] > 0:
-                queue.append(p)
+            run = min(quantum if slice_of is None else slice_of(p, len(live)), p[_REM])
+        run_i[c] = i
+        run_start[c] = t
+        run_tok[c] = tok
+        heapq.heappush(busy, (t + run, c, tok))
+        if preemptive and not per_core:
+            k = key(p, p[_REM])
+            heapq.heappush(victims, (-(k + t if drift else k), -i, c, tok))
+
+    def stop(c: int, expired: bool = False) -> int:
+        i = run_i[c]
+        p = live[i]
+        out.append((p[_PID], run_start[c], t, c))
+        p[_REM] -= t - run_start[c]
+        if charge is not None:
+            charge(p, t - run_start[c], expired)
+        run_i[c] = -1
+        run_tok[c] = 0
+        return i
+
+    def _boost(back: List[Tuple[int, int]]):
+        # queued processes are reset when they next start (stale _EPOCH)
+        nonlocal epoch
+        epoch += 1
+        for q in queues:
+            q.boost()
+        for i in [i for i in run_i if i >= 0] + [i for _, i in back]:
+            live[i][_AUX] = 0
+            live[i][_EPOCH] = epoch
+        if preemptive and not per_core:
+            victims[:] = [(-key(live[i], live[i][_REM]), -i, c, run_tok[c]) for c, i in enumerate(run_i) if i >= 0]
+            heapq.heapify(victims)
+
+    def running_key(c: int) -> Tuple[int, int]:
+        i = run_i[c]
+        p = live[i]
+        return key(p, p[_REM] - (t - run_start[c])), i
+
+    while live or nxt is not None:
+        if out:
+            yield from out
+            out.clear()
+        if snap is not None and admitted - snapped >= every:
+            snapped = admitted
+            every = snap(_state) or every
+        while busy and run_tok[busy[0][1]] != busy[0][2]:
+            heapq.heappop(busy)
+        if busy:
+            t = busy[0][0]
+            if nxt is not None and nxt[2] < t:
+                t = nxt[2]
         else:
-            pending = [p for p in specs if rem[p.pid] > 0]
-            if not pending:
+            t = max(t, nxt[2])
+        if boost and busy and next_boost < t:
+            t = next_boost
+        back = []
+        while busy and busy[0][0] <= t:
+            _, c, tk = heapq.heappop(busy)
+            if run_tok[c] != tk:
+                continue
+            i = stop(c, True)
+            if live[i][_REM] > 0:
+                back.append((c, i))
+            else:
+                p = live.pop(i)
+                turn = t - p[_ARR]
+                done += 1
+                turn_sum += turn
+                wait_sum += turn - p[_BURST]
+            heapq.heappush(idle, c)
+        if boost and t >= next_boost:
+            if t == next_boost:
+                _boost(back)
+            next_boost = (t // boost + 1) * boost
+        touched = set()
+        while nxt is not None and nxt[2] <= t:
+            rank, pid, arrival, burst, prio, dl = nxt
+            p = live[rank] = [pid, arrival, burst, prio, burst, dl, 0, epoch]
+            if place is not None:
+                place(p, floor)
+            qi = admitted % nq
+            push(qi, rank)
+            touched.add(qi)
+            admitted += 1
+            nxt = next(rows, None)
+        # quantum expiries queue up behind arrivals that landed during the slice
+        for c, i in back:
+            qi = c if per_core else 0
+            push(qi, i)
+            touched.add(qi)
+        while idle:
+            c = idle[0]
+            qi = c if per_core else 0
+            if len(queues[qi]):
+                i = take(qi, False)
+            elif per_core and fullest() >= 0:
+                i = take(fullest(), True)
+            else:
+                break
+            heapq.heappop(idle)
+            start(c, i)
+        if not preemptive:
+            continue
+        if per_core:
+            for c in touched:
+                q = queues[c]
+                if run_i[c] >= 0 and len(q) and q.peek() < running_key(c):
+                    push(c, stop(c))
+                    start(c, take(c, False))
+            continue
+        q = queues[0]
+        while len(q):
+            while victims and run_tok[victims[0][2]] != victims[0][3]:
+                heapq.heappop(victims)
+            if not victims:
+                break
+            nk, ni, c, _ = victims[0]
+            cur = -nk - t if drift else -nk
+            if q.peek() >= (cur, -ni):
                 break
-            t = min([p.arrival for p in pending])
-        i += 1
-        if i > 100000:
+            heapq.heappop(victims)
+            push(0, stop(c))
+            start(c, take(0, False))
+    yield from out
+    return _means(done, wait_sum, turn_sum)
+
+def _collect(run: Run, columnar: bool) -> Result:
+    timeline = Timeline()
+    add = timeline.add
+    box = []
+
+    def drain():
+        box.append((yield from run))
+
+    for pid, start, end, core in drain():
+        add(pid, start, end, core)
+    return (timeline if columnar else timeline.slices()), box[0]
+
+def _coalesced(run: Run) -> Stream:
+    # merges like Timeline.add; a slice is yielded once it cannot grow any further
+    pending: Dict[int, List[int]] = {}
+    while True:
+        try:
+            pid, start, end, core = next(run)
+        except StopIteration as stop:
+            metrics = stop.value
             break
-    return slices, _metrics(specs, slices)
+        cur = pending.get(core)
+        if cur is not None:
+            if cur[0] == pid and cur[2] == start:
+                cur[2] = end
+                continue
+            yield TimelineSlice(pid=cur[0], start=cur[1], end=cur[2], core=core)
+        pending[core] = [pid, start, end]
+    for core in sorted(pending):
+        cur = pending[core]
+        yield TimelineSlice(pid=cur[0], start=cur[1], end=cur[2], core=core)
+    return metrics
+
+def _fcfs_heap(rows: Iterator[Row], cores: int, snap: Optional[Callable[[Callable], Optional[int]]] = None,
+               resume: Optional[dict] = None, every: int = 2048) -> Run:
+    # heap of (core-free time, core); states carry no clock
+    if resume is None:
+        free = [(0, c) for c in range(max(1, cores))]
+        admitted = done = wait_sum = turn_sum = 0
+    else:
+        free = resume["free"]
+        admitted, done, wait_sum, turn_sum = resume["counters"]
+    snapped = admitted
+    for _, pid, arrival, burst, _, _ in rows:
+        if snap is not None and admitted - snapped >= every:
+            snapped = admitted
+            state = {"free": free[:], "counters": (admitted, done, wait_sum, turn_sum), "t": None,
+                     "admitted": admitted}
+            every = snap(lambda f: state) or every
+        admitted += 1
+        when, idx = free[0]
+        start = max(when, arrival)
+        end = start + burst
+        heapq.heapreplace(free, (end, idx))
+        yield pid, start, end, idx
+        done += 1
+        turn_sum += end - arrival
+        wait_sum += end - arrival - burst
+    return _means(done, wait_sum, turn_sum)
+
+# Linux's sched_prio_to_weight: nice -20..19, each step ~1.25x the CPU share; nice 0 = 1024
+_NICE_WEIGHT = (
+    88761, 71755, 56483, 46273, 36291, 29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906, 3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423, 335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45, 36, 29, 23, 18, 15,
+)
+_NICE_0 = 1024
+_CFS_LATENCY = 8  # target scheduling period, in minimum granularities
+
+def _weight(p: list) -> int:
+    # priority is taken as the nice value
+    return _NICE_WEIGHT[min(19, max(-20, p[_PRIO])) + 20]
+
+def _cfs(rows: Iterator[Row], cores: int, quantum: int, per_core: bool, **ck) -> Run:
+    # ordered by vruntime; a period of max(_CFS_LATENCY, n) * quantum is split by
+    # weight, never below quantum, and arrivals start at min_vruntime
+    gran = max(1, quantum)
+    latency = _CFS_LATENCY * gran
+
+    def slice_of(p: list, n: int) -> int:
+        n = -(-n // cores)
+        w = _weight(p)
+        return max(gran, max(latency, n * gran) * w // (w + _NICE_0 * (n - 1)))
+
+    def charge(p: list, ran: int, expired: bool):
+        p[_AUX] += ran * _NICE_0 * _NICE_0 // _weight(p)
+
+    def place(p: list, floor: int):
+        p[_AUX] = floor
+
+    return _dispatch(rows, cores, _HeapQueue, lambda p, r: p[_AUX], quantum=slice_of, per_core=per_core,
+                     charge=charge, place=place, **ck)
+
+MLFQ_MAX_LEVELS = 64
+_INT64_MAX = (1 << 63) - 1
+
+def _mlfq(rows: Iterator[Row], cores: int, quantum: int, levels: int, boost: int, per_core: bool, **ck) -> Run:
+    # level k has a quantum of quantum << k; using it up drops a level, and every
+    # `boost` time units (0 = never) everything goes back to level 0
+    if not 1 <= levels <= MLFQ_MAX_LEVELS:
+        raise ValueError(f"levels must be between 1 and {MLFQ_MAX_LEVELS}")
+    quanta = [min(max(1, quantum) << k, _INT64_MAX) for k in range(levels)]
+
+    def charge(p: list, ran: int, expired: bool):
+        if expired and p[_AUX] < levels - 1:
+            p[_AUX] += 1
+
+    return _dispatch(rows, cores, lambda: _LevelQueue(levels), lambda p, r: p[_AUX],
+                     quantum=lambda p, n: quanta[p[_AUX]], preemptive=True, per_core=per_core,
+                     charge=charge, boost=max(0, boost), **ck)
+
+def _engine(algo: str, rows: Iterator[Row], cores: int, quantum: int, preemptive: bool, per_core: bool,
+            levels: int = 3, boost: int = 0, **ck) -> Run:
+    # ck is snap/resume/every
+    if algo == "fcfs":
+        if per_core and cores > 1:
+            return _dispatch(rows, cores, _FifoQueue, _no_key, per_core=True, **ck)
+        return _fcfs_heap(rows, cores, **ck)
+    if algo == "rr":
+        return _dispatch(rows, cores, _FifoQueue, _no_key, quantum=max(1, quantum), per_core=per_core, **ck)
+    if algo == "sjf":
+        if preemptive:
+            return _dispatch(rows, cores, _HeapQueue, lambda p, r: r, preemptive=True, drift=True,
+                             per_core=per_core, **ck)
+        return _dispatch(rows, cores, _HeapQueue, lambda p, r: p[_BURST], per_core=per_core, **ck)
+    if algo == "priority":
+        return _dispatch(rows, cores, _HeapQueue, lambda p, r: p[_PRIO], preemptive=preemptive,
+                         per_core=per_core, **ck)
+    if algo == "cfs":
+        return _cfs(rows, cores, quantum, per_core, **ck)
+    if algo == "mlfq":
+        return _mlfq(rows, cores, quantum, levels, boost, per_core, **ck)
+    if algo == "edf":
+        return _dispatch(rows, cores, _HeapQueue, lambda p, r: p[_DL], preemptive=preemptive,
+                         per_core=per_core, **ck)
+    raise ValueError(f"unknown algorithm: {algo}")
+
+def _run(algo: str, specs: Specs, cores: int = 1, quantum: int = 1, preemptive: bool = False,
+         per_core: bool = False, levels: int = 3, boost: int = 0) -> Run:
+    # fcfs breaks arrival ties by pid, the others by input position
+    return _engine(algo, _rows(specs, by_pid=algo == "fcfs"), cores, quantum, preemptive, per_core, levels, boost)
+
+def fcfs(specs: Specs, cores: int = 1, per_core: bool = False, columnar: bool = False) -> Result:
+    return _collect(_run("fcfs", specs, cores, per_core=per_core), columnar)
+
+def sjf(specs: Specs, cores: int = 1, preemptive: bool = False, per_core: bool = False,
+        columnar: bool = False) -> Result:
+    return _collect(_run("sjf", specs, cores, preemptive=preemptive, per_core=per_core), columnar)
+
+def priority(specs: Specs, cores: int = 1, preemptive: bool = False, per_core: bool = False,
+             columnar: bool = False) -> Result:
+    return _collect(_run("priority", specs, cores, preemptive=preemptive, per_core=per_core), columnar)
+
+def rr(specs: Specs, quantum: int = 1, cores: int = 1, per_core: bool = False, columnar: bool = False) -> Result:
+    return _collect(_run("rr", specs, cores, quantum, per_core=per_core), columnar)
+
+def cfs(specs: Specs, quantum: int = 1, cores: int = 1, per_core: bool = False, columnar: bool = False) -> Result:
+    return _collect(_run("cfs", specs, cores, quantum, per_core=per_core), columnar)
+
+def mlfq(specs: Specs, quantum: int = 1, levels: int = 3, boost: int = 0, cores: int = 1, per_core: bool = False,
+         columnar: bool = False) -> Result:
+    return _collect(_run("mlfq", specs, cores, quantum, per_core=per_core, levels=levels, boost=boost), columnar)
+
+def edf(specs: Specs, cores: int = 1, preemptive: bool = False, per_core: bool = False,
+        columnar: bool = False) -> Result:
+    return _collect(_run("edf", specs, cores, preemptive=preemptive, per_core=per_core), columnar)
+
+# streaming forms: metrics = yield from sjf_iter(specs)
+def fcfs_iter(specs: Specs, cores: int = 1, per_core: bool = False) -> Stream:
+    return _coalesced(_run("fcfs", specs, cores, per_core=per_core))
+
+def sjf_iter(specs: Specs, cores: int = 1, preemptive: bool = False, per_core: bool = False) -> Stream:
+    return _coalesced(_run("sjf", specs, cores, preemptive=preemptive, per_core=per_core))
+
+def priority_iter(specs: Specs, cores: int = 1, preemptive: bool = False, per_core: bool = False) -> Stream:
+    return _coalesced(_run("priority", specs, cores, preemptive=preemptive, per_core=per_core))
+
+def rr_iter(specs: Specs, quantum: int = 1, cores: int = 1, per_core: bool = False) -> Stream:
+    return _coalesced(_run("rr", specs, cores, quantum, per_core=per_core))
+
+def cfs_iter(specs: Specs, quantum: int = 1, cores: int = 1, per_core: bool = False) -> Stream:
+    return _coalesced(_run("cfs", specs, cores, quantum, per_core=per_core))
+
+def mlfq_iter(specs: Specs, quantum: int = 1, levels: int = 3, boost: int = 0, cores: int = 1,
+              per_core: bool = False) -> Stream:
+    return _coalesced(_run("mlfq", specs, cores, quantum, per_core=per_core, levels=levels, boost=boost))
+
+def edf_iter(specs: Specs, cores: int = 1, preemptive: bool = False, per_core: bool = False) -> Stream:
+    return _coalesced(_run("edf", specs, cores, preemptive=preemptive, per_core=per_core))
+
+ALGORITHMS = ("fcfs", "rr", "sjf", "priority", "cfs", "mlfq", "edf")
+
+# levels/boost only apply to mlfq
+def schedule(algo: str, specs: Specs, cores: int = 1, quantum: int = 1, preemptive: bool = False,
+             per_core: bool = False, columnar: bool = False, levels: int = 3, boost: int = 0) -> Result:
+    return _collect(_run(algo, specs, cores, quantum, preemptive, per_core, levels, boost), columnar)
+
+def schedule_iter(algo: str, specs: Specs, cores: int = 1, quantum: int = 1, preemptive: bool = False,
+                  per_core: bool = False, levels: int = 3, boost: int = 0) -> Stream:
+    return _coalesced(_run(algo, specs, cores, quantum, preemptive, per_core, levels, boost))
+
+class Rescheduler:
+    # Reruns one algorithm over successive versions of a workload, resuming from the
+    # last engine checkpoint before the first changed process instead of from zero.
+    # Checkpoints use admission positions, so inserts and removals keep earlier ones
+    # valid; past `budget` entries every other one is dropped and the spacing doubles.
+    def __init__(self, algo: str, cores: int = 1, quantum: int = 1, preemptive: bool = False,
+                 per_core: bool = False, every: int = 2048, levels: int = 3, boost: int = 0,
+                 budget: Optional[int] = None):
+        if algo not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm: {algo}")
+        self.algo = algo
+        self.cores = cores
+        self.quantum = quantum
+        self.preemptive = preemptive
+        self.per_core = per_core
+        self.levels = levels
+        self.boost = boost
+        self.every = every
+        self.budget = budget
+        self.timeline: Optional[Timeline] = None
+        self.metrics: Tuple[float, float] = (0.0, 0.0)
+        self.resumed_at: Optional[int] = None  # clock (or position, fcfs) of the last resume
+        self.reused = 0                        # timeline slices carried over by the last run
+        self._rows: List[Row] = []
+        self._checkpoints: List[Tuple[dict, tuple, int]] = []  # (state, timeline mark, entries)
+        self._spacing = every
+
+    def params(self) -> Tuple[str, int, int, bool, bool, int, int]:
+        return self.algo, self.cores, self.quantum, self.preemptive, self.per_core, self.levels, self.boost
+
+    @staticmethod
+    def _same_order(old: List[Row], new: List[Row], n: int) -> bool:
+        # old and new ranks of the first n rows must order them the same way
+        a = [r[0] for r in islice(old, n)]
+        b = [r[0] for r in islice(new, n)]
+        if a == b:
+            return True
+        pairs = sorted(zip(a, b))
+        return all(x[1] < y[1] for x, y in zip(pairs, pairs[1:]))
+
+    @staticmethod
+    def _convert(state: dict, f: Callable[[int], int]) -> dict:
+        # copy of an engine state with every rank passed through f
+        if "free" in state:
+            return dict(state, free=state["free"][:])
+        victims = [(k, -f(-i), c, tk) for k, i, c, tk in state["victims"]]
+        heapq.heapify(victims)
+        run_i, run_start, run_tok = state["run"]
+        return dict(state, queues=[q.remap(f) for q in state["queues"]], loads=state["loads"][:],
+                    idle=state["idle"][:], busy=state["busy"][:], victims=victims,
+                    live={f(i): p[:] for i, p in state["live"].items()},
+                    run=([f(i) if i >= 0 else -1 for i in run_i], run_start[:], run_tok[:]))
+
+    def run(self, specs: Specs) -> Tuple[Timeline, Tuple[float, float]]:
+        # the returned Timeline belongs to this object until the next run() replaces it
+        rows = list(_rows(specs, by_pid=self.algo == "fcfs"))
+        old = self._rows
+        n = min(len(old), len(rows))
+        p = next((k for k in range(n) if old[k][1:] != rows[k][1:]), n)
+        if self.timeline is not None and p == len(old) == len(rows):
+            self._rows = rows
+            self.resumed_at, self.reused = None, len(self.timeline)
+            return self.timeline, self.metrics
+        affected = min(r[p][2] for r in (old, rows) if p < len(r))
+        start = -1
+        for k in range(len(self._checkpoints) - 1, -1, -1):
+            st = self._checkpoints[k][0]
+            if st["admitted"] <= p and (st["t"] is None or st["t"] < affected):
+                if self._same_order(old, rows, st["admitted"]):
+                    start = k
+                break
+        if start < 0 or self.timeline is None:
+            timeline, resume, admitted = Timeline(), None, 0
+            self._checkpoints = []
+            self._spacing = self.every
+            self.resumed_at = None
+        else:
+            st, mark, _ = self._checkpoints[start]
+            timeline = self.timeline.upto(mark)
+            resume = self._convert(st, lambda pos: rows[pos][0])
+            admitted = st["admitted"]
+            del self._checkpoints[start + 1:]
+            self.resumed_at = st["admitted"] if st["t"] is None else st["t"]
+        self.reused = len(timeline)
+        pos = [0] * len(rows)
+        for k, r in enumerate(rows):
+            pos[r[0]] = k
+
+        budget = 4 * len(rows) + 65536 if self.budget is None else self.budget
+        held = [sum(c[2] for c in self._checkpoints)]
+
+        def snap(state: Callable[[Callable[[int], int]], dict]) -> Optional[int]:
+            st = state(pos.__getitem__)
+            size = len(st.get("live", ())) + len(st.get("free", ())) + self.cores
+            self._checkpoints.append((st, timeline.mark(), size))
+            held[0] += size
+            if held[0] <= budget:
+                return None
+            while held[0] > budget and len(self._checkpoints) > 1:
+                # keep every other checkpoint, the newest included
+                self._checkpoints = self._checkpoints[::-1][::2][::-1]
+                held[0] = sum(c[2] for c in self._checkpoints)
+                self._spacing *= 2
+            return self._spacing
+
+        run = _engine(self.algo, islice(rows, admitted, None), self.cores, self.quantum, self.preemptive,
+                      self.per_core, self.levels, self.boost, snap=snap, resume=resume, every=self._spacing)
+        add = timeline.add
+        box = []
+
+        def drain():
+            box.append((yield from run))
 
+        for pid, s, e, c in drain():
+            add(pid, s, e, c)
+        self._rows, self.timeline, self.metrics = rows, timeline, box[0]
+        return timeline, self.metrics
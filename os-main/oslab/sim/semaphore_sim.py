@@ -1,88 +1,442 @@
+import asyncio
+import heapq
 import threading
 import time
-from queue import Queue
+from collections import deque
+from typing import Dict, Hashable, List, Optional, Tuple
+from oslab.sim.events import EventLog
+
+# log2 buckets in microseconds: bucket 0 is < 1us, bucket i covers [2^(i-1), 2^i) us
+_BUCKETS = 32
+
+def _bucket(secs: float) -> int:
+    return min(_BUCKETS - 1, int(secs * 1e6).bit_length())
+
+class SemaphoreStats:
+    # Contention stats for the thread and asyncio semaphores, called under the
+    # semaphore's own lock. An acquire ahead of an older waiter counts as a barge.
+    def __init__(self):
+        self.acquires = 0
+        self.contended = 0
+        self.barges = 0
+        self.wait_hist = [0] * _BUCKETS
+        self.hold_hist = [0] * _BUCKETS
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.hold_sum = 0.0
+        self.hold_max = 0.0
+        self.holds = 0
+        self.waiting: Dict[Hashable, int] = {}
+        self.depth_max = 0
+        # (seconds since creation, depth) at each change of the waiter count
+        self.depth_series = deque(maxlen=256)
+        # key -> [acquires, contended, barges, wait_sum, wait_max]
+        self.per_worker: Dict[Hashable, List[float]] = {}
+        self._tickets: List[Tuple[int, Hashable]] = []
+        self._next_ticket = 0
+        self._held: Dict[Hashable, float] = {}
+        self._t0 = self._t_last = time.perf_counter()
+        self._depth_area = 0.0
+
+    def _depth_changed(self, now: float, delta: int):
+        depth = len(self.waiting)
+        self._depth_area += (depth - delta) * (now - self._t_last)
+        self._t_last = now
+        self.depth_max = max(self.depth_max, depth)
+        self.depth_series.append((round(now - self._t0, 6), depth))
+
+    def _oldest(self) -> Optional[int]:
+        # lazily drop tickets of waiters that already left
+        heap = self._tickets
+        while heap and self.waiting.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def on_wait(self, key: Hashable, now: float):
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        self.waiting[key] = ticket
+        heapq.heappush(self._tickets, (ticket, key))
+        self._depth_changed(now, 1)
+
+    def on_abandon(self, key: Hashable, now: float):
+        if self.waiting.pop(key, None) is not None:
+            self._depth_changed(now, -1)
+
+    def on_acquire(self, key: Hashable, now: float, started: float):
+        ticket = self.waiting.pop(key, None)
+        if ticket is not None:
+            self._depth_changed(now, -1)
+        oldest = self._oldest()
+        barged = oldest is not None and (ticket is None or oldest < ticket)
+        wait = now - started
+        self.acquires += 1
+        self.wait_hist[_bucket(wait)] += 1
+        self.wait_sum += wait
+        if wait > self.wait_max:
+            self.wait_max = wait
+        w = self.per_worker.get(key)
+        if w is None:
+            w = self.per_worker[key] = [0, 0, 0, 0.0, 0.0]
+        w[0] += 1
+        w[3] += wait
+        if wait > w[4]:
+            w[4] = wait
+        if ticket is not None:
+            self.contended += 1
+            w[1] += 1
+        if barged:
+            self.barges += 1
+            w[2] += 1
+        self._held[key] = now
+
+    def on_release(self, key: Hashable, now: float):
+        start = self._held.pop(key, None)
+        if start is None:
+            return
+        hold = now - start
+        self.holds += 1
+        self.hold_hist[_bucket(hold)] += 1
+        self.hold_sum += hold
+        if hold > self.hold_max:
+            self.hold_max = hold
+
+    @staticmethod
+    def _quantile(hist: List[int], q: float) -> float:
+        # upper edge of the bucket holding the q-quantile, in microseconds
+        total = sum(hist)
+        if not total:
+            return 0.0
+        need = q * total
+        seen = 0
+        for i, c in enumerate(hist):
+            seen += c
+            if seen >= need:
+                return float(1 << i)
+        return float(1 << (len(hist) - 1))
+
+    def snapshot(self) -> Dict[str, object]:
+        now = time.perf_counter()
+        area = self._depth_area + len(self.waiting) * (now - self._t_last)
+        n = self.acquires or 1
+        return {
+            "acquires": self.acquires,
+            "rate": self.acquires / max(now - self._t0, 1e-9),
+            "contended": self.contended,
+            "barges": self.barges,
+            "fifo_ratio": 1.0 - self.barges / n,
+            "wait_us": {"mean": self.wait_sum / n * 1e6, "max": self.wait_max * 1e6,
+                        **{f"p{q}": self._quantile(self.wait_hist, q / 100) for q in (50, 95, 99)},
+                        "hist": list(self.wait_hist)},
+            "hold_us": {"mean": self.hold_sum / (self.holds or 1) * 1e6, "max": self.hold_max * 1e6,
+                        "hist": list(self.hold_hist)},
+            "depth": {"now": len(self.waiting), "max": self.depth_max,
+                      "mean": area / max(now - self._t0, 1e-9), "series": list(self.depth_series)},
+            "workers": [
+                {"who": list(k) if isinstance(k, tuple) else k, "acquires": w[0], "contended": w[1],
+                 "barges": w[2], "wait_mean_us": w[3] / (w[0] or 1) * 1e6, "wait_max_us": w[4] * 1e6}
+                for k, w in self.per_worker.items()
+            ],
+        }
 
 class CountingSemaphore:
+    # `who` names the caller in the stats (defaults to the thread)
     def __init__(self, value: int):
         self._value = value
         self._cond = threading.Condition()
+        self.stats = SemaphoreStats()
 
-    def acquire(self):
+    def acquire(self, who: Optional[Hashable] = None):
+        key = threading.get_ident() if who is None else who
         with self._cond:
-            while self._value <= 0:
-                self._cond.wait()
+            started = time.perf_counter()
+            if self._value <= 0:
+                self.stats.on_wait(key, started)
+                while self._value <= 0:
+                    self._cond.wait()
             self._value -= 1
+            self.stats.on_acquire(key, time.perf_counter(), started)
 
-    def release(self):
+    def release(self, who: Optional[Hashable] = None):
+        key = threading.get_ident() if who is None else who
         with self._cond:
             self._value += 1
+            self.stats.on_release(key, time.perf_counter())
             self._cond.notify()
 
     @property
     def value(self):
         return self._value
 
+    @property
+    def blocked(self) -> List[Hashable]:
+        with self._cond:
+            return list(self.stats.waiting)
+
+class FifoSemaphore:
+    # Strict FIFO: release() hands the permit straight to the head waiter, waking it
+    # through its own lock, so nobody can barge in between.
+    def __init__(self, value: int):
+        self._value = value
+        self._lock = threading.Lock()
+        self._waiters = deque()
+        self.stats = SemaphoreStats()
+
+    def _push(self, entry, priority: int):
+        self._waiters.append(entry)
+
+    def _pop(self):
+        return self._waiters.popleft()
+
+    def acquire(self, who: Optional[Hashable] = None, priority: int = 0):
+        key = threading.get_ident() if who is None else who
+        with self._lock:
+            started = time.perf_counter()
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                self.stats.on_acquire(key, started, started)
+                return
+            gate = threading.Lock()
+            gate.acquire()
+            self._push((key, started, gate), priority)
+            self.stats.on_wait(key, started)
+        # released by whoever hands us the permit
+        gate.acquire()
+
+    def release(self, who: Optional[Hashable] = None):
+        key = threading.get_ident() if who is None else who
+        with self._lock:
+            now = time.perf_counter()
+            self.stats.on_release(key, now)
+            if not self._waiters:
+                self._value += 1
+                return
+            nxt, started, gate = self._pop()
+            self.stats.on_acquire(nxt, now, started)
+        gate.release()
+
+    @property
+    def value(self):
+        return self._value
+
+    @property
+    def blocked(self) -> List[Hashable]:
+        with self._lock:
+            return list(self.stats.waiting)
+
+class PrioritySemaphore(FifoSemaphore):
+    # same handoff, lowest priority value first, ties in arrival order
+    def __init__(self, value: int):
+        super().__init__(value)
+        self._waiters = []
+        self._seq = 0
+
+    def _push(self, entry, priority: int):
+        heapq.heappush(self._waiters, (priority, self._seq, entry))
+        self._seq += 1
+
+    def _pop(self):
+        return heapq.heappop(self._waiters)[2]
+
+# "condition" is the plain Condition-based semaphore, where any woken waiter may win
+SEMAPHORES = {"condition": CountingSemaphore, "fifo": FifoSemaphore, "priority": PrioritySemaphore}
+
 class SemaphoreSimulator:
-    def __init__(self, capacity: int = 3):
-        self.sem = CountingSemaphore(capacity)
-        self.events = Queue()
+    # kind picks the semaphore; with "priority", `priorities` orders the roles.
+    # At most one set of workers runs: start waits for the previous set to leave.
+    def __init__(self, capacity: int = 3, kind: str = "condition", priorities: Optional[Dict[str, int]] = None):
+        if kind not in SEMAPHORES:
+            raise ValueError(f"unknown semaphore kind: {kind}")
+        self.capacity = capacity
+        self.kind = kind
+        self.priorities = priorities or {"P": 0, "C": 1}
+        self.producers = 2
+        self.consumers = 2
+        self.sem = SEMAPHORES[kind](capacity)
+        self.events = EventLog()
         self.speed = 1.0
         self._running = False
+        self._stop = threading.Event()
         self._threads = []
-        self._blocked = []
 
-    def start(self, producers: int = 2, consumers: int = 2):
+    def start(self, producers: Optional[int] = None, consumers: Optional[int] = None):
+        if producers is not None:
+            self.producers = producers
+        if consumers is not None:
+            self.consumers = consumers
+        if self._running:
+            return
+        self._join()
         self._running = True
-        for i in range(producers):
+        self._stop = threading.Event()
+        for i in range(self.producers):
             t = threading.Thread(target=self._producer, args=(i+1,), daemon=True)
             t.start(); self._threads.append(t)
-        for i in range(consumers):
+        for i in range(self.consumers):
             t = threading.Thread(target=self._consumer, args=(i+1,), daemon=True)
             t.start(); self._threads.append(t)
 
+    def _join(self, timeout: float = 5.0):
+        deadline = time.monotonic() + timeout
+        for t in self._threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+        self._threads = [t for t in self._threads if t.is_alive()]
+
+    def _delay(self, secs: float) -> float:
+        return max(0.01, secs / max(0.1, self.speed))
+
     def _sleep(self, secs: float):
-        time.sleep(max(0.01, secs / max(0.1, self.speed)))
+        time.sleep(self._delay(secs))
 
     def _producer(self, idx: int):
-        i = 0
-        while self._running:
-            self.events.put({"type": "try", "role": "P", "id": idx})
-            acquired = False
-            with threading.Lock():
-                if self.sem.value <= 0:
-                    self._blocked.append(("P", idx))
-            self.sem.acquire()
-            acquired = True
-            self.events.put({"type": "acquire", "role": "P", "id": idx, "sem": self.sem.value})
-            self._sleep(0.5)
-            self.sem.release()
-            self.events.put({"type": "release", "role": "P", "id": idx, "sem": self.sem.value})
-            try:
-                self._blocked.remove(("P", idx))
-            except ValueError:
-                pass
-            i += 1
-            self._sleep(0.4)
+        self._worker("P", idx, 0.5, 0.4)
 
     def _consumer(self, idx: int):
-        while self._running:
-            self.events.put({"type": "try", "role": "C", "id": idx})
-            with threading.Lock():
-                if self.sem.value <= 0:
-                    self._blocked.append(("C", idx))
-            self.sem.acquire()
-            self.events.put({"type": "acquire", "role": "C", "id": idx, "sem": self.sem.value})
-            self._sleep(0.6)
-            self.sem.release()
-            self.events.put({"type": "release", "role": "C", "id": idx, "sem": self.sem.value})
+        self._worker("C", idx, 0.6, 0.5)
+
+    def _worker(self, role: str, idx: int, hold: float, think: float):
+        me = (role, idx)
+        # bound once: reset swaps both, and this worker has to finish on its own
+        sem, stop = self.sem, self._stop
+        prio = None if isinstance(sem, CountingSemaphore) else self.priorities.get(role, 0)
+        while not stop.is_set():
+            self.events.put({"type": "try", "role": role, "id": idx})
+            if prio is None:
+                sem.acquire(me)
+            else:
+                sem.acquire(me, prio)
+            self.events.put({"type": "acquire", "role": role, "id": idx, "sem": sem.value})
+            stop.wait(self._delay(hold))
+            sem.release(me)
+            self.events.put({"type": "release", "role": role, "id": idx, "sem": sem.value})
+            stop.wait(self._delay(think))
+
+    @property
+    def value(self) -> int:
+        return self.sem.value
+
+    @property
+    def blocked(self) -> List[Tuple[str, int]]:
+        return self.sem.blocked
+
+    def stats(self) -> Dict[str, object]:
+        out = self.sem.stats.snapshot()
+        out["kind"] = self.kind
+        return out
+
+    def pause(self):
+        self._running = False
+        self._stop.set()
+
+    def resume(self):
+        self.start()
+
+    def reset(self):
+        self.pause()
+        self._join()
+        self.events.clear()
+        self.sem = SEMAPHORES[self.kind](self.capacity)
+
+    async def areset(self):
+        # joins the workers off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self.reset)
+
+    def speed_up(self):
+        self.speed *= 1.2
+
+    def speed_down(self):
+        self.speed /= 1.2
+
+
+class AsyncCountingSemaphore:
+    # asyncio.Semaphore plus the count and stats the state endpoint reports
+    def __init__(self, value: int):
+        self._sem = asyncio.Semaphore(value)
+        self._value = value
+        self.stats = SemaphoreStats()
+
+    async def acquire(self, who: Hashable = None):
+        started = time.perf_counter()
+        if self._sem.locked():
+            self.stats.on_wait(who, started)
+        try:
+            await self._sem.acquire()
+        except asyncio.CancelledError:
+            self.stats.on_abandon(who, time.perf_counter())
+            raise
+        self._value -= 1
+        self.stats.on_acquire(who, time.perf_counter(), started)
+
+    def release(self, who: Hashable = None):
+        self._value += 1
+        self.stats.on_release(who, time.perf_counter())
+        self._sem.release()
+
+    @property
+    def value(self):
+        return self._value
+
+    @property
+    def blocked(self) -> List[Hashable]:
+        return list(self.stats.waiting)
+
+class AsyncSemaphoreSimulator:
+    # asyncio counterpart of SemaphoreSimulator: each producer/consumer is a task on the
+    # caller's event loop; a cancelled task gives back a held permit.
+    def __init__(self, capacity: int = 3, producers: int = 2, consumers: int = 2):
+        self.capacity = capacity
+        self.producers = producers
+        self.consumers = consumers
+        self.sem: Optional[AsyncCountingSemaphore] = None
+        self.events = EventLog()
+        self.speed = 1.0
+        self._running = False
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self, producers: Optional[int] = None, consumers: Optional[int] = None):
+        loop = asyncio.get_running_loop()
+        if self.sem is None:
+            self.sem = AsyncCountingSemaphore(self.capacity)
+        self._running = True
+        for i in range(self.producers if producers is None else producers):
+            self._tasks.append(loop.create_task(self._worker("P", i + 1, 0.5, 0.4)))
+        for i in range(self.consumers if consumers is None else consumers):
+            self._tasks.append(loop.create_task(self._worker("C", i + 1, 0.6, 0.5)))
+
+    async def _sleep(self, secs: float):
+        await asyncio.sleep(max(0.01, secs / max(0.1, self.speed)))
+
+    async def _worker(self, role: str, idx: int, hold: float, think: float):
+        me = (role, idx)
+        # bound once: after a reset permits go back to this semaphore
+        sem = self.sem
+        while True:
+            self.events.put({"type": "try", "role": role, "id": idx})
+            await sem.acquire(me)
             try:
-                self._blocked.remove(("C", idx))
-            except ValueError:
-                pass
-            self._sleep(0.5)
+                self.events.put({"type": "acquire", "role": role, "id": idx, "sem": sem.value})
+                await self._sleep(hold)
+            finally:
+                sem.release(me)
+            self.events.put({"type": "release", "role": role, "id": idx, "sem": sem.value})
+            await self._sleep(think)
+
+    @property
+    def value(self) -> int:
+        return self.sem.value if self.sem is not None else self.capacity
+
+    @property
+    def blocked(self) -> List[Tuple[str, int]]:
+        return self.sem.blocked if self.sem is not None else []
+
+    def stats(self) -> Dict[str, object]:
+        return self.sem.stats.snapshot() if self.sem is not None else SemaphoreStats().snapshot()
 
     def pause(self):
         self._running = False
+        for t in self._tasks:
+            t.cancel()
+        self._tasks.clear()
 
     def resume(self):
         if not self._running:
@@ -90,13 +444,21 @@ class SemaphoreSimulator:
 
     def reset(self):
         self.pause()
-        while not self.events.empty():
-            self.events.get()
-        self._blocked.clear()
+        self.events.clear()
+        self.sem = None
+
+    async def aclose(self):
+        tasks = list(self._tasks)
+        self.pause()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def areset(self):
+        # reset once the cancelled workers have actually finished
+        await self.aclose()
+        self.reset()
 
     def speed_up(self):
         self.speed *= 1.2
 
     def speed_down(self):
         self.speed /= 1.2
-
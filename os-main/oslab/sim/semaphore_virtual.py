@@ -0,0 +1,243 @@
+import argparse
+import heapq
+import json
+import time
+from collections import deque
+from typing import Dict, List, Optional, Union
+import numpy as np
+
+# SemaphoreSimulator's think -> acquire -> hold -> release cycle on a seeded virtual
+# clock, summarised instead of published event by event. Waiters are served FIFO.
+#
+# A distribution is a number (constant) or a dict such as {"dist": "exp", "mean": 0.5},
+# {"dist": "uniform", "low": 0.2, "high": 0.8}, {"dist": "lognormal", "mean": 0.5,
+# "sigma": 0.6} or {"dist": "const", "value": 0.5}.
+Dist = Union[float, Dict[str, object]]
+
+DEFAULTS = {
+    "P": {"hold": {"dist": "exp", "mean": 0.5}, "think": {"dist": "exp", "mean": 0.4}},
+    "C": {"hold": {"dist": "exp", "mean": 0.6}, "think": {"dist": "exp", "mean": 0.5}},
+}
+PERCENTILES = (50, 95, 99)
+
+def _duration(dist: Dict[str, object], key: str, default: float) -> float:
+    # times on the virtual clock: finite and not negative (nan fails the comparison)
+    value = float(dist.get(key, default))
+    if not 0.0 <= value < float("inf"):
+        raise ValueError(f"{key} must be a finite non-negative number, got {value}")
+    return value
+
+class _Sampler:
+    # draws in numpy chunks and hands them out one float at a time
+    def __init__(self, rng: np.random.Generator, dist: Dist, chunk: int = 65536):
+        if not isinstance(dist, dict):
+            dist = {"dist": "const", "value": dist}
+        kind = dist.get("dist", "exp")
+        if kind == "exp":
+            mean = _duration(dist, "mean", 1.0)
+            self._draw = lambda n: rng.exponential(mean, n)
+        elif kind == "uniform":
+            low, high = _duration(dist, "low", 0.0), _duration(dist, "high", 1.0)
+            if low > high:
+                raise ValueError(f"uniform low ({low}) is above high ({high})")
+            self._draw = lambda n: rng.uniform(low, high, n)
+        elif kind == "lognormal":
+            # parametrised by the mean of the result, not of the underlying normal
+            mean, sigma = _duration(dist, "mean", 1.0), _duration(dist, "sigma", 0.5)
+            if mean == 0.0:
+                raise ValueError("lognormal mean must be positive")
+            mu = np.log(mean) - sigma * sigma / 2
+            self._draw = lambda n: rng.lognormal(mu, sigma, n)
+        elif kind == "const":
+            value = _duration(dist, "value", float(dist.get("mean", 1.0)))
+            self._draw = lambda n: np.full(n, value)
+        else:
+            raise ValueError(f"unknown distribution: {kind}")
+        self._chunk = chunk
+        self._buf: List[float] = []
+
+    def refill(self) -> List[float]:
+        self._buf = self._draw(self._chunk).tolist()
+        return self._buf
+
+class _WaitHistogram:
+    # waits on buckets 1% apart from 1e-9 to 1e9 (zeros apart): percentiles within 1%,
+    # mean and max exact
+    RATIO = 1.01
+    LOW = 1e-9
+    BUCKETS = int(np.ceil(np.log(1e18) / np.log(RATIO)))
+
+    def __init__(self):
+        self.counts = np.zeros(self.BUCKETS + 1, dtype=np.int64)  # [0] holds the zeros
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, values: List[float]):
+        a = np.asarray(values, dtype=np.float64)
+        if not len(a):
+            return
+        self.n += len(a)
+        self.total += float(a.sum())
+        self.max = max(self.max, float(a.max()))
+        idx = np.zeros(len(a), dtype=np.int64)
+        pos = a > 0
+        k = np.log(a[pos] / self.LOW) // np.log(self.RATIO)
+        idx[pos] = 1 + np.clip(k, 0, self.BUCKETS - 1).astype(np.int64)
+        self.counts += np.bincount(idx, minlength=len(self.counts))
+
+    def _value(self, bucket: np.ndarray) -> np.ndarray:
+        # geometric middle of each bucket, never above the largest wait seen
+        mid = self.LOW * self.RATIO ** (bucket - 0.5)
+        return np.where(bucket == 0, 0.0, np.minimum(mid, self.max))
+
+    def summary(self) -> Dict[str, float]:
+        if not self.n:
+            return {"mean": 0.0, **{f"p{q}": 0.0 for q in PERCENTILES}, "max": 0.0}
+        # same ranks as np.percentile's linear method, read off the cumulative counts
+        cum = np.cumsum(self.counts)
+        ranks = np.array(PERCENTILES) / 100 * (self.n - 1)
+        lo, hi = np.floor(ranks), np.ceil(ranks)
+        v_lo = self._value(np.searchsorted(cum, lo, side="right"))
+        v_hi = self._value(np.searchsorted(cum, hi, side="right"))
+        qs = v_lo + (v_hi - v_lo) * (ranks - lo)
+        return {"mean": self.total / self.n, **{f"p{q}": float(v) for q, v in zip(PERCENTILES, qs)},
+                "max": self.max}
+
+def simulate(capacity: int = 3, producers: int = 2, consumers: int = 2, ops: int = 1_000_000,
+             seed: Optional[int] = None, roles: Optional[Dict[str, Dict[str, Dist]]] = None) -> Dict[str, object]:
+    # runs until `ops` acquire/release cycles have completed
+    if capacity < 1 or producers + consumers < 1:
+        raise ValueError("capacity and the number of workers must be positive")
+    cfg = {r: dict(DEFAULTS[r], **((roles or {}).get(r) or {})) for r in ("P", "C")}
+    rng = np.random.default_rng(seed)
+    names = ["P"] * producers + ["C"] * consumers
+    n = len(names)
+    samplers = {r: (_Sampler(rng, cfg[r]["hold"]), _Sampler(rng, cfg[r]["think"])) for r in ("P", "C")}
+    # per worker: index into the role tables below
+    role_of = [0 if r == "P" else 1 for r in names]
+    hold_s = [samplers["P"][0], samplers["C"][0]]
+    think_s = [samplers["P"][1], samplers["C"][1]]
+    hold_buf = [s.refill() for s in hold_s]
+    think_buf = [s.refill() for s in think_s]
+    hold_i = [0, 0]
+    think_i = [0, 0]
+    chunk = hold_s[0]._chunk
+
+    # heap entries are (time, code) with code = worker * 2 + (1 for a release, 0 for
+    # an arrival), which also breaks ties deterministically
+    heap = []
+    for w in range(n):
+        r = role_of[w]
+        heap.append((think_buf[r][think_i[r]], w * 2))
+        think_i[r] += 1
+    heapq.heapify(heap)
+    push, pop = heapq.heappush, heapq.heappop
+
+    hist = _WaitHistogram()
+    waits: List[float] = []
+    record = waits.append
+    role_ops = [0, 0]
+    role_acq = [0, 0]
+    role_wait = [0.0, 0.0]
+    arrived = [0.0] * n
+    queue = deque()
+    enqueue, dequeue = queue.append, queue.popleft
+    free = capacity
+    done = 0
+    busy = 0.0          # permit-seconds held
+    q_area = 0.0        # time-integral of the queue length
+    q_max = 0
+    last = 0.0
+    t = 0.0
+    started = time.perf_counter()
+    while done < ops:
+        t, code = pop(heap)
+        if queue:
+            q_area += len(queue) * (t - last)
+        last = t
+        w = code >> 1
+        r = role_of[w]
+        if code & 1:
+            done += 1
+            role_ops[r] += 1
+            if not done & 0xFFFF:
+                hist.add(waits)
+                waits.clear()
+            if queue:
+                w2 = dequeue()
+                r2 = role_of[w2]
+                wait = t - arrived[w2]
+                record(wait)
+                role_wait[r2] += wait
+                role_acq[r2] += 1
+                i = hold_i[r2]
+                if i == chunk:
+                    hold_s[r2].refill()
+                    hold_buf[r2] = hold_s[r2]._buf
+                    i = 0
+                h = hold_buf[r2][i]
+                hold_i[r2] = i + 1
+                busy += h
+                push(heap, (t + h, w2 * 2 + 1))
+            else:
+                free += 1
+            i = think_i[r]
+            if i == chunk:
+                think_s[r].refill()
+                think_buf[r] = think_s[r]._buf
+                i = 0
+            push(heap, (t + think_buf[r][i], w * 2))
+            think_i[r] = i + 1
+        elif free:
+            free -= 1
+            record(0.0)
+            role_acq[r] += 1
+            i = hold_i[r]
+            if i == chunk:
+                hold_s[r].refill()
+                hold_buf[r] = hold_s[r]._buf
+                i = 0
+            h = hold_buf[r][i]
+            hold_i[r] = i + 1
+            busy += h
+            push(heap, (t + h, code + 1))
+        else:
+            arrived[w] = t
+            enqueue(w)
+            if len(queue) > q_max:
+                q_max = len(queue)
+    hist.add(waits)
+    elapsed = time.perf_counter() - started
+    # holds still running at the end were counted in full; trim them to `t`
+    for end, code in heap:
+        if code & 1 and end > t:
+            busy -= end - t
+    return {
+        "capacity": capacity, "producers": producers, "consumers": consumers, "seed": seed,
+        "ops": done, "virtual_seconds": t,
+        "throughput": done / t if t > 0 else 0.0,
+        "utilization": busy / (capacity * t) if t > 0 else 0.0,
+        "wait": hist.summary(),
+        "queue": {"mean": q_area / t if t > 0 else 0.0, "max": q_max},
+        "roles": {name: {"ops": role_ops[i], "wait_mean": role_wait[i] / role_acq[i] if role_acq[i] else 0.0}
+                  for i, name in enumerate(("P", "C"))},
+        "seconds": elapsed,
+        "ops_per_second": done / elapsed if elapsed > 0 else 0.0,
+    }
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="virtual-time semaphore simulation, prints one JSON summary")
+    ap.add_argument("--capacity", type=int, default=3)
+    ap.add_argument("--producers", type=int, default=2)
+    ap.add_argument("--consumers", type=int, default=2)
+    ap.add_argument("--ops", type=int, default=1_000_000)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--roles", default=None, help='JSON, e.g. {"P": {"hold": {"dist": "uniform", "low": 0.1, "high": 0.9}}}')
+    args = ap.parse_args(argv)
+    roles = json.loads(args.roles) if args.roles else None
+    print(json.dumps(simulate(args.capacity, args.producers, args.consumers, args.ops, args.seed, roles),
+                     ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import multiprocessing as mp
+import os
+import struct
+import sys
+import time
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Iterator, Optional
+
+# Shared-memory bounded ring of fixed-size slots usable from several OS processes.
+#
+# Layout: a 16-byte header holding the head (messages written) and tail (messages
+# claimed) counters, then `slots` slots of [state u8, pad, length u32, payload].
+# One lock per side; the free/items semaphores do the blocking. Readers get a
+# memoryview into the slot.
+_HEADER = struct.Struct("<qq")
+_SLOT = struct.Struct("<BxxxI")
+_FREE, _FULL, _READING = 0, 1, 2
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # children share the creator's resource tracker
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+class ShmRing:
+    def __init__(self, slots: int = 8, slot_size: int = 64, ctx=None):
+        ctx = ctx or mp.get_context()
+        self.slots = slots
+        self.slot_size = slot_size
+        self._stride = _SLOT.size + slot_size
+        self._shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + slots * self._stride)
+        self._shm.buf[:_HEADER.size + slots * self._stride] = bytes(_HEADER.size + slots * self._stride)
+        # forked children inherit this object as is; only the creating process unlinks
+        self._owner = os.getpid()
+        self._free = ctx.Semaphore(slots)
+        self._items = ctx.Semaphore(0)
+        self._plock = ctx.Lock()
+        self._clock = ctx.Lock()
+
+    def __getstate__(self):
+        return {"name": self._shm.name, "slots": self.slots, "slot_size": self.slot_size,
+                "free": self._free, "items": self._items, "plock": self._plock, "clock": self._clock}
+
+    def __setstate__(self, st):
+        self.slots = st["slots"]
+        self.slot_size = st["slot_size"]
+        self._stride = _SLOT.size + self.slot_size
+        self._shm = _attach(st["name"])
+        self._owner = None
+        self._free = st["free"]
+        self._items = st["items"]
+        self._plock = st["plock"]
+        self._clock = st["clock"]
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def _offset(self, n: int) -> int:
+        return _HEADER.size + (n % self.slots) * self._stride
+
+    def put(self, data, timeout: Optional[float] = None) -> bool:
+        n = len(data)
+        if n > self.slot_size:
+            raise ValueError(f"message of {n} bytes does not fit a {self.slot_size}-byte slot")
+        if not self._free.acquire(timeout=timeout):
+            return False
+        buf = self._shm.buf
+        with self._plock:
+            head, _ = _HEADER.unpack_from(buf, 0)
+            off = self._offset(head)
+            # readers may finish out of order
+            while buf[off] != _FREE:
+                time.sleep(0)
+            buf[off + _SLOT.size:off + _SLOT.size + n] = data
+            _SLOT.pack_into(buf, off, _FULL, n)
+            struct.pack_into("<q", buf, 0, head + 1)
+        self._items.release()
+        return True
+
+    @contextmanager
+    def read(self, timeout: Optional[float] = None) -> Iterator[Optional[memoryview]]:
+        # yields a zero-copy view of the next message (None on timeout); the view is
+        # only valid inside the with-block
+        if not self._items.acquire(timeout=timeout):
+            yield None
+            return
+        buf = self._shm.buf
+        with self._clock:
+            tail = struct.unpack_from("<q", buf, 8)[0]
+            struct.pack_into("<q", buf, 8, tail + 1)
+            off = self._offset(tail)
+            buf[off] = _READING
+        _, n = _SLOT.unpack_from(buf, off)
+        view = buf[off + _SLOT.size:off + _SLOT.size + n]
+        try:
+            yield view
+        finally:
+            view.release()
+            buf[off] = _FREE
+            self._free.release()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        with self.read(timeout) as view:
+            return None if view is None else bytes(view)
+
+    def qsize(self) -> int:
+        head, tail = _HEADER.unpack_from(self._shm.buf, 0)
+        return head - tail
+
+    def close(self):
+        self._shm.close()
+        if self._owner == os.getpid():
+            self._shm.unlink()
@@ -0,0 +1,199 @@
+import os
+import struct
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from oslab.models.process import Timeline
+
+# Stored timeline: one file of little-endian int64 words, mapped read-only.
+#   header   magic, slices n, cores C, distinct pids P, first start, last end, wait, turn
+#   core_off C+1   slice range of each core in the arrays below
+#   start, end, pid   n each, ordered by (core, start)
+#   pid_keys P, pid_off P+1, pid_idx n   slice positions grouped by pid, then by start
+# Within a core both start and end are sorted, so queries are binary searches.
+MAGIC = b"OSLABTL1"
+HEADER = struct.Struct("<8sqqqqqdd")
+_WORD = 8
+
+def write_timeline(path: str, timeline: Timeline, metrics: Tuple[float, float]) -> Dict[str, int]:
+    # writes atomically (temp file + rename); returns the summary stored in the header
+    pid = np.frombuffer(timeline.pid, dtype=np.int64)
+    start = np.frombuffer(timeline.start, dtype=np.int64)
+    end = np.frombuffer(timeline.end, dtype=np.int64)
+    core = np.frombuffer(timeline.core, dtype=np.int32).astype(np.int64)
+    n = len(pid)
+    order = np.lexsort((start, core))
+    pid, start, end, core = pid[order], start[order], end[order], core[order]
+    cores = int(core[-1]) + 1 if n else 0
+    core_off = np.searchsorted(core, np.arange(cores + 1))
+    pid_idx = np.lexsort((start, pid))
+    pid_keys, first = np.unique(pid[pid_idx], return_index=True)
+    pid_off = np.append(first, n)
+    t0 = int(start.min()) if n else 0
+    t1 = int(end.max()) if n else 0
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, n, cores, len(pid_keys), t0, t1, metrics[0], metrics[1]))
+        for a in (core_off, start, end, pid, pid_keys, pid_off, pid_idx):
+            f.write(np.ascontiguousarray(a, dtype="<i8").tobytes())
+    os.replace(tmp, path)
+    return {"count": n, "cores": cores, "start": t0, "end": t1}
+
+def _columns(pid, start, end, core) -> Dict[str, List[int]]:
+    return {"pid": pid.tolist(), "start": start.tolist(), "end": end.tolist(), "core": core.tolist()}
+
+class StoredTimeline:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            magic, n, cores, npids, t0, t1, wait, turn = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"not a stored timeline: {path}")
+        self.count, self.cores, self.first, self.last = n, cores, t0, t1
+        self.metrics = {"wait": wait, "turn": turn}
+        words = np.memmap(path, dtype="<i8", mode="r")
+        pos = HEADER.size // _WORD
+
+        def take(k):
+            nonlocal pos
+            pos += k
+            return words[pos - k:pos]
+
+        self.core_off = np.array(take(cores + 1))
+        self.start, self.end, self.pid = take(n), take(n), take(n)
+        self.pid_keys, self.pid_off, self.pid_idx = take(npids), take(npids + 1), take(n)
+
+    def summary(self) -> Dict[str, object]:
+        return {"count": self.count, "cores": self.cores, "start": self.first, "end": self.last,
+                "pids": len(self.pid_keys), "metrics": self.metrics}
+
+    def _core_range(self, c: int) -> Tuple[int, int]:
+        if not 0 <= c < self.cores:
+            return 0, 0
+        return int(self.core_off[c]), int(self.core_off[c + 1])
+
+    def _overlapping(self, c: int, t0: int, t1: int) -> Tuple[int, int]:
+        # index range of core c's slices overlapping [t0, t1)
+        lo, hi = self._core_range(c)
+        i = lo + int(np.searchsorted(self.end[lo:hi], t0, "right"))
+        j = lo + int(np.searchsorted(self.start[lo:hi], t1, "left"))
+        return i, max(i, j)
+
+    def window(self, t0: int, t1: int, core: Optional[int] = None, limit: Optional[int] = None) -> Dict[str, object]:
+        # slices overlapping [t0, t1), by core then start; at most `limit` of them
+        parts = []
+        left = limit
+        for c in range(self.cores) if core is None else (core,):
+            i, j = self._overlapping(c, t0, t1)
+            if left is not None:
+                j = min(j, i + left)
+            if j > i:
+                parts.append((c, i, j))
+                if left is not None:
+                    left -= j - i
+                    if left <= 0:
+                        break
+        truncated = left is not None and left <= 0 and self._more(parts, t0, t1, core)
+        idx = np.concatenate([np.arange(i, j) for _, i, j in parts]) if parts else np.zeros(0, dtype=np.int64)
+        core_col = np.concatenate([np.full(j - i, c) for c, i, j in parts]) if parts else idx
+        out = _columns(self.pid[idx], self.start[idx], self.end[idx], core_col)
+        out["truncated"] = truncated
+        return out
+
+    def _more(self, parts, t0: int, t1: int, core: Optional[int]) -> bool:
+        # whether a limited window left anything out
+        if parts:
+            c, _, j = parts[-1]
+            if self._overlapping(c, t0, t1)[1] > j:
+                return True
+            rest = range(c + 1, self.cores) if core is None else ()
+        else:
+            rest = range(self.cores) if core is None else (core,)
+        return any(j2 > i2 for i2, j2 in (self._overlapping(c2, t0, t1) for c2 in rest))
+
+    def at(self, core: int, t: int) -> Optional[Dict[str, int]]:
+        # the slice running on `core` at time t, if any
+        lo, hi = self._core_range(core)
+        i = lo + int(np.searchsorted(self.start[lo:hi], t, "right")) - 1
+        if i < lo or self.end[i] <= t:
+            return None
+        return {"pid": int(self.pid[i]), "start": int(self.start[i]), "end": int(self.end[i]), "core": core}
+
+    def for_pid(self, pid: int) -> Dict[str, List[int]]:
+        k = int(np.searchsorted(self.pid_keys, pid))
+        if k == len(self.pid_keys) or self.pid_keys[k] != pid:
+            return _columns(*(np.zeros(0, dtype=np.int64),) * 4)
+        idx = self.pid_idx[self.pid_off[k]:self.pid_off[k + 1]]
+        core = np.searchsorted(self.core_off, idx, "right") - 1
+        return _columns(self.pid[idx], self.start[idx], self.end[idx], core)
+
+class TimelineStore:
+    # Stored timelines in one directory, named by result id; past max_bytes (or
+    # max_results) the oldest are deleted.
+    def __init__(self, directory: str, max_bytes: int = 1 << 30, max_results: int = 4096, max_open: int = 64):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_results = max_results
+        self.max_open = max_open
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._open: "OrderedDict[str, StoredTimeline]" = OrderedDict()
+        self._bytes = 0
+        found = []
+        for name in os.listdir(directory):
+            full = os.path.join(directory, name)
+            if name.endswith(".tl"):
+                found.append((os.path.getmtime(full), name[:-3], os.path.getsize(full)))
+            elif name.endswith(".tmp"):
+                os.remove(full)
+        for _, rid, size in sorted(found):
+            self._sizes[rid] = size
+            self._bytes += size
+        self._trim()
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    def path(self, rid: str) -> str:
+        return os.path.join(self.directory, rid + ".tl")
+
+    def add(self, rid: str):
+        # call once the file at path(rid) is written
+        size = os.path.getsize(self.path(rid))
+        with self._lock:
+            self._sizes[rid] = size
+            self._bytes += size
+            self._trim()
+
+    def _trim(self):
+        while self._sizes and (self._bytes > self.max_bytes or len(self._sizes) > self.max_results):
+            rid, size = self._sizes.popitem(last=False)
+            self._bytes -= size
+            self._open.pop(rid, None)
+            try:
+                os.remove(self.path(rid))
+            except OSError:
+                pass
+
+    def get(self, rid: str) -> Optional[StoredTimeline]:
+        with self._lock:
+            if rid not in self._sizes:
+                return None
+            st = self._open.get(rid)
+            if st is not None:
+                self._open.move_to_end(rid)
+                return st
+        st = StoredTimeline(self.path(rid))
+        with self._lock:
+            self._open[rid] = st
+            while len(self._open) > self.max_open:
+                self._open.popitem(last=False)
+        return st
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"results": len(self._sizes), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                    "open": len(self._open)}
@@ -0,0 +1,99 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+import numpy as np
+from oslab.models.process import ProcSpec
+from oslab.models.workload import Workload
+from oslab.sim.metrics import batch_metrics
+from oslab.sim.scheduler import ALGORITHMS, schedule
+
+# set once per worker by the pool initializer, so tasks only carry their config
+_WORKLOAD: Optional[Workload] = None
+
+def grid(algos: Sequence[str] = ALGORITHMS, quanta: Sequence[int] = (1,), cores: Sequence[int] = (1,),
+         preemptive: Sequence[bool] = (False,)) -> List[Dict[str, object]]:
+    # quantum and preemption are only crossed with the algorithms that use them
+    out = []
+    for algo, c in itertools.product(algos, cores):
+        if algo not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm: {algo}")
+        qs = quanta if algo in ("rr", "cfs", "mlfq") else (None,)
+        ps = preemptive if algo in ("sjf", "priority", "edf") else (False,)
+        for q, p in itertools.product(qs, ps):
+            out.append({"algo": algo, "quantum": q, "cores": c, "preemptive": p})
+    return out
+
+def run_config(workload: Workload, cfg: Dict[str, object]) -> Dict[str, object]:
+    cores = int(cfg.get("cores") or 1)
+    t0 = time.perf_counter()
+    timeline, _ = schedule(cfg["algo"], workload, cores=cores, quantum=int(cfg.get("quantum") or 1),
+                           preemptive=bool(cfg.get("preemptive")), per_core=bool(cfg.get("per_core")),
+                           columnar=True, levels=int(cfg.get("levels") or 3), boost=int(cfg.get("boost") or 0))
+    elapsed = time.perf_counter() - t0
+    row = dict(cfg)
+    row.update(batch_metrics(workload, timeline, cores))
+    row["slices"] = len(timeline)
+    row["seconds"] = elapsed
+    return row
+
+def _init_worker(workload: Workload):
+    global _WORKLOAD
+    _WORKLOAD = workload
+
+def _run_in_worker(cfg: Dict[str, object]) -> Dict[str, object]:
+    return run_config(_WORKLOAD, cfg)
+
+def sweep(workload: Union[Workload, List[ProcSpec]], configs: Iterable[Dict[str, object]],
+          workers: Optional[int] = None) -> Iterator[Dict[str, object]]:
+    # rows are yielded in completion order, not submission order
+    if not isinstance(workload, Workload):
+        workload = Workload.from_specs(workload)
+    configs = list(configs)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(configs) <= 1:
+        for cfg in configs:
+            yield run_config(workload, cfg)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(configs)),
+                             initializer=_init_worker, initargs=(workload,)) as pool:
+        futures = [pool.submit(_run_in_worker, cfg) for cfg in configs]
+        for fut in as_completed(futures):
+            yield fut.result()
+
+def _ints(csv: str) -> List[int]:
+    return [int(x) for x in csv.split(",") if x.strip()]
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Run a scheduler parameter sweep and print one JSON row per run")
+    ap.add_argument("--arrivals", default="0,2,4")
+    ap.add_argument("--bursts", default="5,3,2")
+    ap.add_argument("--priorities", default="")
+    ap.add_argument("--random", type=int, default=0, help="generate a random workload of this many processes")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--algos", default=",".join(ALGORITHMS))
+    ap.add_argument("--quanta", default="1,2,4")
+    ap.add_argument("--cores", default="1")
+    ap.add_argument("--preemptive", choices=("off", "on", "both"), default="both")
+    ap.add_argument("--workers", type=int, default=0)
+    args = ap.parse_args(argv)
+    if args.random:
+        rng = np.random.default_rng(args.seed)
+        n = args.random
+        workload = Workload(np.sort(rng.integers(0, n * 10, n)), rng.integers(1, 50, n), rng.integers(0, 10, n))
+    else:
+        arrivals, bursts = _ints(args.arrivals), _ints(args.bursts)
+        priorities = _ints(args.priorities) or [0] * len(arrivals)
+        workload = Workload(arrivals, bursts, priorities)
+    pre = {"off": (False,), "on": (True,), "both": (False, True)}[args.preemptive]
+    configs = grid([a for a in args.algos.split(",") if a], _ints(args.quanta), _ints(args.cores), pre)
+    for row in sweep(workload, configs, args.workers or None):
+        sys.stdout.write(json.dumps(row) + "\n")
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
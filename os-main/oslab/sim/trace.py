@@ -0,0 +1,80 @@
+import mmap
+import os
+import struct
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Union
+from oslab.models.process import ProcSpec
+
+# Packed trace: one record per process, four little-endian int64 fields
+# (pid, arrival, burst, priority), records sorted by arrival.
+RECORD = struct.Struct("<4q")
+
+FIELDS = ("pid", "arrival", "burst", "priority")
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+def _int64(value: Union[str, int]) -> int:
+    # CSV fields hold the same range as the packed records
+    v = int(value)
+    if not _INT64_MIN <= v <= _INT64_MAX:
+        raise ValueError(f"{value} does not fit in int64")
+    return v
+
+def read_csv(lines: Iterable[Union[str, bytes]]) -> Iterator[ProcSpec]:
+    # arrival,burst[,priority], or columns named by a header row; without a pid column
+    # processes are numbered from 1, an empty deadline means none
+    cols: Optional[List[str]] = None
+    n = 0
+    for raw in lines:
+        line = raw.decode() if isinstance(raw, bytes) else raw
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = [x.strip() for x in line.split(",")]
+        if cols is None:
+            if not parts[0].lstrip("-").isdigit():
+                cols = [x.lower() for x in parts]
+                continue
+            cols = ["arrival", "burst", "priority"]
+        row = dict(zip(cols, parts))
+        n += 1
+        dl = row.get("deadline")
+        yield ProcSpec(_int64(row.get("pid", n)), _int64(row.get("arrival", 0)),
+                       _int64(row.get("burst", 1)), _int64(row.get("priority", 0) or 0),
+                       _int64(dl) if dl else None)
+
+def read_packed(buf) -> Iterator[ProcSpec]:
+    mv = memoryview(buf)
+    usable = len(mv) - len(mv) % RECORD.size
+    for pid, arrival, burst, prio in RECORD.iter_unpack(mv[:usable]):
+        yield ProcSpec(pid, arrival, burst, prio)
+
+def write_packed(specs: Iterable[ProcSpec], out: BinaryIO):
+    for p in specs:
+        out.write(RECORD.pack(p.pid, p.arrival, p.burst, p.priority))
+
+def open_trace(path_or_file: Union[str, BinaryIO], fmt: Optional[str] = None) -> Iterator[ProcSpec]:
+    # memory-mapped and parsed lazily; fmt "csv" or "bin", by default from the extension
+    if isinstance(path_or_file, str):
+        f = open(path_or_file, "rb")
+        owned = True
+        if fmt is None:
+            fmt = "csv" if path_or_file.lower().endswith((".csv", ".txt")) else "bin"
+    else:
+        f = path_or_file
+        owned = False
+    try:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            if fmt == "csv":
+                yield from read_csv(iter(m.readline, b""))
+            else:
+                # iter_unpack holds a view on the map; release it before the map closes
+                mv = memoryview(m)
+                try:
+                    yield from read_packed(mv)
+                finally:
+                    mv.release()
+    finally:
+        if owned:
+            f.close()
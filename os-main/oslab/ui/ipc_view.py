@@ -7,6 +7,7 @@ class IPCView(TabPane):
     def __init__(self, title: str):
         super().__init__(title=title)
         self.sim = IPCSimulator()
+        self._events = self.sim.events.subscribe()
         self.buf = DataTable(id="buf")
         self.log_table = DataTable(id="log")
         self.occ = Static()
@@ -21,8 +22,8 @@ class IPCView(TabPane):
         yield Vertical(self.buf, self.log_table, self.occ, self.flow, controls)
 
     def _drain(self):
-        while not self.sim.events.empty():
-            ev = self.sim.events.get()
+        while not self._events.empty():
+            ev = self._events.get()
             if ev["type"] == "produce":
                 d = ev["data"]
                 self.buf.add_row(str(d["seq"]), str(d["value"]))
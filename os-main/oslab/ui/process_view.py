@@ -9,6 +9,7 @@ class ProcessView(TabPane):
     def __init__(self, title: str):
         super().__init__(title=title)
         self.sim = ProcessSimulator()
+        self._events = self.sim.events.subscribe()
         self.table = None
         self.log_view = None
 
@@ -45,8 +46,8 @@ class ProcessView(TabPane):
             self.log_view.update("")
 
     def _drain(self):
-        while not self.sim.events.empty():
-            ev = self.sim.events.get()
+        while not self._events.empty():
+            ev = self._events.get()
             self._update_state(ev["pid"], ev["state"])
 
     def pause(self):
@@ -2,7 +2,7 @@ from textual.widgets import TabPane, DataTable, Button, Input, Static
 from textual.containers import Horizontal, Vertical
 from textual.app import ComposeResult
 from textual.reactive import reactive
-from oslab.sim.scheduler import fcfs, rr, sjf, priority
+from oslab.sim.scheduler import Rescheduler
 from oslab.models.process import ProcSpec
 
 class SchedulerView(TabPane):
@@ -12,6 +12,9 @@ class SchedulerView(TabPane):
         self._specs = [ProcSpec(1,0,5,2), ProcSpec(2,2,3,1), ProcSpec(3,4,2,3)]
         self._gantt = Static()
         self._metrics = Static()
+        # one per (algorithm, cores, quantum): re-running after an edit resumes from the
+        # last checkpoint before it instead of from t=0
+        self._runs = {}
 
     def compose(self) -> ComposeResult:
         table = DataTable(id="specs")
@@ -23,11 +26,15 @@ class SchedulerView(TabPane):
             Input(placeholder="到达CSV", id="arrivals"),
             Input(placeholder="执行CSV", id="bursts"),
             Input(placeholder="优先CSV", id="priorities"),
+            Input(placeholder="截止CSV", id="deadlines"),
             Button("FCFS", id="run_fcfs"),
             Button("RR", id="run_rr"),
             Input(placeholder="时间片", id="quantum"),
             Button("SJF", id="run_sjf"),
-            Button("优先级", id="run_pri")
+            Button("优先级", id="run_pri"),
+            Button("CFS", id="run_cfs"),
+            Button("MLFQ", id="run_mlfq"),
+            Button("EDF", id="run_edf")
         )
         yield Vertical(table, controls, self._gantt, self._metrics)
 
@@ -55,39 +62,59 @@ class SchedulerView(TabPane):
     def on_button_pressed(self, event: Button.Pressed):
         btn = event.button.id
         if btn == "run_fcfs":
-            cores = 1
-            inp = self.query_one("#cores", Input)
-            try:
-                if inp.value:
-                    cores = max(1, int(inp.value))
-            except Exception:
-                cores = 1
+            cores = self._cores()
             self._apply_inputs()
-            s, m = fcfs(self._specs, cores=cores)
+            s, m = self._run("fcfs", cores)
             self._render_gantt(s)
             self._metrics.update(f"等待:{m[0]:.2f} 周转:{m[1]:.2f}")
         elif btn == "run_rr":
-            q = 1
-            inp = self.query_one("#quantum", Input)
-            try:
-                if inp.value:
-                    q = int(inp.value)
-            except Exception:
-                q = 1
+            cores = self._cores()
             self._apply_inputs()
-            s, m = rr(self._specs, quantum=q)
+            s, m = self._run("rr", cores, self._quantum())
             self._render_gantt(s)
             self._metrics.update(f"等待:{m[0]:.2f} 周转:{m[1]:.2f}")
         elif btn == "run_sjf":
+            cores = self._cores()
             self._apply_inputs()
-            s, m = sjf(self._specs)
+            s, m = self._run("sjf", cores)
             self._render_gantt(s)
             self._metrics.update(f"等待:{m[0]:.2f} 周转:{m[1]:.2f}")
         elif btn == "run_pri":
+            cores = self._cores()
             self._apply_inputs()
-            s, m = priority(self._specs)
+            s, m = self._run("priority", cores)
             self._render_gantt(s)
             self._metrics.update(f"等待:{m[0]:.2f} 周转:{m[1]:.2f}")
+        elif btn in ("run_cfs", "run_mlfq", "run_edf"):
+            cores = self._cores()
+            self._apply_inputs()
+            s, m = self._run(btn[4:], cores, self._quantum())
+            self._render_gantt(s)
+            self._metrics.update(f"等待:{m[0]:.2f} 周转:{m[1]:.2f}")
+
+    def _run(self, algo: str, cores: int, quantum: int = 1):
+        key = (algo, cores, quantum)
+        if key not in self._runs:
+            self._runs[key] = Rescheduler(algo, cores=cores, quantum=quantum)
+        return self._runs[key].run(self._specs)
+
+    def _quantum(self) -> int:
+        inp = self.query_one("#quantum", Input)
+        try:
+            if inp.value:
+                return int(inp.value)
+        except Exception:
+            pass
+        return 1
+
+    def _cores(self) -> int:
+        inp = self.query_one("#cores", Input)
+        try:
+            if inp.value:
+                return max(1, int(inp.value))
+        except Exception:
+            pass
+        return 1
 
     def pause(self):
         pass
@@ -109,18 +136,21 @@ class SchedulerView(TabPane):
         arr = self.query_one("#arrivals", Input).value or ""
         bur = self.query_one("#bursts", Input).value or ""
         pri = self.query_one("#priorities", Input).value or ""
+        dl = self.query_one("#deadlines", Input).value or ""
         try:
             arrs = [int(x) for x in arr.split(',') if x.strip()]
             burs = [int(x) for x in bur.split(',') if x.strip()]
             pris = [int(x) for x in pri.split(',') if x.strip()]
-            n = max(len(arrs), len(burs), len(pris))
+            dls = [int(x) for x in dl.split(',') if x.strip()]
+            n = max(len(arrs), len(burs), len(pris), len(dls))
             if n:
                 specs = []
                 for i in range(n):
                     a = arrs[i] if i < len(arrs) else 0
                     b = burs[i] if i < len(burs) else 1
                     p = pris[i] if i < len(pris) else 0
-                    specs.append(ProcSpec(i+1, a, b, p))
+                    d = dls[i] if i < len(dls) else None
+                    specs.append(ProcSpec(i+1, a, b, p, d))
                 self._specs = specs
                 table = self.query_one("#specs", DataTable)
                 table.clear()
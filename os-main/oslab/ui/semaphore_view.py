@@ -1,4 +1,4 @@
-from textual.widgets import TabPane, DataTable, Button, Static
+from textual.widgets import TabPane, DataTable, Button, Input, Static
 from textual.containers import Vertical, Horizontal
 from textual.app import ComposeResult
 from oslab.sim.semaphore_sim import SemaphoreSimulator
@@ -7,6 +7,7 @@ class SemaphoreView(TabPane):
     def __init__(self, title: str):
         super().__init__(title=title)
         self.sim = SemaphoreSimulator()
+        self._events = self.sim.events.subscribe()
         self.sem_val = Static()
         self.blocked = DataTable()
         self.log_table = DataTable()
@@ -14,12 +15,15 @@ class SemaphoreView(TabPane):
     def compose(self) -> ComposeResult:
         self.blocked.add_columns("阻塞角色","ID")
         self.log_table.add_columns("事件","详情")
-        controls = Horizontal(Button("开始", id="start"), Button("暂停", id="pause"), Button("重置", id="reset"))
+        controls = Horizontal(Button("开始", id="start"), Button("暂停", id="pause"), Button("重置", id="reset"),
+                              Button("条件变量", id="kind_condition"), Button("FIFO", id="kind_fifo"),
+                              Button("优先级", id="kind_priority"),
+                              Input(placeholder="P优先级", id="prio_p"), Input(placeholder="C优先级", id="prio_c"))
         yield Vertical(self.sem_val, self.blocked, self.log_table, controls)
 
     def _drain(self):
-        while not self.sim.events.empty():
-            ev = self.sim.events.get()
+        while not self._events.empty():
+            ev = self._events.get()
             self.sem_val.update(f"信号量值: {ev.get('sem', self.sim.sem.value)}")
             t = ev["type"]
             if t == "try":
@@ -32,7 +36,7 @@ class SemaphoreView(TabPane):
 
     def _render_blocked(self):
         self.blocked.clear()
-        for role, idx in list(self.sim._blocked):
+        for role, idx in self.sim.blocked:
             self.blocked.add_row(role, str(idx))
 
     def on_button_pressed(self, event: Button.Pressed):
@@ -44,6 +48,21 @@ class SemaphoreView(TabPane):
         elif event.button.id == "reset":
             self.sim.reset()
             self.blocked.clear(); self.log_table.clear(); self.sem_val.update("")
+        elif event.button.id.startswith("kind_"):
+            self._set_kind(event.button.id[5:])
+
+    def _prio(self, widget_id: str, default: int) -> int:
+        try:
+            return int(self.query_one(f"#{widget_id}", Input).value)
+        except Exception:
+            return default
+
+    def _set_kind(self, kind: str):
+        # switching kind starts over on a fresh semaphore of that kind
+        self.sim.kind = kind
+        self.sim.priorities = {"P": self._prio("prio_p", 0), "C": self._prio("prio_c", 1)}
+        self.reset()
+        self.sem_val.update(f"模式: {kind}")
 
     def pause(self):
         self.sim.pause()
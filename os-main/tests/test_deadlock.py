@@ -0,0 +1,93 @@
+import random
+import threading
+import time
+from oslab.sim.deadlock import CLOSED, DeadlockSimulator, ResourceTable, WaitForGraph
+
+def test_wait_for_graph_roots_match_parent_walk():
+    rng = random.Random(5)
+    n = 60
+    g = WaitForGraph(n)
+    parent = [-1] * n
+
+    def root(x):
+        while parent[x] != -1:
+            x = parent[x]
+        return x
+
+    for _ in range(5000):
+        x = rng.randrange(n)
+        if parent[x] != -1 and rng.random() < 0.4:
+            g.cut(x)
+            parent[x] = -1
+        elif parent[x] == -1:
+            y = rng.randrange(n)
+            if root(y) != x:  # linking x under its own descendant would close a cycle
+                g.link(x, y)
+                parent[x] = y
+        z = rng.randrange(n)
+        assert g.root(z) == root(z)
+
+def _park(table, w, r, out):
+    t = threading.Thread(target=lambda: out.append(table.acquire(w, r)), daemon=True)
+    t.start()
+    return t
+
+def _wait_until(cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+def test_cycle_refused_and_broken():
+    table = ResourceTable(2, 2)
+    assert table.acquire(0, 0) is None and table.acquire(1, 1) is None
+    assert table.free() == 0
+    got = []
+    t = _park(table, 0, 1, got)
+    _wait_until(lambda: 0 in table.waiting)
+    assert table.acquire(1, 0) == [(1, 0), (0, 1)]
+    assert table.deadlocks == 1
+    # backing off breaks the cycle: worker 0 is handed resource 1
+    table.release(1, 1)
+    t.join(5)
+    assert got == [None] and table.owner == [0, 0] and not table.waiting
+    table.release(0, 0)
+    table.release(0, 1)
+    assert table.free() == 2 == table.owner.count(-1)
+
+def test_philosophers_cycle_detected():
+    n = 300
+    table = ResourceTable(n, n)
+    for w in range(n):
+        assert table.acquire(w, w) is None
+    got = []
+    threads = [_park(table, w, w + 1, got) for w in range(n - 1)]
+    _wait_until(lambda: len(table.waiting) == n - 1)
+    cycle = table.acquire(n - 1, 0)
+    assert cycle is not None and len(cycle) == n
+    assert sorted(cycle) == [(w, (w + 1) % n) for w in range(n)]
+    table.close()
+    for t in threads:
+        t.join(5)
+    assert got == [CLOSED] * (n - 1)
+
+def test_philosophers_simulation_reports_deadlocks():
+    sim = DeadlockSimulator(workers=5, seed=1)
+    sim.speed = 1000.0
+    q = sim.events.subscribe()
+    sim.start()
+    seen = []
+    try:
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and not (sim.table.deadlocks and sim.completed):
+            time.sleep(0.01)
+            seen += q.drain()
+        seen += q.drain()
+        assert sim.table.deadlocks and sim.completed
+        ev = next(e for e in seen if e["type"] == "deadlock")
+        workers = [c["worker"] for c in ev["cycle"]]
+        assert len(workers) == 5 and sorted(ev["resources"]) == list(range(5))
+        assert any(e["type"] == "abort" for e in seen)
+    finally:
+        sim.reset()
+    assert sim.table is None and sim.value == 5
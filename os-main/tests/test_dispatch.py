@@ -0,0 +1,114 @@
+import random
+from collections import deque
+import pytest
+from oslab.models.process import ProcSpec, TimelineSlice
+from oslab.sim.scheduler import priority, rr, sjf
+
+def _rr(specs, quantum):
+    # single-core round robin: arrivals up to the end of a slice queue ahead of the
+    # process it preempted
+    order = sorted(range(len(specs)), key=lambda i: (specs[i].arrival, i))
+    rem = {p.pid: p.burst for p in specs}
+    q = deque()
+    slices = []
+    t = i = 0
+    while True:
+        while i < len(order) and specs[order[i]].arrival <= t:
+            q.append(specs[order[i]])
+            i += 1
+        if not q:
+            if i == len(order):
+                return slices
+            t = specs[order[i]].arrival
+            continue
+        p = q.popleft()
+        run = min(quantum, rem[p.pid])
+        slices.append(TimelineSlice(pid=p.pid, start=t, end=t + run, core=0))
+        t += run
+        rem[p.pid] -= run
+        while i < len(order) and specs[order[i]].arrival <= t:
+            q.append(specs[order[i]])
+            i += 1
+        if rem[p.pid]:
+            q.append(p)
+
+def _merged(slices):
+    out = []
+    last = {}
+    for s in sorted(slices, key=lambda s: (s.core, s.start)):
+        k = last.get(s.core)
+        if k is not None and out[k][0] == s.pid and out[k][2] == s.start:
+            out[k][2] = s.end
+            continue
+        last[s.core] = len(out)
+        out.append([s.pid, s.start, s.end, s.core])
+    return [tuple(x) for x in out]
+
+def _workloads(count=120, size=30):
+    rng = random.Random(3)
+    for _ in range(count):
+        n = rng.randint(1, size)
+        yield [ProcSpec(i + 1, rng.randint(0, 40), rng.randint(1, 9), rng.randint(0, 4)) for i in range(n)]
+
+def test_rr_matches_reference():
+    for specs in _workloads():
+        for quantum in (1, 2, 5):
+            slices, _ = rr(specs, quantum)
+            assert _merged(slices) == _merged(_rr(specs, quantum)), (quantum, specs)
+
+def _check(specs, slices, cores, per_core, key=None, preemptive=False):
+    by_pid = {p.pid: p for p in specs}
+    ran = dict.fromkeys(by_pid, 0)
+    for s in slices:
+        assert 0 <= s.core < cores and s.start >= by_pid[s.pid].arrival
+        ran[s.pid] += s.end - s.start
+    assert ran == {p.pid: p.burst for p in specs}
+    for c in range(cores):
+        on = sorted((s.start, s.end) for s in slices if s.core == c and s.end > s.start)
+        assert all(a[1] <= b[0] for a, b in zip(on, on[1:]))
+    if key is not None and not preemptive and not per_core:
+        # a free core takes the best process waiting at that moment
+        first = {}
+        for s in slices:
+            first[s.pid] = min(first.get(s.pid, s.start), s.start)
+        for p in specs:
+            t = first[p.pid]
+            assert all(key(q, q.burst) >= key(p, p.burst) for q in specs
+                       if q.arrival <= t < first[q.pid]), (p, t)
+    points = sorted({0} | {p.arrival for p in specs} | {s.start for s in slices} | {s.end for s in slices})
+    for t0, t1 in zip(points, points[1:]):
+        running = [s.pid for s in slices if s.start <= t0 and s.end >= t1 and s.end > s.start]
+        assert len(running) == len(set(running)) <= cores
+        done = {pid: sum(min(s.end, t0) - s.start for s in slices if s.pid == pid and s.start < t0)
+                for pid in by_pid}
+        ready = [p for p in specs if p.arrival <= t0 and done[p.pid] < p.burst and p.pid not in running]
+        if per_core:
+            continue
+        # one global queue: a core only idles when nothing is ready
+        assert not ready or len(running) == cores, (t0, running, ready)
+        if key is not None and preemptive and ready:
+            # nothing waiting beats anything running
+            worst = max(key(by_pid[pid], by_pid[pid].burst - done[pid]) for pid in running)
+            assert all(key(p, p.burst - done[p.pid]) >= worst for p in ready)
+
+ALGOS = {
+    "rr": (lambda specs, cores, pre, pc: rr(specs, 2, cores, pc), None),
+    "sjf": (lambda specs, cores, pre, pc: sjf(specs, cores, pre, pc), lambda p, rem: rem),
+    "priority": (lambda specs, cores, pre, pc: priority(specs, cores, pre, pc), lambda p, rem: p.priority),
+}
+
+@pytest.mark.parametrize("per_core", [False, True])
+@pytest.mark.parametrize("preemptive", [False, True])
+@pytest.mark.parametrize("cores", [1, 2, 4, 64])
+@pytest.mark.parametrize("algo", sorted(ALGOS))
+def test_multicore_invariants(algo, cores, preemptive, per_core):
+    run, key = ALGOS[algo]
+    for specs in _workloads(count=40):
+        slices, _ = run(specs, cores, preemptive, per_core)
+        _check(specs, slices, cores, per_core, key, preemptive and algo != "rr")
+
+def test_single_core_is_unchanged_by_per_core():
+    for specs in _workloads(count=40):
+        for algo, (run, _) in ALGOS.items():
+            for pre in (False, True):
+                assert _merged(run(specs, 1, pre, False)[0]) == _merged(run(specs, 1, pre, True)[0])
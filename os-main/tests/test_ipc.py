@@ -0,0 +1,19 @@
+import time
+from oslab.sim.ipc import SharedMemoryIPCSimulator
+
+def test_shared_memory_workers_round_trip():
+    sim = SharedMemoryIPCSimulator(producers=1, consumers=1, capacity=4)
+    sim.speed = 50.0
+    try:
+        sim.start()
+        deadline = time.monotonic() + 30
+        kinds = set()
+        while time.monotonic() < deadline and kinds != {"produce", "consume"}:
+            events, _, _ = sim.events.read(0)
+            kinds = {e["type"] for e in events}
+            time.sleep(0.05)
+        assert kinds == {"produce", "consume"}
+        assert all(pid != 0 for pid in sim.pids)
+    finally:
+        sim.reset()
+    assert sim.pids == [] and sim.size == 0
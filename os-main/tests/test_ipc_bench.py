@@ -0,0 +1,5 @@
+from oslab.sim.ipc_bench import run_benchmark
+
+def test_shm_backend_delivers_every_message():
+    out = run_benchmark("shm", producers=2, consumers=2, capacity=4, messages=2000)
+    assert out["messages"] == 2000
@@ -0,0 +1,41 @@
+import asyncio
+import time
+from oslab.sim.jobs import JobPool
+
+def _workers(hold, workers=1):
+    time.sleep(hold)
+    return workers
+
+def test_shared_job_takes_only_free_slots():
+    pool = JobPool(processes=3, poll=0.02, process_threshold=0)
+
+    async def main():
+        first = asyncio.create_task(pool.run(_workers, 1.0))
+        while pool._slots is None or pool._slots._value == 3:
+            await asyncio.sleep(0.01)
+        shared = await pool.run(_workers, 0.0, share=8)
+        return shared, await first, pool._slots._value
+
+    try:
+        assert asyncio.run(main()) == (2, 1, 3)
+    finally:
+        pool.close()
+
+def test_shared_job_leaves_slots_to_waiters():
+    pool = JobPool(processes=2, poll=0.02, process_threshold=0)
+
+    async def main():
+        busy = [asyncio.create_task(pool.run(_workers, 0.5)) for _ in range(2)]
+        while pool._slots is None or pool._slots._value:
+            await asyncio.sleep(0.01)
+        # queued behind a plain job: once a slot frees up it must not take the other one too
+        waiting = asyncio.create_task(pool.run(_workers, 0.5))
+        await asyncio.sleep(0.05)
+        shared = await pool.run(_workers, 0.0, share=8)
+        await asyncio.gather(waiting, *busy)
+        return shared
+
+    try:
+        assert asyncio.run(main()) == 1
+    finally:
+        pool.close()
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from oslab.models.workload import Workload
+from oslab.sim.metrics import batch_metrics
+from oslab.sim.scheduler import schedule
+
+def test_batch_metrics_matches_scheduler_means():
+    w = Workload([0, 1, 3, 3], [4, 2, 1, 5], [1, 0, 2, 1])
+    for algo in ("fcfs", "rr", "sjf", "priority"):
+        tl, (wait, turn) = schedule(algo, w, cores=2, columnar=True)
+        out = batch_metrics(w, tl, 2)
+        assert out["wait"]["mean"] == pytest.approx(wait) and out["turn"]["mean"] == pytest.approx(turn)
+
+def test_batch_metrics_rejects_mismatched_pids():
+    w = Workload([0, 1], [2, 3])
+    tl, _ = schedule("fcfs", w, columnar=True)
+    with pytest.raises(ValueError):
+        batch_metrics(Workload([0, 1], [2, 3], pid=[1, 1]), tl)
+    with pytest.raises(ValueError):
+        batch_metrics(Workload([0, 1, 2], [2, 3, 1]), tl)
+    with pytest.raises(ValueError):
+        batch_metrics(Workload([0], [2]), tl)
+    with pytest.raises(ValueError):
+        batch_metrics(w, tl, cores=0)
+
+@pytest.mark.parametrize("burst", [[1.7], [float("nan")], ["1"], [2**64 - 1]])
+def test_workload_rejects_non_integers(burst):
+    with pytest.raises(ValueError):
+        Workload([0], burst)
+
+def test_workload_accepts_integral_values():
+    assert Workload([0.0], np.array([3], dtype=np.int32)).burst.tolist() == [3]
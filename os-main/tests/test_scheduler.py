@@ -0,0 +1,89 @@
+import random
+from oslab.models.process import ProcSpec
+from oslab.sim.scheduler import Rescheduler, schedule
+
+def _runs(timeline, pid):
+    return [(s.start, s.end) for s in timeline if s.pid == pid]
+
+def test_mlfq_boost_lifts_starved_process():
+    # a long job demoted to the bottom level starves behind a stream of short ones
+    # until each boost puts it back on level 0
+    specs = [ProcSpec(1, 0, 50)] + [ProcSpec(i, i - 1, 1) for i in range(2, 60)]
+    starved, _ = schedule("mlfq", specs, quantum=1)
+    boosted, _ = schedule("mlfq", specs, quantum=1, boost=10)
+    assert _runs(starved, 1)[1][0] == 59
+    assert _runs(boosted, 1)[:4] == [(0, 1), (10, 11), (21, 22), (32, 33)]
+
+def test_mlfq_boost_keeps_every_process_whole():
+    specs = [ProcSpec(i, i % 13, 1 + i % 9) for i in range(300)]
+    for per_core in (False, True):
+        timeline, _ = schedule("mlfq", specs, cores=3, per_core=per_core, boost=7, levels=4)
+        ran = {}
+        for s in timeline:
+            ran[s.pid] = ran.get(s.pid, 0) + s.end - s.start
+        assert ran == {p.pid: p.burst for p in specs}
+
+def test_rescheduler_resumes_late_edit_on_backlog():
+    # one core, arrivals twice as fast as it can serve them: the backlog keeps
+    # growing, and a late edit must still resume past the midpoint
+    n = 6000
+    specs = [ProcSpec(i + 1, i, 2 + i % 3) for i in range(n)]
+    for algo in ("rr", "priority", "sjf"):
+        resched = Rescheduler(algo, every=256)
+        resched.run(specs)
+        edited = list(specs)
+        k = n * 9 // 10
+        edited[k] = ProcSpec(k + 1, k, 7)
+        timeline, metrics = resched.run(edited)
+        assert resched.resumed_at is not None and resched.resumed_at > specs[n // 2].arrival
+        fresh, fresh_metrics = schedule(algo, edited, columnar=True)
+        assert timeline.to_columns() == fresh.to_columns() and metrics == fresh_metrics
+
+def test_rescheduler_checkpoint_budget():
+    specs = [ProcSpec(i + 1, i, 3) for i in range(4000)]
+    resched = Rescheduler("rr", every=64, budget=20000)
+    resched.run(specs)
+    assert sum(c[2] for c in resched._checkpoints) <= 20000
+    edited = specs[:3000] + [ProcSpec(9999, 3000, 1)] + specs[3000:]
+    timeline, _ = resched.run(edited)
+    assert resched.resumed_at is not None and resched.resumed_at > 2000
+    assert timeline.to_columns() == schedule("rr", edited, columnar=True)[0].to_columns()
+
+def test_timeline_keeps_int64_pids():
+    big = 2**40
+    tl, _ = schedule("fcfs", [ProcSpec(2**31, 0, 2), ProcSpec(big, 1, 1)], columnar=True)
+    assert list(tl.pid) == [2**31, big]
+
+def _edit(rng, specs):
+    specs = list(specs)
+    k = rng.randrange(len(specs) + 1)
+    op = rng.choice(["add", "remove", "modify"]) if k < len(specs) else "add"
+    if op == "add":
+        specs.insert(k, ProcSpec(10_000 + rng.randrange(10**6), rng.randint(0, 300), rng.randint(1, 9),
+                                 rng.randint(0, 4), rng.choice([None, rng.randint(5, 400)])))
+    elif op == "remove":
+        del specs[k]
+    else:
+        p = specs[k]
+        specs[k] = ProcSpec(p.pid, max(0, p.arrival + rng.randint(-20, 20)), rng.randint(1, 9), rng.randint(0, 4),
+                            p.deadline)
+    return specs
+
+def test_rescheduler_resume_matches_full_rerun():
+    # every algorithm and mode, a chain of random edits: a resumed run must give the
+    # same timeline and metrics as scheduling the edited workload from scratch
+    rng = random.Random(5)
+    resumed = 0
+    for algo in ("fcfs", "rr", "sjf", "priority", "cfs", "mlfq", "edf"):
+        for cores, preemptive, per_core in ((1, False, False), (1, True, False), (3, True, False), (4, False, True)):
+            specs = [ProcSpec(i + 1, rng.randint(0, 300), rng.randint(1, 9), rng.randint(0, 4),
+                              rng.choice([None, rng.randint(5, 400)])) for i in range(200)]
+            params = dict(cores=cores, quantum=2, preemptive=preemptive, per_core=per_core, boost=17)
+            resched = Rescheduler(algo, every=8, **params)
+            for _ in range(6):
+                timeline, metrics = resched.run(specs)
+                fresh, fresh_metrics = schedule(algo, specs, columnar=True, **params)
+                assert timeline.to_columns() == fresh.to_columns() and metrics == fresh_metrics
+                resumed += resched.resumed_at is not None
+                specs = _edit(rng, specs)
+    assert resumed > 50
@@ -0,0 +1,103 @@
+import random
+import pytest
+from oslab.models.process import ProcSpec, TimelineSlice
+from oslab.sim.scheduler import fcfs, priority, sjf
+
+# The tick-by-tick list-scan schedulers the heap engine replaced, kept verbatim as the
+# reference for single-core sjf/priority and for fcfs on any number of cores.
+
+def _metrics(specs, slices):
+    finish = {}
+    for s in slices:
+        finish[s.pid] = s.end
+    waits = []
+    turns = []
+    for p in specs:
+        t = finish[p.pid] - p.arrival
+        w = t - p.burst
+        waits.append(w)
+        turns.append(t)
+    return sum(waits) / len(waits) if waits else 0.0, sum(turns) / len(turns) if turns else 0.0
+
+def _fcfs(specs, cores=1):
+    time = [0] * cores
+    order = sorted(specs, key=lambda p: (p.arrival, p.pid))
+    slices = []
+    for p in order:
+        idx = min(range(cores), key=lambda i: time[i])
+        start = max(time[idx], p.arrival)
+        end = start + p.burst
+        time[idx] = end
+        slices.append(TimelineSlice(pid=p.pid, start=start, end=end, core=idx))
+    return slices, _metrics(specs, slices)
+
+def _scan(specs, preemptive, key):
+    t = 0
+    done = set()
+    remaining = {p.pid: p.burst for p in specs}
+    slices = []
+    while len(done) < len(specs):
+        ready = [p for p in specs if p.arrival <= t and p.pid not in done and remaining[p.pid] > 0]
+        if not ready:
+            t = min([p.arrival for p in specs if p.pid not in done])
+            continue
+        p = min(ready, key=lambda x: key(x, remaining))
+        start = t
+        if preemptive:
+            t += 1
+            remaining[p.pid] -= 1
+        else:
+            t += remaining[p.pid]
+            remaining[p.pid] = 0
+        slices.append(TimelineSlice(pid=p.pid, start=start, end=t, core=0))
+        if remaining[p.pid] == 0:
+            done.add(p.pid)
+    return slices, _metrics(specs, slices)
+
+def _sjf(specs, preemptive):
+    return _scan(specs, preemptive, (lambda x, r: r[x.pid]) if preemptive else (lambda x, r: x.burst))
+
+def _priority(specs, preemptive):
+    return _scan(specs, preemptive, lambda x, r: x.priority)
+
+def _merged(slices):
+    # back-to-back slices of one pid on one core as a single slice
+    out = []
+    last = {}
+    for s in slices:
+        k = last.get(s.core)
+        if k is not None and out[k][0] == s.pid and out[k][2] == s.start:
+            out[k][2] = s.end
+            continue
+        last[s.core] = len(out)
+        out.append([s.pid, s.start, s.end, s.core])
+    return sorted(map(tuple, out), key=lambda x: (x[3], x[1]))
+
+def _workloads(count=400):
+    rng = random.Random(1)
+    for _ in range(count):
+        n = rng.randint(1, 12)
+        # few distinct values, so ties in arrival, burst and priority are common
+        yield [ProcSpec(rng.randint(1, 10**6) if rng.random() < 0.3 else i + 1, rng.randint(0, 15),
+                        rng.randint(1, 6), rng.randint(0, 3)) for i in range(n)]
+
+def _unique_pids(specs):
+    return len({p.pid for p in specs}) == len(specs)
+
+@pytest.mark.parametrize("preemptive", [False, True])
+@pytest.mark.parametrize("algo", ["sjf", "priority"])
+def test_heap_engine_matches_list_scan(algo, preemptive):
+    new, old = {"sjf": (sjf, _sjf), "priority": (priority, _priority)}[algo]
+    for specs in filter(_unique_pids, _workloads()):
+        slices, metrics = new(specs, preemptive=preemptive)
+        want, want_metrics = old(specs, preemptive)
+        assert _merged(slices) == _merged(want), specs
+        assert metrics == pytest.approx(want_metrics)
+
+@pytest.mark.parametrize("cores", [1, 2, 3, 8])
+def test_fcfs_matches_min_scan(cores):
+    for specs in filter(_unique_pids, _workloads()):
+        slices, metrics = fcfs(specs, cores)
+        want, want_metrics = _fcfs(specs, cores)
+        assert _merged(slices) == _merged(want), specs
+        assert metrics == pytest.approx(want_metrics)
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+import pytest
+from oslab.sim.semaphore_sim import (AsyncSemaphoreSimulator, FifoSemaphore, PrioritySemaphore,
+                                     SemaphoreSimulator)
+
+def test_reset_then_start_keeps_capacity():
+    async def main():
+        sim = AsyncSemaphoreSimulator(capacity=3, producers=8, consumers=8)
+        sim.speed = 1000.0
+        seen = []
+        for _ in range(20):
+            sim.reset()
+            sim.start()
+            for _ in range(5):
+                await asyncio.sleep(0.002)
+                seen.append(sim.value)
+        await sim.aclose()
+        return seen
+
+    seen = asyncio.run(main())
+    assert all(0 <= v <= 3 for v in seen), max(seen)
+
+def test_reset_alone_lets_workers_exit():
+    async def main():
+        sim = AsyncSemaphoreSimulator(capacity=2, producers=4, consumers=4)
+        sim.speed = 1000.0
+        sim.start()
+        await asyncio.sleep(0.01)
+        tasks = list(sim._tasks)
+        sim.reset()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+
+def test_areset():
+    async def main():
+        sim = AsyncSemaphoreSimulator(capacity=3, producers=4, consumers=4)
+        sim.start()
+        await asyncio.sleep(0.01)
+        await sim.areset()
+        sim.start()
+        await asyncio.sleep(0.01)
+        v = sim.value
+        await sim.aclose()
+        return v
+
+    assert 0 <= asyncio.run(main()) <= 3
+
+@pytest.mark.parametrize("kind", ["condition", "fifo", "priority"])
+def test_thread_reset_keeps_capacity(kind):
+    sim = SemaphoreSimulator(capacity=3, kind=kind)
+    sim.speed = 1000.0
+    seen = []
+    try:
+        for _ in range(10):
+            sim.reset()
+            sim.start(8, 8)
+            for _ in range(10):
+                time.sleep(0.002)
+                seen.append(sim.value)
+    finally:
+        sim.reset()
+    assert all(0 <= v <= 3 for v in seen), max(seen)
+    assert sim._threads == []
+
+def test_thread_resume_is_idempotent():
+    sim = SemaphoreSimulator(capacity=2)
+    sim.speed = 1000.0
+    try:
+        sim.start(2, 2)
+        sim.resume()
+        sim.resume()
+        assert len(sim._threads) == 4
+        sim.pause()
+        sim.resume()
+        assert len(sim._threads) == 4
+    finally:
+        sim.reset()
+
+def _handoff_order(sem, waiters):
+    # the main thread holds the only permit while every waiter queues up in turn
+    sem.acquire("main")
+    order = []
+    threads = []
+    for who, prio in waiters:
+        t = threading.Thread(target=lambda w=who, p=prio: (sem.acquire(w, p), order.append(w), sem.release(w)))
+        t.start()
+        threads.append(t)
+        while len(sem.blocked) < len(threads):
+            time.sleep(0.001)
+    sem.release("main")
+    for t in threads:
+        t.join(5)
+    return order
+
+def test_fifo_handoff_order():
+    waiters = [(i, 9 - i) for i in range(8)]
+    assert _handoff_order(FifoSemaphore(1), waiters) == list(range(8))
+
+def test_priority_handoff_order():
+    waiters = [("a", 2), ("b", 0), ("c", 1), ("d", 0), ("e", 2)]
+    assert _handoff_order(PrioritySemaphore(1), waiters) == ["b", "d", "c", "a", "e"]
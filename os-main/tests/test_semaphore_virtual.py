@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from oslab.sim.semaphore_virtual import PERCENTILES, _WaitHistogram, simulate
+
+@pytest.mark.parametrize("dist", [
+    -0.5,
+    {"dist": "exp", "mean": -1},
+    {"dist": "uniform", "low": -1, "high": 1},
+    {"dist": "uniform", "low": 2, "high": 1},
+    {"dist": "lognormal", "mean": 0.5, "sigma": -1},
+    {"dist": "const", "value": float("nan")},
+])
+def test_rejects_bad_distribution(dist):
+    with pytest.raises(ValueError):
+        simulate(ops=100, seed=1, roles={"P": {"hold": dist}})
+
+def test_zero_durations_allowed():
+    out = simulate(ops=100, seed=1, roles={"P": {"hold": 0, "think": {"dist": "uniform", "low": 0, "high": 0}}})
+    assert out["ops"] == 100
+
+def test_wait_percentiles_close_to_exact():
+    rng = np.random.default_rng(2)
+    values = np.concatenate([np.zeros(30_000), rng.lognormal(-2, 1.5, 70_000)])
+    rng.shuffle(values)
+    hist = _WaitHistogram()
+    for part in np.array_split(values, 7):
+        hist.add(part.tolist())
+    out = hist.summary()
+    assert out["max"] == values.max() and out["mean"] == pytest.approx(values.mean())
+    for q in PERCENTILES:
+        assert out[f"p{q}"] == pytest.approx(np.percentile(values, q), rel=0.01)
+    assert _WaitHistogram().summary()["p99"] == 0.0
+
+def test_waits_are_not_kept(monkeypatch):
+    sizes = []
+    add = _WaitHistogram.add
+    monkeypatch.setattr(_WaitHistogram, "add", lambda self, values: (sizes.append(len(values)), add(self, values)))
+    out = simulate(ops=300_000, seed=1)
+    # folded into the histogram in bounded batches, every acquire counted once
+    assert len(sizes) > 4 and max(sizes) < 70_000
+    assert sum(sizes) >= out["ops"]
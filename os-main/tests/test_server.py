@@ -0,0 +1,132 @@
+import pytest
+from fastapi.testclient import TestClient
+import server
+
+H = {"X-Session-Id": "tests"}
+BODY = {"arrivals": [0, 1, 2], "bursts": [4, 3, 2]}
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(server.app) as c:
+        yield c
+
+@pytest.mark.parametrize("levels", [0, 65, 50000])
+def test_mlfq_levels_rejected(client, levels):
+    r = client.post("/api/schedule", json=dict(BODY, algo="mlfq", levels=levels), headers=H)
+    assert r.status_code == 400
+    r = client.post("/api/schedule/batch", json={"workloads": [BODY], "algos": ["mlfq"], "levels": levels},
+                    headers=H)
+    assert r.status_code == 400
+    r = client.post(f"/api/schedule/trace?algo=mlfq&levels={levels}", content="0,4\n1,3\n", headers=H)
+    assert r.status_code == 400
+
+def test_mlfq_max_levels(client):
+    r = client.post("/api/schedule", json=dict(BODY, algo="mlfq", levels=64, quantum=1 << 40), headers=H)
+    assert r.status_code == 200
+
+TRACE = "arrival,burst\n0,4\n1,3\n2,2\n"
+
+def test_trace_and_stream_run(client):
+    r = client.post("/api/schedule/trace?algo=rr&quantum=2", content=TRACE, headers=H)
+    assert r.status_code == 200 and r.json()["count"] > 0
+    r = client.post("/api/schedule/stream", json=dict(BODY, algo="rr"), headers=H)
+    assert r.status_code == 200 and "metrics" in r.text.strip().splitlines()[-1]
+    assert server.jobs.pending == 0
+
+def test_trace_unknown_algo(client):
+    r = client.post("/api/schedule/trace?algo=nope", content=TRACE, headers=H)
+    assert r.status_code == 400
+
+def test_trace_pid_range(client):
+    r = client.post("/api/schedule/trace?timeline=true", content="pid,arrival,burst\n4294967296,0,2\n", headers=H)
+    assert r.status_code == 200
+    r = client.post("/api/schedule/trace", content=f"pid,arrival,burst\n{2**63},0,2\n", headers=H)
+    assert r.status_code == 400
+
+def test_trace_and_stream_size_limits(client, monkeypatch):
+    monkeypatch.setattr(server, "SCHEDULE_MAX_PROCS", 2)
+    assert client.post("/api/schedule/trace", content=TRACE, headers=H).status_code == 413
+    assert client.post("/api/schedule/stream", json=BODY, headers=H).status_code == 413
+    monkeypatch.setattr(server, "SCHEDULE_MAX_PROCS", 1000)
+    big = server.SCHEDULE_MAX_CORES + 1
+    assert client.post(f"/api/schedule/trace?cores={big}", content=TRACE, headers=H).status_code == 413
+    assert client.post("/api/schedule/stream", json=dict(BODY, cores=big), headers=H).status_code == 413
+    assert server.jobs.pending == 0
+
+def test_trace_upload_byte_cap(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "TRACE_MAX_BYTES", len(TRACE) - 1)
+    monkeypatch.setattr(server.tempfile, "tempdir", str(tmp_path))
+    assert client.post("/api/schedule/trace", content=TRACE, headers=H).status_code == 413
+    # no Content-Length: refused while spooling, and the partial file is removed
+    chunks = (TRACE[i:i + 4].encode() for i in range(0, len(TRACE), 4))
+    assert client.post("/api/schedule/trace", content=chunks, headers=H).status_code == 413
+    assert list(tmp_path.iterdir()) == []
+    monkeypatch.setattr(server, "TRACE_MAX_BYTES", len(TRACE))
+    assert client.post("/api/schedule/trace", content=TRACE, headers=H).status_code == 200
+
+def test_trace_and_stream_admission(client, monkeypatch):
+    monkeypatch.setattr(server.jobs, "max_per_client", 0)
+    assert client.post("/api/schedule/trace", content=TRACE, headers=H).status_code == 429
+    assert client.post("/api/schedule/stream", json=BODY, headers=H).status_code == 429
+    monkeypatch.setattr(server.jobs, "max_per_client", 2)
+    monkeypatch.setattr(server.jobs, "max_pending", 0)
+    assert client.post("/api/schedule/stream", json=BODY, headers=H).status_code == 503
+
+def test_stream_timeout_trailer(client, monkeypatch):
+    monkeypatch.setattr(server, "SCHEDULE_TIMEOUT", 0.0)
+    n = 20000
+    body = {"arrivals": list(range(n)), "bursts": [3] * n, "algo": "rr"}
+    r = client.post("/api/schedule/stream", json=body, headers=H)
+    assert r.status_code == 200 and "error" in r.text.strip().splitlines()[-1]
+    assert server.jobs.pending == 0
+
+def test_sem_simulate_bad_distribution(client):
+    roles = {"C": {"think": {"dist": "uniform", "low": 1, "high": 0}}}
+    r = client.post("/api/sem/simulate", json={"ops": 100, "roles": roles}, headers=H)
+    assert r.status_code == 400
+
+@pytest.mark.parametrize("kind", ["condition", "fifo", "priority"])
+def test_sem_start_kind(client, kind):
+    r = client.post("/api/sem/start", json={"kind": kind, "capacity": 2, "priorities": {"P": 1, "C": 0}}, headers=H)
+    assert r.status_code == 200
+    st = client.get("/api/sem/state", headers=H).json()
+    assert st["stats"]["kind"] == kind and 0 <= st["value"] <= 2
+    assert client.post("/api/sem/reset", headers=H).status_code == 200
+
+@pytest.mark.parametrize("body", [{"kind": "nope"}, {"kind": "priority", "priorities": {"P": "x"}},
+                                  {"kind": "fifo", "priorities": [1]}])
+def test_sem_start_kind_rejected(client, body):
+    assert client.post("/api/sem/start", json=body, headers=H).status_code == 400
+
+def test_schedule_stats_clamps_cores(client):
+    r = client.post("/api/schedule", json=dict(BODY, stats=True, cores=0), headers=H)
+    assert r.status_code == 200 and r.json()["stats"]["utilization"] > 0
+
+def test_batch_rejects_fractional_bursts(client):
+    body = {"workloads": [{"arrivals": [0, 1], "bursts": [1.7, 2]}], "algos": ["fcfs"]}
+    assert client.post("/api/schedule/batch", json=body, headers=H).status_code == 400
+
+def test_batch_in_process_pool(client, monkeypatch):
+    monkeypatch.setattr(server.jobs, "process_threshold", 1)
+    r = client.post("/api/schedule/batch", json={"workloads": [BODY], "algos": ["fcfs", "rr"], "metrics_only": True},
+                    headers=H)
+    assert r.status_code == 200 and len(r.json()["results"]) == 2
+    assert server.jobs.pending == 0
+
+@pytest.mark.parametrize("body", [{"arrivals": 5}, {"bursts": 3.5}, dict(BODY, cores="x")])
+def test_schedule_malformed_body(client, body):
+    assert client.post("/api/schedule", json=body, headers=H).status_code == 400
+    assert client.post("/api/schedule/stream", json=body, headers=H).status_code == 400
+    assert server.jobs.pending == 0
+
+def test_schedule_cores_overflow(client):
+    body = '{"arrivals": [0], "bursts": [1], "cores": 1e400}'
+    r = client.post("/api/schedule", content=body, headers=dict(H, **{"Content-Type": "application/json"}))
+    assert r.status_code == 400
+
+@pytest.mark.parametrize("path,body", [("/api/proc/start", {"count": "x"}), ("/api/ipc/start", {"capacity": "x"}),
+                                       ("/api/sem/start", {"mode": "random", "workers": "x"}),
+                                       ("/api/sem/start", {"producers": None}),
+                                       ("/api/sem/simulate", {"ops": "many"})])
+def test_sim_params_not_integers(client, path, body):
+    assert client.post(path, json=body, headers=H).status_code == 400
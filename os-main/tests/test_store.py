@@ -0,0 +1,50 @@
+import random
+from oslab.models.process import Timeline
+from oslab.sim.store import StoredTimeline, write_timeline
+
+def _timeline(slices):
+    tl = Timeline()
+    for pid, s, e, c in slices:
+        tl.add(pid, s, e, c)
+    return tl
+
+def _stored(tmp_path, tl):
+    path = str(tmp_path / "t.tl")
+    write_timeline(path, tl, (0.0, 0.0))
+    return StoredTimeline(path)
+
+def test_window_limit_equal_to_matches(tmp_path):
+    # core 1 has slices starting before t1 that all end before t0: none match
+    st = _stored(tmp_path, _timeline([(1, 0, 5, 0), (2, 10, 20, 0), (3, 0, 2, 1), (4, 2, 4, 1)]))
+    out = st.window(6, 30, limit=1)
+    assert out["pid"] == [2] and out["truncated"] is False
+    out = st.window(0, 30, limit=3)
+    assert len(out["pid"]) == 3 and out["truncated"] is True
+
+def test_window_matches_brute_force(tmp_path):
+    rng = random.Random(7)
+    for trial in range(60):
+        slices = []
+        for c in range(rng.randint(1, 4)):
+            t = 0
+            for _ in range(rng.randint(0, 12)):
+                t += rng.randint(0, 5)
+                d = rng.randint(1, 6)
+                slices.append((rng.randint(1, 9), t, t + d, c))
+                t += d
+        tl = _timeline(slices)
+        st = _stored(tmp_path, tl)
+        # add() merges back-to-back slices of one pid, so compare against what it kept
+        slices = list(zip(tl.pid, tl.start, tl.end, tl.core))
+        for _ in range(20):
+            t0 = rng.randint(0, 60)
+            t1 = t0 + rng.randint(0, 40)
+            core = rng.choice([None, 0, 1])
+            want = sorted((c, s, e, p) for p, s, e, c in slices
+                          if s < t1 and e > t0 and (core is None or c == core))
+            limit = rng.choice([None, 1, 2, len(want), len(want) + 1])
+            out = st.window(t0, t1, core, limit)
+            got = list(zip(out["core"], out["start"], out["end"], out["pid"]))
+            cut = want if limit is None else want[:limit]
+            assert got == cut
+            assert out["truncated"] == (limit is not None and len(want) > limit)
@@ -0,0 +1,54 @@
+import io
+import tracemalloc
+import pytest
+from oslab.models.process import ProcSpec
+from oslab.sim.jobs import schedule_params, trace_response
+from oslab.sim.scheduler import rr
+from oslab.sim.trace import open_trace, read_csv, write_packed
+
+def _specs(n):
+    return [ProcSpec(i + 1, i, 1 + i % 5, i % 3) for i in range(n)]
+
+def test_packed_trace_matches_in_memory(tmp_path):
+    specs = _specs(3000)
+    path = str(tmp_path / "t.bin")
+    with open(path, "wb") as f:
+        write_packed(specs, f)
+    tl, metrics = rr(open_trace(path), quantum=2, cores=3, columnar=True)
+    ref, ref_metrics = rr(specs, quantum=2, cores=3, columnar=True)
+    assert metrics == ref_metrics and tl.to_columns() == ref.to_columns()
+
+def test_csv_header_and_defaults():
+    rows = list(read_csv(io.StringIO("# comment\nburst,arrival\n3,0\n\n2,1\n")))
+    assert rows == [ProcSpec(1, 0, 3, 0), ProcSpec(2, 1, 2, 0)]
+
+def test_csv_rejects_values_outside_int64():
+    with pytest.raises(ValueError):
+        list(read_csv(["0,%d" % (1 << 63)]))
+
+def _trace(tmp_path, n):
+    path = str(tmp_path / "t.bin")
+    with open(path, "wb") as f:
+        write_packed(_specs(n), f)
+    return path
+
+def test_trace_count_matches_timeline(tmp_path):
+    path = _trace(tmp_path, 3000)
+    for algo in ("fcfs", "rr", "sjf", "priority", "cfs", "mlfq", "edf"):
+        params = schedule_params({"algo": algo, "cores": 3, "quantum": 2, "preemptive": True})
+        full = trace_response(path, "bin", params, with_timeline=True)
+        counted = trace_response(path, "bin", params)
+        assert counted == {"metrics": full["metrics"], "count": full["count"]}
+        assert full["count"] == len(full["columns"]["pid"])
+
+def test_trace_without_timeline_keeps_memory_flat(tmp_path):
+    # arrivals keep pace with one core, so few processes are live at any time
+    path = _trace(tmp_path, 20_000)
+    params = schedule_params({"algo": "rr", "quantum": 1, "cores": 4})
+    peaks = []
+    for with_timeline in (False, True):
+        tracemalloc.start()
+        trace_response(path, "bin", params, with_timeline=with_timeline)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    assert peaks[0] * 4 < peaks[1]
@@ -1,198 +1,683 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+import asyncio
+import json
 import os
-from oslab.models.process import ProcSpec
-from oslab.sim.scheduler import fcfs, rr, sjf, priority
+from contextlib import asynccontextmanager
+from functools import partial
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Optional
+from oslab.sim.scheduler import ALGORITHMS, Rescheduler, schedule_iter
+from oslab.sim.cache import ScheduleCache
+from oslab.sim.jobs import (Cancelled, JobPool, Rejected, batch_response, batch_size, incremental_response,
+                            mlfq_levels, schedule_args, schedule_params, schedule_response, schedule_size,
+                            trace_response, trace_size)
 from oslab.sim.process_sim import ProcessSimulator
-from oslab.sim.ipc import IPCSimulator
-from oslab.sim.semaphore_sim import SemaphoreSimulator
+from oslab.sim.ipc import AsyncIPCSimulator, SharedMemoryIPCSimulator
+from oslab.sim.ipc_bench import BACKENDS as IPC_BACKENDS, run_benchmark
+from oslab.sim.semaphore_sim import SEMAPHORES, AsyncSemaphoreSimulator, SemaphoreSimulator
+from oslab.sim.semaphore_virtual import simulate as simulate_semaphore
+from oslab.sim.deadlock import SCENARIOS as DEADLOCK_SCENARIOS, DeadlockSimulator
+from oslab.sim.registry import SimulatorRegistry
+from oslab.sim.store import TimelineStore
 
-app = FastAPI()
+SESSION_COOKIE = "oslab_session"
+# thread-mode process simulations run one thread per process; more than this goes virtual
+PROC_THREAD_LIMIT = 16
+# the deadlock mode runs one thread per worker, per session
+DEADLOCK_WORKER_LIMIT = int(os.environ.get("OSLAB_DEADLOCK_WORKERS", "4096"))
+
+# every browser session gets its own simulators; see SimulatorRegistry for the limits
+sessions = SimulatorRegistry(
+    {"proc": ProcessSimulator, "ipc": AsyncIPCSimulator, "sem": AsyncSemaphoreSimulator},
+    max_sessions=int(os.environ.get("OSLAB_MAX_SESSIONS", "256")),
+    idle_timeout=float(os.environ.get("OSLAB_SESSION_IDLE", "900")),
+)
+
+# /api/schedule work runs in this pool, never on the event loop; see JobPool for the limits
+jobs = JobPool(
+    threads=int(os.environ.get("OSLAB_SCHEDULE_THREADS", "2")),
+    processes=int(os.environ.get("OSLAB_SCHEDULE_PROCESSES", "0")) or None,
+    max_pending=int(os.environ.get("OSLAB_SCHEDULE_QUEUE", "16")),
+    max_per_client=int(os.environ.get("OSLAB_SCHEDULE_PER_CLIENT", "2")),
+    process_threshold=int(os.environ.get("OSLAB_SCHEDULE_PROCESS_THRESHOLD", "20000")),
+)
+SCHEDULE_MAX_PROCS = int(os.environ.get("OSLAB_SCHEDULE_MAX_PROCS", "1000000"))
+SCHEDULE_MAX_CORES = 4096
+SCHEDULE_TIMEOUT = float(os.environ.get("OSLAB_SCHEDULE_TIMEOUT", "30"))
+# uploaded traces past this are refused while they are still being spooled
+TRACE_MAX_BYTES = int(os.environ.get("OSLAB_TRACE_MAX_BYTES", str(64 * SCHEDULE_MAX_PROCS)))
+
+# timelines kept by {"store": true}, queried through /api/results/<id>/...
+results = TimelineStore(
+    os.environ.get("OSLAB_RESULT_DIR") or os.path.join(tempfile.gettempdir(), "oslab-results"),
+    max_bytes=int(os.environ.get("OSLAB_RESULT_BYTES", str(1 << 30))),
+)
+# slices returned by one window query at most
+RESULT_WINDOW_LIMIT = 100_000
+
+async def _evict_idle_sessions():
+    while True:
+        await asyncio.sleep(30)
+        await sessions.evict_idle()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    reaper = asyncio.create_task(_evict_idle_sessions())
+    yield
+    reaper.cancel()
+    jobs.close()
+    await sessions.close()
+
+app = FastAPI(lifespan=lifespan)
 templates = Jinja2Templates(directory=os.path.join(os.path.dirname(__file__), "templates"))
-psim = ProcessSimulator()
-ipc = IPCSimulator()
-sem = SemaphoreSimulator()
+schedule_cache = ScheduleCache()
+
+class SessionCookie:
+    # Plain ASGI rather than @app.middleware("http"): BaseHTTPMiddleware wraps `receive`
+    # so that request.is_disconnected() never sees the client go away.
+    # API clients without cookies can send X-Session-Id instead.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        request = Request(scope)
+        sid = request.headers.get("x-session-id") or request.cookies.get(SESSION_COOKIE)
+        fresh = not sid or len(sid) > 64
+        if fresh:
+            sid = uuid.uuid4().hex
+        scope.setdefault("state", {})["session"] = sid
+
+        async def send_cookie(message):
+            if fresh and message["type"] == "http.response.start":
+                cookie = Response()
+                cookie.set_cookie(SESSION_COOKIE, sid, httponly=True, samesite="lax")
+                MutableHeaders(scope=message).append("set-cookie", cookie.headers["set-cookie"])
+            await send(message)
+
+        await self.app(scope, receive, send_cookie)
+
+app.add_middleware(SessionCookie)
+
+async def _sim(request: Request, kind: str, cls=None):
+    return await sessions.get(request.state.session, kind, cls)
+
+def _int_arg(value, name: str, lo: int, hi: Optional[int] = None) -> int:
+    # an integer request field clamped into [lo, hi]; anything else is a 400
+    try:
+        value = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise HTTPException(400, f"{name} must be an integer")
+    return max(lo, value if hi is None else min(hi, value))
+
+def _schedule_size(payload: dict) -> int:
+    try:
+        return schedule_size(payload)
+    except TypeError:
+        raise HTTPException(400, "arrivals, bursts, priorities and deadlines must be lists")
 
 @app.get("/", response_class=HTMLResponse)
 def index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 @app.post("/api/schedule")
-async def schedule(payload: dict):
-    arrivals = payload.get("arrivals", [])
-    bursts = payload.get("bursts", [])
-    priorities = payload.get("priorities", [])
-    cores = int(payload.get("cores", 1))
-    quantum = int(payload.get("quantum", 1))
-    algo = payload.get("algo", "fcfs")
-    n = max(len(arrivals), len(bursts), len(priorities))
-    if n == 0:
-        specs = [ProcSpec(1,0,5,2), ProcSpec(2,2,3,1), ProcSpec(3,4,2,3)]
+async def schedule(request: Request, payload: dict):
+    # 413 oversized, 503 queue full, 429 too many per session, 504 past the timeout
+    size = _schedule_size(payload)
+    if size > SCHEDULE_MAX_PROCS:
+        raise HTTPException(413, f"at most {SCHEDULE_MAX_PROCS} processes per request")
+    cores = _int_arg(payload.get("cores", 1), "cores", 1)
+    if cores > SCHEDULE_MAX_CORES:
+        raise HTTPException(413, f"at most {SCHEDULE_MAX_CORES} cores")
+    try:
+        params = schedule_params(payload)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(400, str(e))
+    # {"store": true} answers with a result id instead of the slices
+    rid = results.new_id() if payload.get("store") else None
+    if payload.get("incremental"):
+        # on a thread: the checkpoints live in this process
+        entry = _rescheduler(request.state.session, params)
+        out = await _run_job(request, size, _incremental, payload, entry, rid and results.path(rid), process=False)
     else:
-        specs = [
-            ProcSpec(i+1,
-                     arrivals[i] if i < len(arrivals) else 0,
-                     bursts[i] if i < len(bursts) else 1,
-                     priorities[i] if i < len(priorities) else 0)
-            for i in range(n)
-        ]
-    if algo == "fcfs":
-        slices, metrics = fcfs(specs, cores=cores)
-    elif algo == "rr":
-        slices, metrics = rr(specs, quantum=quantum)
-    elif algo == "sjf":
-        slices, metrics = sjf(specs)
-    elif algo == "priority":
-        slices, metrics = priority(specs)
+        cache = None if size >= jobs.process_threshold else schedule_cache
+        out = await _run_job(request, size, schedule_response, payload, cache, rid and results.path(rid))
+    if rid is not None and isinstance(out, dict):
+        results.add(rid)
+        out["result"]["id"] = rid
+    return out
+
+# {"incremental": true} keeps a Rescheduler (checkpoints plus the last timeline) per
+# session; only the most recently used few are kept
+RESCHEDULE_SESSIONS = int(os.environ.get("OSLAB_RESCHEDULE_SESSIONS", "16"))
+_reschedulers: "OrderedDict[str, tuple]" = OrderedDict()
+
+def _rescheduler(sid: str, params: dict) -> tuple:
+    entry = _reschedulers.get(sid)
+    key = tuple(params[k] for k in ("algo", "cores", "quantum", "preemptive", "per_core", "levels", "boost"))
+    if entry is None or entry[0].params() != key:
+        entry = _reschedulers[sid] = (Rescheduler(**params), threading.Lock())
+    _reschedulers.move_to_end(sid)
+    while len(_reschedulers) > RESCHEDULE_SESSIONS:
+        _reschedulers.popitem(last=False)
+    return entry
+
+def _incremental(payload: dict, entry: tuple, store_path: Optional[str]):
+    resched, lock = entry
+    with lock:
+        return incremental_response(payload, resched, store_path)
+
+async def _run_job(request: Request, size: int, fn, *args, process: Optional[bool] = None, share: int = 1):
+    # maps JobPool outcomes onto HTTP; see /api/schedule for the codes
+    try:
+        return await jobs.run(fn, *args, size=size, client=request.state.session, timeout=SCHEDULE_TIMEOUT,
+                              cancelled=request.is_disconnected, process=process, share=share)
+    except Rejected as e:
+        raise HTTPException(e.status, e.detail, headers={"Retry-After": str(e.retry_after)})
+    except TimeoutError as e:
+        raise HTTPException(504, str(e))
+    except Cancelled:
+        # nobody is listening; 499 only shows up in the access log
+        return Response(status_code=499)
+    except (TypeError, ValueError, OverflowError) as e:
+        raise HTTPException(400, str(e))
+
+# server-side directory that /api/schedule/trace?path=... may read from; unset disables it
+TRACE_DIR = os.environ.get("OSLAB_TRACE_DIR", "")
+
+@app.post("/api/schedule/trace")
+async def schedule_trace(request: Request, algo: str = "fcfs", cores: int = 1, quantum: int = 1,
+                         preemptive: bool = False, per_core: bool = False, levels: int = 3, boost: int = 0,
+                         format: str = "csv", path: str = "", timeline: bool = False):
+    # CSV or packed records sorted by arrival, spooled to a temp file and parsed lazily;
+    # same limits and status codes as /api/schedule
+    if algo not in ALGORITHMS:
+        raise HTTPException(400, f"unknown algorithm: {algo}")
+    if format not in ("csv", "bin"):
+        raise HTTPException(400, "format must be csv or bin")
+    if cores > SCHEDULE_MAX_CORES:
+        raise HTTPException(413, f"at most {SCHEDULE_MAX_CORES} cores")
+    try:
+        params = schedule_params({"algo": algo, "cores": cores, "quantum": quantum, "preemptive": preemptive,
+                                  "per_core": per_core, "levels": levels, "boost": boost})
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    owned = not path
+    if path:
+        if not TRACE_DIR:
+            raise HTTPException(403, "local trace files are disabled (set OSLAB_TRACE_DIR)")
+        root = os.path.realpath(TRACE_DIR)
+        full = os.path.realpath(os.path.join(root, path))
+        if not full.startswith(root + os.sep) or not os.path.isfile(full):
+            raise HTTPException(404, "trace not found")
+        src = full
+    else:
+        declared = request.headers.get("content-length", "")
+        if declared.isdigit() and int(declared) > TRACE_MAX_BYTES:
+            raise HTTPException(413, f"at most {TRACE_MAX_BYTES} bytes per trace")
+        # a named file, so a child process can open it too
+        fd, src = tempfile.mkstemp(suffix=".trace")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                written = 0
+                async for chunk in request.stream():
+                    written += len(chunk)
+                    if written > TRACE_MAX_BYTES:
+                        raise HTTPException(413, f"at most {TRACE_MAX_BYTES} bytes per trace")
+                    f.write(chunk)
+        except BaseException:
+            os.remove(src)
+            raise
+    try:
+        size = trace_size(src, format)
+        if format == "bin" and size > SCHEDULE_MAX_PROCS:
+            raise HTTPException(413, f"at most {SCHEDULE_MAX_PROCS} processes per request")
+        return await _run_job(request, size, trace_response, src, format, params, timeline, SCHEDULE_MAX_PROCS)
+    finally:
+        if owned:
+            os.remove(src)
+
+def _ndjson(slices, batch: int = 512):
+    # one JSON object per line; the metrics go out as the final line
+    buf = []
+    while True:
+        try:
+            s = next(slices)
+        except StopIteration as stop:
+            metrics = stop.value
+            break
+        buf.append(json.dumps({"pid": s.pid, "start": s.start, "end": s.end, "core": s.core}))
+        if len(buf) >= batch:
+            yield "\n".join(buf) + "\n"
+            buf.clear()
+    buf.append(json.dumps({"metrics": {"wait": metrics[0], "turn": metrics[1]}}))
+    yield "\n".join(buf) + "\n"
+
+async def _guarded(chunks):
+    # errors after the response has started go out as a trailer line
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except TimeoutError as e:
+        yield json.dumps({"error": str(e)}) + "\n"
+
+@app.post("/api/schedule/stream")
+async def schedule_stream(request: Request, payload: dict):
+    # same limits as /api/schedule; past the timeout the stream ends with {"error": ...}
+    size = _schedule_size(payload)
+    if size > SCHEDULE_MAX_PROCS:
+        raise HTTPException(413, f"at most {SCHEDULE_MAX_PROCS} processes per request")
+    try:
+        specs, params = schedule_args(payload)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(400, str(e))
+    if params["cores"] > SCHEDULE_MAX_CORES:
+        raise HTTPException(413, f"at most {SCHEDULE_MAX_CORES} cores")
+    try:
+        chunks = jobs.stream(_ndjson(schedule_iter(params.pop("algo"), specs, **params)),
+                             client=request.state.session, timeout=SCHEDULE_TIMEOUT)
+    except Rejected as e:
+        raise HTTPException(e.status, e.detail, headers={"Retry-After": str(e.retry_after)})
+    return StreamingResponse(_guarded(chunks), media_type="application/x-ndjson")
+
+@app.post("/api/schedule/batch")
+async def schedule_batch(request: Request, payload: dict):
+    # body documented at batch_response; one admission slot, sizes summed over jobs
+    try:
+        count, size = batch_size(payload)
+        cores = max(int(j.get("cores", 1)) for j in payload.get("jobs") or [payload])
+    except (AttributeError, TypeError, ValueError, OverflowError):
+        raise HTTPException(400, "malformed batch")
+    try:
+        for j in payload.get("jobs") or [payload]:
+            mlfq_levels(j.get("levels", 3))
+    except (TypeError, ValueError) as e:
+        raise HTTPException(400, str(e))
+    if size > SCHEDULE_MAX_PROCS:
+        raise HTTPException(413, f"at most {SCHEDULE_MAX_PROCS} processes per request, summed over jobs")
+    if cores > SCHEDULE_MAX_CORES:
+        raise HTTPException(413, f"at most {SCHEDULE_MAX_CORES} cores")
+    rids = [results.new_id() for _ in range(count)] if payload.get("store") else None
+    paths = rids and [results.path(rid) for rid in rids]
+    if size >= jobs.process_threshold:
+        out = await _run_job(request, size, partial(batch_response, store_paths=paths), payload, None,
+                             share=jobs.processes)
     else:
-        slices, metrics = fcfs(specs, cores=cores)
-    return {
-        "slices": [{"pid": s.pid, "start": s.start, "end": s.end, "core": s.core} for s in slices],
-        "metrics": {"wait": metrics[0], "turn": metrics[1]}
-    }
+        out = await _run_job(request, size, batch_response, payload, schedule_cache, 1, paths)
+    if rids is not None and isinstance(out, dict):
+        for rid, row in zip(rids, out["results"]):
+            results.add(rid)
+            row["result"]["id"] = rid
+    return out
+
+def _result(rid: str):
+    st = results.get(rid)
+    if st is None:
+        raise HTTPException(404, "unknown result id")
+    return st
+
+@app.get("/api/results/{rid}")
+async def result_summary(rid: str):
+    return _result(rid).summary()
+
+@app.get("/api/results/{rid}/window")
+async def result_window(rid: str, t0: int, t1: int, core: Optional[int] = None,
+                        limit: int = RESULT_WINDOW_LIMIT):
+    # slices overlapping [t0, t1), all cores or one; "truncated" once limit is hit
+    return _result(rid).window(t0, t1, core, max(1, min(RESULT_WINDOW_LIMIT, limit)))
+
+@app.get("/api/results/{rid}/at")
+async def result_at(rid: str, core: int, t: int):
+    return {"slice": _result(rid).at(core, t)}
+
+@app.get("/api/results/{rid}/pid/{pid}")
+async def result_pid(rid: str, pid: int):
+    return _result(rid).for_pid(pid)
+
+@app.get("/api/schedule/cache")
+async def schedule_cache_stats():
+    return schedule_cache.stats()
+
+@app.get("/api/schedule/pool")
+async def schedule_pool_stats():
+    return jobs.stats()
+
+def _events_page(log, since: Optional[int], limit: int = 128):
+    # reads are non-destructive: every client passes back `next` as `since`; without
+    # it the page starts at the oldest retained event
+    events, nxt, dropped = log.read(log.tail if since is None else since, limit)
+    return {"events": events, "next": nxt, "dropped": dropped}
 
 @app.post("/api/proc/start")
-async def proc_start():
+async def proc_start(request: Request, payload: Optional[dict] = None):
+    # optional body: {"count": n, "virtual": bool, "paced": bool}
+    payload = payload or {}
+    psim = await _sim(request, "proc")
+    count = _int_arg(payload.get("count", 6), "count", 1, 100_000)
     psim.reset()
+    psim.virtual = bool(payload.get("virtual", False)) or count > PROC_THREAD_LIMIT
+    psim.paced = bool(payload.get("paced", True))
     psim.resume()
-    psim.start(6)
+    psim.start(count)
     return {"ok": True}
 
 @app.post("/api/proc/resume")
-async def proc_resume():
-    psim.resume()
+async def proc_resume(request: Request):
+    (await _sim(request, "proc")).resume()
     return {"ok": True}
 
 @app.post("/api/proc/pause")
-async def proc_pause():
-    psim.pause()
+async def proc_pause(request: Request):
+    (await _sim(request, "proc")).pause()
     return {"ok": True}
 
 @app.post("/api/proc/reset")
-async def proc_reset():
-    psim.reset()
+async def proc_reset(request: Request):
+    (await _sim(request, "proc")).reset()
     return {"ok": True}
 
 @app.post("/api/proc/speed")
-async def proc_speed(payload: dict):
+async def proc_speed(request: Request, payload: dict):
+    sim = await _sim(request, "proc")
     if "factor" in payload:
         try:
-            psim.speed = float(payload["factor"]) or 1.0
+            sim.speed = float(payload["factor"]) or 1.0
         except Exception:
             pass
     else:
         if payload.get("op") == "up":
-            psim.speed_up()
+            sim.speed_up()
         else:
-            psim.speed_down()
+            sim.speed_down()
     return {"ok": True}
 
 @app.get("/api/proc/events")
-async def proc_events():
-    out = []
-    i = 0
-    while not psim.events.empty() and i < 128:
-        out.append(psim.events.get())
-        i += 1
-    return {"events": out}
+async def proc_events(request: Request, since: Optional[int] = None):
+    return _events_page((await _sim(request, "proc")).events, since)
 
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+IPC_SIMULATORS = {"async": AsyncIPCSimulator, "shm": SharedMemoryIPCSimulator}
+
+async def _ipc_reset(ipc):
+    # the shared-memory simulator joins its worker processes, so keep that off the loop
+    if isinstance(ipc, SharedMemoryIPCSimulator):
+        await ipc.aclose()
+    else:
+        ipc.reset()
 
 @app.post("/api/ipc/start")
-async def ipc_start():
-    ipc.reset()
+async def ipc_start(request: Request, payload: Optional[dict] = None):
+    # optional body: {"producers": n, "consumers": m, "capacity": k, "backend": "async"|"shm"}
+    payload = payload or {}
+    ipc = await _sim(request, "ipc", IPC_SIMULATORS.get(payload.get("backend")))
+    await _ipc_reset(ipc)
+    ipc.producers = _int_arg(payload.get("producers", 1), "producers", 1, 16)
+    ipc.consumers = _int_arg(payload.get("consumers", 1), "consumers", 1, 16)
+    ipc.capacity = _int_arg(payload.get("capacity", 8), "capacity", 1, 1024)
     ipc.start()
     return {"ok": True}
 
 @app.post("/api/ipc/resume")
-async def ipc_resume():
-    ipc.resume()
+async def ipc_resume(request: Request):
+    (await _sim(request, "ipc")).resume()
     return {"ok": True}
 
 @app.post("/api/ipc/pause")
-async def ipc_pause():
-    ipc.pause()
+async def ipc_pause(request: Request):
+    (await _sim(request, "ipc")).pause()
     return {"ok": True}
 
 @app.post("/api/ipc/reset")
-async def ipc_reset():
-    ipc.reset()
+async def ipc_reset(request: Request):
+    await _ipc_reset(await _sim(request, "ipc"))
     return {"ok": True}
 
 @app.post("/api/ipc/speed")
-async def ipc_speed(payload: dict):
+async def ipc_speed(request: Request, payload: dict):
+    sim = await _sim(request, "ipc")
     if "factor" in payload:
         try:
-            ipc.speed = float(payload["factor"]) or 1.0
+            sim.speed = float(payload["factor"]) or 1.0
         except Exception:
             pass
     else:
         if payload.get("op") == "up":
-            ipc.speed_up()
+            sim.speed_up()
         else:
-            ipc.speed_down()
+            sim.speed_down()
     return {"ok": True}
 
+def _ipc_state(ipc):
+    out = {"size": ipc.size, "cap": ipc.capacity}
+    if isinstance(ipc, SharedMemoryIPCSimulator):
+        out["pids"] = ipc.pids
+    return out
+
 @app.get("/api/ipc/state")
-async def ipc_state():
-    return {"size": ipc.buffer.qsize(), "cap": ipc.buffer.maxsize}
+async def ipc_state(request: Request):
+    return _ipc_state(await _sim(request, "ipc"))
 
 @app.get("/api/ipc/events")
-async def ipc_events():
-    out = []
-    i = 0
-    while not ipc.events.empty() and i < 128:
-        out.append(ipc.events.get())
-        i += 1
-    return {"events": out}
+async def ipc_events(request: Request, since: Optional[int] = None):
+    return _events_page((await _sim(request, "ipc")).events, since)
+
+# one benchmark at a time: concurrent runs would only measure each other
+_bench_lock = asyncio.Lock()
+
+@app.post("/api/ipc/bench")
+async def ipc_bench(payload: Optional[dict] = None):
+    # body: {"backend": "queue"|"deque"|"spsc"|"shm" or a list of them, "producers",
+    #        "consumers", "capacity", "payload", "messages"}
+    payload = payload or {}
+    backends = payload.get("backend") or list(IPC_BACKENDS)
+    if isinstance(backends, str):
+        backends = [backends]
+    producers = _int_arg(payload.get("producers", 1), "producers", 1, 16)
+    consumers = _int_arg(payload.get("consumers", 1), "consumers", 1, 16)
+    args = dict(producers=producers, consumers=consumers,
+                capacity=_int_arg(payload.get("capacity", 8), "capacity", 1, 65536),
+                payload=_int_arg(payload.get("payload", 64), "payload", 1, 65536),
+                messages=_int_arg(payload.get("messages", 100_000), "messages", 1, 1_000_000))
+    rows = []
+    async with _bench_lock:
+        for backend in backends:
+            if backend == "spsc" and producers != consumers:
+                continue
+            try:
+                rows.append(await run_in_threadpool(run_benchmark, backend, **args))
+            except ValueError as e:
+                raise HTTPException(400, str(e))
+    return {"results": rows}
 
 @app.post("/api/sem/start")
-async def sem_start():
-    sem.reset()
+async def sem_start(request: Request, payload: Optional[dict] = None):
+    # optional body: {"producers": n, "consumers": m, "capacity": k}, or for the
+    # multi-resource deadlock mode {"mode": "philosophers"|"random", "workers": n,
+    # "resources": k, "need": j}. "kind": "condition"|"fifo"|"priority" runs the
+    # thread semaphores instead, with "priorities": {"P": p, "C": c} for "priority".
+    payload = payload or {}
+    mode = payload.get("mode")
+    kind = payload.get("kind")
+    if mode in DEADLOCK_SCENARIOS:
+        sem = await _sim(request, "sem", DeadlockSimulator)
+        sem.reset()
+        sem.scenario = mode
+        sem.workers = _int_arg(payload.get("workers", 5), "workers", 2, DEADLOCK_WORKER_LIMIT)
+        sem.resources = _int_arg(payload.get("resources") or sem.workers, "resources", 1, 4096)
+        sem.need = _int_arg(payload.get("need", 2), "need", 1)
+        sem.start()
+        return {"ok": True}
+    if kind is not None:
+        if kind not in SEMAPHORES:
+            raise HTTPException(400, f"unknown semaphore kind: {kind}")
+        try:
+            prio = payload.get("priorities") or {}
+            priorities = {"P": int(prio.get("P", 0)), "C": int(prio.get("C", 1))}
+            capacity = _int_arg(payload.get("capacity", 3), "capacity", 1, 1024)
+            producers = _int_arg(payload.get("producers", 2), "producers", 1, 16)
+            consumers = _int_arg(payload.get("consumers", 2), "consumers", 1, 16)
+        except (AttributeError, TypeError, ValueError) as e:
+            raise HTTPException(400, str(e))
+        sem = await _sim(request, "sem", SemaphoreSimulator)
+        sem.kind, sem.priorities, sem.capacity = kind, priorities, capacity
+        await sem.areset()
+        sem.start(producers, consumers)
+        return {"ok": True}
+    sem = await _sim(request, "sem", AsyncSemaphoreSimulator)
+    await sem.areset()
+    sem.producers = _int_arg(payload.get("producers", 2), "producers", 1, 16)
+    sem.consumers = _int_arg(payload.get("consumers", 2), "consumers", 1, 16)
+    sem.capacity = _int_arg(payload.get("capacity", 3), "capacity", 1, 1024)
     sem.start()
     return {"ok": True}
 
 @app.post("/api/sem/resume")
-async def sem_resume():
-    sem.resume()
+async def sem_resume(request: Request):
+    (await _sim(request, "sem")).resume()
     return {"ok": True}
 
 @app.post("/api/sem/pause")
-async def sem_pause():
-    sem.pause()
+async def sem_pause(request: Request):
+    (await _sim(request, "sem")).pause()
     return {"ok": True}
 
 @app.post("/api/sem/reset")
-async def sem_reset():
-    sem.reset()
+async def sem_reset(request: Request):
+    sem = await _sim(request, "sem")
+    if hasattr(sem, "areset"):
+        await sem.areset()
+    else:
+        sem.reset()
     return {"ok": True}
 
 @app.post("/api/sem/speed")
-async def sem_speed(payload: dict):
+async def sem_speed(request: Request, payload: dict):
+    sim = await _sim(request, "sem")
     if "factor" in payload:
         try:
-            sem.speed = float(payload["factor"]) or 1.0
+            sim.speed = float(payload["factor"]) or 1.0
         except Exception:
             pass
     else:
         if payload.get("op") == "up":
-            sem.speed_up()
+            sim.speed_up()
         else:
-            sem.speed_down()
+            sim.speed_down()
     return {"ok": True}
 
+def _sem_state(sem):
+    return {"value": sem.value, "blocked": sem.blocked}
+
 @app.get("/api/sem/state")
-async def sem_state():
-    return {"value": sem.sem.value, "blocked": list(sem._blocked)}
+async def sem_state(request: Request):
+    # the SSE frames carry the light part; contention stats only come from here
+    sem = await _sim(request, "sem")
+    out = _sem_state(sem)
+    out["stats"] = sem.stats()
+    return out
 
 @app.get("/api/sem/events")
-async def sem_events():
-    out = []
-    i = 0
-    while not sem.events.empty() and i < 128:
-        out.append(sem.events.get())
-        i += 1
-    return {"events": out}
+async def sem_events(request: Request, since: Optional[int] = None):
+    return _events_page((await _sim(request, "sem")).events, since)
+
+@app.post("/api/sem/simulate")
+async def sem_simulate(payload: Optional[dict] = None):
+    # virtual-time run, nothing animated: {"capacity", "producers", "consumers", "ops",
+    # "seed", "roles": {"P": {"hold": dist, "think": dist}, "C": {...}}}
+    payload = payload or {}
+    try:
+        return await run_in_threadpool(
+            simulate_semaphore,
+            capacity=_int_arg(payload.get("capacity", 3), "capacity", 1, 1024),
+            producers=_int_arg(payload.get("producers", 2), "producers", 0, 4096),
+            consumers=_int_arg(payload.get("consumers", 2), "consumers", 0, 4096),
+            ops=_int_arg(payload.get("ops", 1_000_000), "ops", 1, 5_000_000),
+            seed=payload.get("seed"), roles=payload.get("roles"))
+    except (AttributeError, TypeError, ValueError) as e:
+        raise HTTPException(400, str(e))
+
+@app.get("/api/sessions")
+async def sessions_stats():
+    return sessions.stats()
+
+# topic -> state snapshot (or None); simulators are looked up per frame because
+# /api/ipc/start may swap the session's ipc simulator
+EVENT_TOPICS = {"proc": None, "ipc": _ipc_state, "sem": _sem_state}
+
+def _parse_cursors(value: Optional[str]):
+    # "proc:12,ipc:40" -> {"proc": 12, "ipc": 40}; the SSE id of every frame uses this form
+    out = {}
+    for part in (value or "").split(","):
+        topic, _, offset = part.partition(":")
+        if topic in EVENT_TOPICS and offset.isdigit():
+            out[topic] = int(offset)
+    return out
+
+async def _event_stream(request: Request, topics, interval: float, batch: int, since):
+    # One SSE frame per topic per tick, {"events": [...], "state": {...}}, read through
+    # this connection's own cursors; "dropped" counts events that aged out of the log.
+    sid = request.state.session
+    cursors = {}
+    last_state = {}
+    idle = 0.0
+    while not await request.is_disconnected():
+        frames = []
+        full = False
+        for topic in topics:
+            sim = sessions.peek(sid, topic)
+            if sim is None:
+                continue
+            state_fn = EVENT_TOPICS[topic]
+            log, offset = cursors.get(topic, (None, 0))
+            if log is not sim.events:
+                # first frame, or /api/ipc/start swapped in a new simulator
+                log = sim.events
+                offset = since.get(topic, log.head) if topic not in cursors else 0
+            events, offset, dropped = log.read(offset, batch)
+            cursors[topic] = (log, offset)
+            full = full or len(events) == batch
+            frame = {"events": events}
+            if dropped:
+                frame["dropped"] = dropped
+            if state_fn is not None:
+                state = state_fn(sim)
+                if events or state != last_state.get(topic):
+                    frame["state"] = last_state[topic] = state
+            if len(frame) > 1 or events:
+                frames.append(f"event: {topic}\ndata: {json.dumps(frame, ensure_ascii=False)}\n\n")
+        if frames:
+            idle = 0.0
+            # the resume point goes on the last frame
+            ids = ",".join(f"{t}:{off}" for t, (_, off) in cursors.items())
+            frames[-1] = f"id: {ids}\n" + frames[-1]
+            yield "".join(frames)
+        elif idle >= 15.0:
+            idle = 0.0
+            yield ": keep-alive\n\n"
+        if not full:
+            await asyncio.sleep(interval)
+            idle += interval
+
+@app.get("/api/events/stream")
+async def events_stream(request: Request, topics: str = "proc,ipc,sem", interval: float = 0.1, batch: int = 512,
+                        since: Optional[str] = None):
+    # since / Last-Event-ID: "proc:12,ipc:40,sem:3" to catch up from those offsets;
+    # otherwise the stream starts with events published from now on
+    names = [t for t in topics.split(",") if t in EVENT_TOPICS]
+    if not names:
+        raise HTTPException(400, f"topics must be among {', '.join(EVENT_TOPICS)}")
+    cursors = _parse_cursors(since or request.headers.get("last-event-id"))
+    return StreamingResponse(_event_stream(request, names, max(0.02, interval), max(1, min(batch, 4096)), cursors),
+                             media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="127.0.0.1", port=8000)